@@ -0,0 +1,53 @@
+"""indices trigram para busca de produtos e clientes
+
+Revision ID: 3f6c1a9d2e41
+Revises: b492d0ffc2c9
+Create Date: 2026-10-17 09:12:05.418233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.busca import TABELAS_PESQUISAVEIS, ddl_fts_sqlite
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6c1a9d2e41'
+down_revision: Union[str, Sequence[str], None] = 'b492d0ffc2c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialeto = op.get_bind().dialect.name
+    if dialeto == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for tabela, (_, colunas) in TABELAS_PESQUISAVEIS.items():
+            for coluna in colunas:
+                op.create_index(
+                    f"ix_{tabela}_{coluna}_trgm", tabela, [coluna],
+                    postgresql_using="gin",
+                    postgresql_ops={coluna: "gin_trgm_ops"},
+                    if_not_exists=True,
+                )
+    elif dialeto == "sqlite":
+        for tabela in TABELAS_PESQUISAVEIS:
+            for comando in ddl_fts_sqlite(tabela):
+                op.execute(comando)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialeto = op.get_bind().dialect.name
+    if dialeto == "postgresql":
+        for tabela, (_, colunas) in TABELAS_PESQUISAVEIS.items():
+            for coluna in colunas:
+                op.drop_index(f"ix_{tabela}_{coluna}_trgm", table_name=tabela, if_exists=True)
+    elif dialeto == "sqlite":
+        for tabela in TABELAS_PESQUISAVEIS:
+            for sufixo in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {tabela}_fts_{sufixo}")
+            op.execute(f"DROP TABLE IF EXISTS {tabela}_fts")
@@ -0,0 +1,117 @@
+"""tabelas iniciais
+
+Revision ID: 5e0c9a7b1d42
+Revises:
+Create Date: 2026-10-17 21:08:37.402915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0c9a7b1d42'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tabelas que o app criava com create_all antes das migrations (a cadeia começava em
+# b492d0ffc2c9 supondo que já existissem). Bancos existentes já passaram desta revisão e
+# não a executam; um banco vazio chega ao schema atual só com `alembic upgrade head`.
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('produtos',
+    sa.Column('idproduto', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('descricao', sa.String(), nullable=False),
+    sa.Column('preco', sa.Numeric(10, 2), nullable=False),
+    sa.Column('categoria', sa.String(length=50), nullable=True),
+    sa.Column('status', sa.Boolean(), nullable=True),
+    sa.Column('data_criacao', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    sa.Column('data_alteracao', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('idproduto'),
+    sa.UniqueConstraint('descricao')
+    )
+    op.create_table('situacao_mesa',
+    sa.Column('id_situacao', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('situacao_descricao', sa.String(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id_situacao'),
+    sa.UniqueConstraint('situacao_descricao')
+    )
+    op.create_table('clientes',
+    sa.Column('idcliente', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('nome', sa.String(length=100), nullable=False),
+    sa.Column('apelido', sa.String(length=50), nullable=True),
+    sa.Column('email', sa.String(length=100), nullable=True),
+    sa.Column('telefone', sa.String(length=20), nullable=True),
+    sa.Column('data_criacao', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    sa.Column('data_alteracao', sa.DateTime(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.PrimaryKeyConstraint('idcliente'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_table('mesas',
+    sa.Column('idmesa', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('numero', sa.Integer(), nullable=False),
+    sa.Column('id_situacao_fk', sa.Integer(), nullable=False),
+    sa.Column('id_cliente_fk', sa.Integer(), nullable=True),
+    sa.Column('data_criacao', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    sa.Column('data_alteracao', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['id_cliente_fk'], ['clientes.idcliente']),
+    sa.ForeignKeyConstraint(['id_situacao_fk'], ['situacao_mesa.id_situacao']),
+    sa.PrimaryKeyConstraint('idmesa'),
+    sa.UniqueConstraint('numero')
+    )
+    op.create_table('pedidos',
+    sa.Column('idpedido', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('cliente_id', sa.Integer(), nullable=False),
+    sa.Column('mesa_id', sa.Integer(), nullable=False),
+    sa.Column('data_pedido', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.ForeignKeyConstraint(['cliente_id'], ['clientes.idcliente']),
+    sa.ForeignKeyConstraint(['mesa_id'], ['mesas.idmesa']),
+    sa.PrimaryKeyConstraint('idpedido')
+    )
+    op.create_table('pedido_produtos',
+    sa.Column('idpedido_produto', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('pedido_id', sa.Integer(), nullable=False),
+    sa.Column('produto_id', sa.Integer(), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.Column('preco_unitario', sa.Numeric(10, 2), nullable=False),
+    sa.Column('data_criacao', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    sa.Column('data_alteracao', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['pedido_id'], ['pedidos.idpedido']),
+    sa.ForeignKeyConstraint(['produto_id'], ['produtos.idproduto']),
+    sa.PrimaryKeyConstraint('idpedido_produto')
+    )
+    op.create_table('pagamentos',
+    sa.Column('idpagamento', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('pedido_id', sa.Integer(), nullable=False),
+    sa.Column('valor', sa.Numeric(10, 2), nullable=False),
+    sa.Column('data_pagamento', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    sa.Column('metodo_pagamento', sa.String(length=50), nullable=False),
+    sa.ForeignKeyConstraint(['pedido_id'], ['pedidos.idpedido']),
+    sa.PrimaryKeyConstraint('idpagamento')
+    )
+    op.create_table('tipo_pagamentos',
+    sa.Column('idtipopagamento', sa.Integer(), nullable=False),
+    sa.Column('descricao', sa.String(length=200), nullable=True),
+    sa.PrimaryKeyConstraint('idtipopagamento')
+    )
+    op.create_index(op.f('ix_tipo_pagamentos_idtipopagamento'), 'tipo_pagamentos', ['idtipopagamento'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tipo_pagamentos_idtipopagamento'), table_name='tipo_pagamentos')
+    op.drop_table('tipo_pagamentos')
+    op.drop_table('pagamentos')
+    op.drop_table('pedido_produtos')
+    op.drop_table('pedidos')
+    op.drop_table('mesas')
+    op.drop_table('clientes')
+    op.drop_table('situacao_mesa')
+    op.drop_table('produtos')
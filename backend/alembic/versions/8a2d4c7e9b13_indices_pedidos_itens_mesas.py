@@ -0,0 +1,57 @@
+"""indices de pedidos, itens e mesas
+
+Revision ID: 8a2d4c7e9b13
+Revises: 3f6c1a9d2e41
+Create Date: 2026-10-17 10:03:41.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a2d4c7e9b13'
+down_revision: Union[str, Sequence[str], None] = '3f6c1a9d2e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nome, tabela, colunas) dos índices das chaves estrangeiras e filtros do salão
+INDICES = [
+    ('ix_pedidos_mesa_id', 'pedidos', ['mesa_id']),
+    ('ix_pedidos_status', 'pedidos', ['status']),
+    ('ix_pedidos_cliente_id', 'pedidos', ['cliente_id']),
+    ('ix_pedido_produtos_pedido_id', 'pedido_produtos', ['pedido_id']),
+    ('ix_pedido_produtos_produto_id', 'pedido_produtos', ['produto_id']),
+    ('ix_mesas_id_situacao_fk', 'mesas', ['id_situacao_fk']),
+    ('ix_mesas_id_cliente_fk', 'mesas', ['id_cliente_fk']),
+    ('ix_pagamentos_pedido_id', 'pagamentos', ['pedido_id']),
+]
+
+FILTRO_ABERTO = sa.text("status = 'aberto'")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    postgres = op.get_bind().dialect.name == "postgresql"
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação: usa um bloco em autocommit
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas in INDICES:
+            op.create_index(nome, tabela, colunas, if_not_exists=True, postgresql_concurrently=postgres)
+        op.create_index(
+            'ix_pedidos_mesa_id_aberto', 'pedidos', ['mesa_id'],
+            if_not_exists=True,
+            postgresql_where=FILTRO_ABERTO,
+            postgresql_concurrently=postgres,
+            sqlite_where=FILTRO_ABERTO,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    postgres = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_pedidos_mesa_id_aberto', table_name='pedidos', if_exists=True, postgresql_concurrently=postgres)
+        for nome, tabela, _ in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela, if_exists=True, postgresql_concurrently=postgres)
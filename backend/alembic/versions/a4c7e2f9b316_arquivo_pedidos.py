@@ -0,0 +1,92 @@
+"""arquivo de pedidos fechados
+
+Revision ID: a4c7e2f9b316
+Revises: f1a63c8e5d09
+Create Date: 2026-10-17 19:42:05.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e2f9b316'
+down_revision: Union[str, Sequence[str], None] = 'f1a63c8e5d09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'pedidos_arquivo',
+        sa.Column('idpedido', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('cliente_id', sa.Integer(), nullable=False),
+        sa.Column('mesa_id', sa.Integer(), nullable=False),
+        sa.Column('data_pedido', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('total', sa.Numeric(10, 2), nullable=False, server_default='0'),
+        sa.Column('item_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('data_arquivamento', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('idpedido'),
+    )
+    op.create_index('ix_pedidos_arquivo_cliente_id', 'pedidos_arquivo', ['cliente_id'])
+    op.create_index('ix_pedidos_arquivo_mesa_id', 'pedidos_arquivo', ['mesa_id'])
+    op.create_index('ix_pedidos_arquivo_data_pedido', 'pedidos_arquivo', ['data_pedido'])
+
+    op.create_table(
+        'pedido_produtos_arquivo',
+        sa.Column('idpedido_produto', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('pedido_id', sa.Integer(), nullable=False),
+        sa.Column('produto_id', sa.Integer(), nullable=False),
+        sa.Column('quantidade', sa.Integer(), nullable=False),
+        sa.Column('preco_unitario', sa.Numeric(10, 2), nullable=False),
+        sa.Column('data_criacao', sa.DateTime(), nullable=True),
+        sa.Column('data_alteracao', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['pedido_id'], ['pedidos_arquivo.idpedido']),
+        sa.ForeignKeyConstraint(['produto_id'], ['produtos.idproduto']),
+        sa.PrimaryKeyConstraint('idpedido_produto'),
+    )
+    op.create_index('ix_pedido_produtos_arquivo_pedido_id', 'pedido_produtos_arquivo', ['pedido_id'])
+    op.create_index('ix_pedido_produtos_arquivo_produto_id', 'pedido_produtos_arquivo', ['produto_id'])
+
+    op.create_table(
+        'pagamentos_arquivo',
+        sa.Column('idpagamento', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('pedido_id', sa.Integer(), nullable=False),
+        sa.Column('valor', sa.Numeric(10, 2), nullable=False),
+        sa.Column('data_pagamento', sa.DateTime(), nullable=True),
+        sa.Column('metodo_pagamento', sa.String(length=50), nullable=False),
+        sa.ForeignKeyConstraint(['pedido_id'], ['pedidos_arquivo.idpedido']),
+        sa.PrimaryKeyConstraint('idpagamento'),
+    )
+    op.create_index('ix_pagamentos_arquivo_pedido_id', 'pagamentos_arquivo', ['pedido_id'])
+
+    # Seleção dos pedidos fechados mais antigos pelo job de arquivamento. pedidos é a tabela
+    # mais movimentada: CREATE INDEX CONCURRENTLY (fora de transação) não bloqueia as escritas
+    postgres = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_pedidos_data_pedido', 'pedidos', ['data_pedido'],
+            if_not_exists=True, postgresql_concurrently=postgres
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    postgres = op.get_bind().dialect.name == "postgresql"
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_pedidos_data_pedido', table_name='pedidos', if_exists=True, postgresql_concurrently=postgres)
+
+    op.drop_index('ix_pagamentos_arquivo_pedido_id', table_name='pagamentos_arquivo')
+    op.drop_table('pagamentos_arquivo')
+    op.drop_index('ix_pedido_produtos_arquivo_produto_id', table_name='pedido_produtos_arquivo')
+    op.drop_index('ix_pedido_produtos_arquivo_pedido_id', table_name='pedido_produtos_arquivo')
+    op.drop_table('pedido_produtos_arquivo')
+    op.drop_index('ix_pedidos_arquivo_data_pedido', table_name='pedidos_arquivo')
+    op.drop_index('ix_pedidos_arquivo_mesa_id', table_name='pedidos_arquivo')
+    op.drop_index('ix_pedidos_arquivo_cliente_id', table_name='pedidos_arquivo')
+    op.drop_table('pedidos_arquivo')
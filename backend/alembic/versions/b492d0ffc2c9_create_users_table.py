@@ -1,7 +1,7 @@
 """create users table
 
 Revision ID: b492d0ffc2c9
-Revises: 
+Revises: 5e0c9a7b1d42
 Create Date: 2025-08-17 17:13:46.268885
 
 """
@@ -13,7 +13,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision: str = 'b492d0ffc2c9'
-down_revision: Union[str, Sequence[str], None] = None
+down_revision: Union[str, Sequence[str], None] = '5e0c9a7b1d42'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
@@ -0,0 +1,39 @@
+"""totais mantidos em pedidos
+
+Revision ID: c5e17b3f2a68
+Revises: 8a2d4c7e9b13
+Create Date: 2026-10-17 14:22:09.318540
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e17b3f2a68'
+down_revision: Union[str, Sequence[str], None] = '8a2d4c7e9b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pedidos', sa.Column('total', sa.Numeric(10, 2), nullable=False, server_default='0'))
+    op.add_column('pedidos', sa.Column('item_count', sa.Integer(), nullable=False, server_default='0'))
+    # Preenche os pedidos existentes a partir dos itens
+    op.execute(
+        "UPDATE pedidos SET "
+        "total = COALESCE((SELECT SUM(quantidade * preco_unitario) FROM pedido_produtos "
+        "WHERE pedido_produtos.pedido_id = pedidos.idpedido), 0), "
+        "item_count = COALESCE((SELECT SUM(quantidade) FROM pedido_produtos "
+        "WHERE pedido_produtos.pedido_id = pedidos.idpedido), 0)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('pedidos') as batch_op:
+        batch_op.drop_column('item_count')
+        batch_op.drop_column('total')
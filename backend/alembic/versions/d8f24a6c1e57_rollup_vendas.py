@@ -0,0 +1,55 @@
+"""rollup de vendas por hora e dia
+
+Revision ID: d8f24a6c1e57
+Revises: c5e17b3f2a68
+Create Date: 2026-10-17 15:40:52.774103
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f24a6c1e57'
+down_revision: Union[str, Sequence[str], None] = 'c5e17b3f2a68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'vendas_hora',
+        sa.Column('data', sa.Date(), nullable=False),
+        sa.Column('hora', sa.Integer(), nullable=False),
+        sa.Column('produto_id', sa.Integer(), nullable=False),
+        sa.Column('categoria', sa.String(length=50), nullable=False),
+        sa.Column('quantidade', sa.Integer(), nullable=False),
+        sa.Column('valor', sa.Numeric(12, 2), nullable=False),
+        sa.PrimaryKeyConstraint('data', 'hora', 'produto_id', 'categoria'),
+    )
+    op.create_table(
+        'vendas_dia',
+        sa.Column('data', sa.Date(), nullable=False),
+        sa.Column('produto_id', sa.Integer(), nullable=False),
+        sa.Column('categoria', sa.String(length=50), nullable=False),
+        sa.Column('quantidade', sa.Integer(), nullable=False),
+        sa.Column('valor', sa.Numeric(12, 2), nullable=False),
+        sa.PrimaryKeyConstraint('data', 'produto_id', 'categoria'),
+    )
+    op.create_table(
+        'rollup_marcas',
+        sa.Column('nome', sa.String(length=50), nullable=False),
+        sa.Column('ultimo_id', sa.Integer(), nullable=False),
+        sa.Column('data_execucao', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('nome'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rollup_marcas')
+    op.drop_table('vendas_dia')
+    op.drop_table('vendas_hora')
@@ -0,0 +1,35 @@
+"""checkouts idempotentes
+
+Revision ID: e3b90d5a7c24
+Revises: d8f24a6c1e57
+Create Date: 2026-10-17 16:58:13.205917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b90d5a7c24'
+down_revision: Union[str, Sequence[str], None] = 'd8f24a6c1e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'checkouts',
+        sa.Column('chave', sa.String(length=100), nullable=False),
+        sa.Column('pedido_id', sa.Integer(), nullable=False),
+        sa.Column('hash_requisicao', sa.String(length=64), nullable=False),
+        sa.Column('data_criacao', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('chave'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('checkouts')
@@ -0,0 +1,29 @@
+"""versao dos pedidos (concorrencia otimista)
+
+Revision ID: f1a63c8e5d09
+Revises: e3b90d5a7c24
+Create Date: 2026-10-17 18:11:37.640288
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a63c8e5d09'
+down_revision: Union[str, Sequence[str], None] = 'e3b90d5a7c24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pedidos', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('pedidos') as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,78 @@
+# app/config.py
+from typing import Optional
+from pydantic_settings import BaseSettings
+
+class Settings(BaseSettings):
+    # JWT
+    secret_key: str
+    algorithm: str
+    access_token_expire_minutes: int
+
+    # Banco de dados
+    database_url: str
+    # Quando ativo, as rotas de pedidos, itens e mesas usam AsyncEngine/AsyncSession
+    db_async: bool = False
+    # URL do driver assíncrono (ex.: postgresql+asyncpg://...). Se vazia, é derivada de database_url
+    database_url_async: Optional[str] = None
+
+    # Pool de conexões (ignorado no SQLite)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    # Recicla conexões antes que o pooler remoto derrube as ociosas (segundos; -1 desativa)
+    db_pool_recycle: int = 300
+    db_pool_pre_ping: bool = True
+    # Compatibilidade com PgBouncer em modo transaction: sem prepared statements no servidor
+    db_pgbouncer: bool = False
+    # Réplica de leitura (opcional): listagens, buscas e relatórios (get_db_leitura) leem dela e as
+    # escritas continuam no primário. Vazia: tudo no primário. Para testar localmente, dois arquivos:
+    # DATABASE_URL=sqlite:///primario.db DATABASE_URL_LEITURA=sqlite:///replica.db
+    database_url_leitura: Optional[str] = None
+    # Driver assíncrono da réplica (DB_ASYNC). Se vazia, é derivada de database_url_leitura
+    database_url_leitura_async: Optional[str] = None
+    # Depois de uma escrita, o mesmo cliente lê do primário por este tempo (atraso de replicação)
+    leitura_apos_escrita_segundos: float = 5
+
+    # Cria as tabelas com create_all na inicialização (desenvolvimento/SQLite). Em produção o
+    # schema vem só das migrations: `alembic upgrade head` antes do deploy, que também monta um
+    # banco vazio (a revisão inicial, 5e0c9a7b1d42, cria as tabelas originais)
+    db_criar_tabelas: bool = False
+
+    # Cache do cardápio em memória (app/utils/catalogo.py)
+    catalogo_ttl_segundos: float = 300
+    catalogo_max_itens: int = 5000
+
+    # Cache token -> usuário em get_user_from_token (app/utils/cache_tokens.py)
+    cache_token_ttl_segundos: float = 300
+    cache_token_max_itens: int = 10000
+
+    # Custo do bcrypt (hashes com outro custo são refeitos no próximo login) e
+    # quantidade de threads dedicadas ao cálculo de hashes
+    bcrypt_rounds: int = 12
+    bcrypt_workers: int = 4
+
+    # Eventos da cozinha guardados em memória para retomada pelo cursor
+    cozinha_historico_eventos: int = 5000
+
+    # Rollup de vendas: itens processados por lote e atraso mínimo antes de um item entrar
+    # no rollup (transações ainda abertas podem confirmar IDs menores que o último processado)
+    rollup_lote: int = 5000
+    rollup_atraso_segundos: int = 60
+
+    # Arquivamento (app/utils/arquivamento.py): pedidos fechados há mais de arquivo_dias saem das
+    # tabelas quentes, arquivo_lote pedidos por transação
+    arquivo_dias: int = 90
+    arquivo_lote: int = 500
+
+    # Situação aplicada à mesa quando o pedido é fechado no checkout
+    situacao_mesa_livre: str = "Livre"
+
+    # Modo estrito para testes e desenvolvimento (app/utils/guarda_sql.py): lazy load durante uma
+    # requisição ou mais statements que o orçamento fazem a requisição falhar
+    sql_modo_estrito: bool = False
+    sql_orcamento_statements: int = 30
+
+    class Config: 
+        env_file = ".env"
+
+settings = Settings()
@@ -1,16 +1,135 @@
+from uuid import uuid4
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from .config import settings
+from .utils.leitura import le_do_primario
+from .utils.pool import AsyncQueuePoolMonitorado, QueuePoolMonitorado
+from .utils.sql_stats import instrumentar_engine
 
-# A string de conexão correta para o seu projeto no Supabase
+# A string de conexão do projeto no Supabase vem de DATABASE_URL (.env)
+DATABASE_URL = settings.database_url
 
-# Cria o "motor" do SQLAlchemy com a sua DATABASE_URL
-engine = create_engine(DATABASE_URL)
+def _opcoes_engine(url: str, assincrono: bool = False) -> dict:
+    """Monta os parâmetros de pool e de conexão a partir das configurações."""
+    url_sa = make_url(url)
+    if url_sa.get_backend_name() == "sqlite":
+        return {}
+
+    opcoes = {
+        "poolclass": AsyncQueuePoolMonitorado if assincrono else QueuePoolMonitorado,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if settings.db_pgbouncer:
+        # O PgBouncer em modo transaction não preserva prepared statements entre transações
+        if url_sa.get_driver_name() == "asyncpg":
+            # Mesmo sem cache o asyncpg prepara cada statement com nome; nomes únicos evitam o erro
+            # "prepared statement already exists" quando a conexão do servidor é de outro cliente
+            opcoes["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        elif url_sa.get_driver_name() == "psycopg":
+            opcoes["connect_args"] = {"prepare_threshold": None}
+    return opcoes
+
+# Cria o "motor" do SQLAlchemy com a sua DATABASE_URL. Nenhuma conexão é aberta aqui: o pool
+# conecta na primeira sessão usada (importar o app não depende do banco estar acessível)
+engine = create_engine(DATABASE_URL, **_opcoes_engine(DATABASE_URL))
+
+# Contagem de statements SQL (usada para medir o custo de cada rota)
+instrumentar_engine(engine)
 
 # Cria uma sessão local
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Réplica de leitura (DATABASE_URL_LEITURA). Sem réplica, as sessões de leitura usam o primário
+engine_leitura = engine
+if settings.database_url_leitura:
+    engine_leitura = create_engine(settings.database_url_leitura, **_opcoes_engine(settings.database_url_leitura))
+    instrumentar_engine(engine_leitura)
+SessionLeitura = sessionmaker(autocommit=False, autoflush=False, bind=engine_leitura)
 Base = declarative_base()
 
+# Drivers assíncronos equivalentes aos drivers síncronos usados no projeto
+_DRIVERS_ASSINCRONOS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def _url_assincrona(url: str) -> str:
+    """Deriva a URL do driver assíncrono a partir da URL síncrona."""
+    url_sa = make_url(url)
+    return url_sa.set(drivername=_DRIVERS_ASSINCRONOS.get(url_sa.get_backend_name(), url_sa.drivername)).render_as_string(hide_password=False)
+
+# Modo assíncrono (opcional): engine e sessões próprias, ao lado do caminho síncrono
+async_engine = None
+AsyncSessionLocal = None
+async_engine_leitura = None
+AsyncSessionLeitura = None
+if settings.db_async:
+    DATABASE_URL_ASYNC = settings.database_url_async or _url_assincrona(DATABASE_URL)
+    async_engine = create_async_engine(DATABASE_URL_ASYNC, **_opcoes_engine(DATABASE_URL_ASYNC, assincrono=True))
+    instrumentar_engine(async_engine.sync_engine)
+    # expire_on_commit=False: em modo assíncrono não há lazy load implícito após o commit
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    async_engine_leitura = async_engine
+    if settings.database_url_leitura:
+        DATABASE_URL_LEITURA_ASYNC = settings.database_url_leitura_async or _url_assincrona(settings.database_url_leitura)
+        async_engine_leitura = create_async_engine(DATABASE_URL_LEITURA_ASYNC, **_opcoes_engine(DATABASE_URL_LEITURA_ASYNC, assincrono=True))
+        instrumentar_engine(async_engine_leitura.sync_engine)
+    AsyncSessionLeitura = async_sessionmaker(async_engine_leitura, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+def _sessoes_assincronas(engine_assincrono):
+    return async_sessionmaker(engine_assincrono, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+def configurar_engines(sincrono=None, assincrono=None, sincrono_leitura=None, assincrono_leitura=None):
+    """Troca os engines usados pelas sessões do app (ex.: engines de testes passados a criar_app).
+
+    Sem engine de leitura próprio, as sessões de leitura acompanham o primário.
+    """
+    global engine, async_engine, AsyncSessionLocal, engine_leitura, async_engine_leitura, AsyncSessionLeitura
+    if sincrono is not None:
+        instrumentar_engine(sincrono)
+        if engine_leitura is engine:
+            engine_leitura = sincrono
+            SessionLeitura.configure(bind=sincrono)
+        engine = sincrono
+        SessionLocal.configure(bind=sincrono)
+    if sincrono_leitura is not None:
+        instrumentar_engine(sincrono_leitura)
+        engine_leitura = sincrono_leitura
+        SessionLeitura.configure(bind=sincrono_leitura)
+    if assincrono is not None:
+        instrumentar_engine(assincrono.sync_engine)
+        if async_engine_leitura is async_engine:
+            async_engine_leitura = assincrono
+            AsyncSessionLeitura = _sessoes_assincronas(assincrono)
+        async_engine = assincrono
+        AsyncSessionLocal = _sessoes_assincronas(assincrono)
+    if assincrono_leitura is not None:
+        instrumentar_engine(assincrono_leitura.sync_engine)
+        async_engine_leitura = assincrono_leitura
+        AsyncSessionLeitura = _sessoes_assincronas(assincrono_leitura)
+
+def replica_configurada() -> bool:
+    return engine_leitura is not engine or async_engine_leitura is not async_engine
+
+def fabrica_leitura(request: Request):
+    """Sessões para uma leitura da requisição: réplica, ou primário logo depois de uma escrita do cliente."""
+    return SessionLocal if le_do_primario(request) else SessionLeitura
+
+def fabrica_leitura_async(request: Request):
+    return AsyncSessionLocal if le_do_primario(request) else AsyncSessionLeitura
+
 # Dependência para as rotas
 def get_db():
     db = SessionLocal()
@@ -18,3 +137,20 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependência para as rotas assíncronas
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Dependências para as rotas que só leem (listagens, buscas e relatórios): usam a réplica
+def get_db_leitura(request: Request):
+    db = fabrica_leitura(request)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db_leitura(request: Request):
+    async with fabrica_leitura_async(request)() as db:
+        yield db
@@ -1,6 +1,17 @@
+# Início da importação do app (antes dos imports pesados): base do tempo de import e de cold start
+import time
+_inicio_importacao = time.perf_counter()
+
+from contextlib import asynccontextmanager
+from typing import Optional
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
+from . import database
+from .config import settings
+from .database import Base
+from .utils.guarda_sql import GuardaSQLMiddleware, ativar_guarda_lazy_load
+from .utils.leitura import LeituraAposEscritaMiddleware
+from .utils.metricas import MetricasMiddleware, metricas
 from app.routers import (
     users, 
     auth, 
@@ -10,41 +21,107 @@ from app.routers import (
     pedidos_router, 
     pagamentos_router,
     situacao_mesas_router, # Adicionado
-    pedido_produtos_router # Adicionado
+    pedido_produtos_router, # Adicionado
+    mesas_async_router,
+    pedidos_async_router,
+    pedido_produtos_async_router,
+    diagnostico_router,
+    relatorios_router,
+    metricas_router,
+    saude_router
 )
 
-app = FastAPI(title="Restaurante API", description="API para gerenciamento de restaurante", version="1.0.0")
-
 # Lista de origens permitidas (localhost:3000 para o seu frontend)
 origins = [
     "http://localhost",
     "http://localhost:3000",
 ]
 
-# Adicione o middleware CORS à sua aplicação
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    inicio = time.perf_counter()
+    # O schema vem das migrations do Alembic (`alembic upgrade head`); create_all só com
+    # DB_CRIAR_TABELAS=true (desenvolvimento/SQLite), para o boot não consultar o catálogo do banco
+    if app.state.criar_tabelas:
+        Base.metadata.create_all(bind=database.engine)
+    fim = time.perf_counter()
+    metricas.registrar_inicializacao("lifespan", fim - inicio)
+    metricas.registrar_inicializacao("total", fim - _inicio_importacao)
+    print(f"Aplicação pronta: import {tempo_importacao * 1000:.0f} ms, lifespan {(fim - inicio) * 1000:.0f} ms, cold start {(fim - _inicio_importacao) * 1000:.0f} ms")
+    yield
+    # Fecha as conexões do pool (o próximo uso reabre sob demanda)
+    database.engine.dispose()
+    if database.async_engine is not None:
+        await database.async_engine.dispose()
+    if database.replica_configurada():
+        database.engine_leitura.dispose()
+        if database.async_engine_leitura is not None:
+            await database.async_engine_leitura.dispose()
+
+def criar_app(
+    engine=None,
+    async_engine=None,
+    engine_leitura=None,
+    async_engine_leitura=None,
+    criar_tabelas: Optional[bool] = None
+) -> FastAPI:
+    """Monta a aplicação. Os engines informados substituem os de app/database.py (ex.: testes).
+
+    Nada conecta ao banco aqui: as conexões são abertas na primeira requisição que usa uma sessão.
+    """
+    database.configurar_engines(engine, async_engine, engine_leitura, async_engine_leitura)
+    app = FastAPI(title="Restaurante API", description="API para gerenciamento de restaurante", version="1.0.0", lifespan=lifespan)
+    app.state.criar_tabelas = settings.db_criar_tabelas if criar_tabelas is None else criar_tabelas
+
+    # Adicione o middleware CORS à sua aplicação
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        # Cabeçalhos lidos pelo frontend (paginação, contagem de SQL e GET condicional)
+        expose_headers=["X-Next-Cursor", "X-SQL-Statements", "ETag", "Last-Modified"],
+    )
+
+    # Modo estrito (testes e desenvolvimento): N+1 por lazy load e excesso de statements viram erro
+    if settings.sql_modo_estrito:
+        ativar_guarda_lazy_load()
+        app.add_middleware(GuardaSQLMiddleware, orcamento=settings.sql_orcamento_statements)
+
+    # Com réplica de leitura: quem acabou de escrever lê do primário por alguns segundos
+    if database.replica_configurada():
+        app.add_middleware(LeituraAposEscritaMiddleware, janela_segundos=settings.leitura_apos_escrita_segundos)
+
+    # Métricas por rota para o Prometheus (GET /metrics). Adicionado por último, envolve os
+    # demais middlewares: a latência medida inclui o CORS
+    app.add_middleware(MetricasMiddleware)
+
+    # Inclua os routers
+    app.include_router(produtos_router)
+    app.include_router(clientes_router)
+    app.include_router(pagamentos_router)
+    app.include_router(users.router) 
+    app.include_router(auth.router)
+    app.include_router(situacao_mesas_router)
+    app.include_router(diagnostico_router)
+    app.include_router(relatorios_router)
+    app.include_router(metricas_router)
+    app.include_router(saude_router)
+
+    # Rotas do salão (mesas, pedidos e itens): versão assíncrona quando DB_ASYNC=true
+    if settings.db_async:
+        app.include_router(mesas_async_router)
+        app.include_router(pedidos_async_router)
+        app.include_router(pedido_produtos_async_router)
+    else:
+        app.include_router(mesas_router)
+        app.include_router(pedidos_router)
+        app.include_router(pedido_produtos_router)
+    return app
+
+# Instância usada pelo uvicorn (`uvicorn app.main:app`); testes podem chamar criar_app com outro engine
+app = criar_app()
 
-try:
-    print("Tentando criar tabelas no banco de dados...")
-    Base.metadata.create_all(bind=engine)
-    print("Tabelas criadas com sucesso!")
-except Exception as e:
-    print("\nERRO GRAVE: Falha na conexão ou na criação das tabelas!")
-    print(f"Detalhes do erro: {e}")
-
-# Inclua os routers
-app.include_router(produtos_router)
-app.include_router(mesas_router)
-app.include_router(clientes_router)
-app.include_router(pedidos_router)
-app.include_router(pagamentos_router)
-app.include_router(users.router) 
-app.include_router(auth.router)
-app.include_router(situacao_mesas_router)
-app.include_router(pedido_produtos_router)
\ No newline at end of file
+tempo_importacao = time.perf_counter() - _inicio_importacao
+metricas.registrar_inicializacao("import", tempo_importacao)
@@ -1,6 +1,6 @@
 # app/models.py
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, Boolean, Date, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -27,8 +27,8 @@ class Mesa(Base):
     __tablename__ = 'mesas'
     idmesa = Column(Integer, primary_key=True, autoincrement=True)
     numero = Column(Integer, nullable=False, unique=True)
-    id_situacao_fk = Column(Integer, ForeignKey('situacao_mesa.id_situacao'), nullable=False)
-    id_cliente_fk = Column(Integer, ForeignKey('clientes.idcliente'), nullable=True) # Adicionado
+    id_situacao_fk = Column(Integer, ForeignKey('situacao_mesa.id_situacao'), nullable=False, index=True)
+    id_cliente_fk = Column(Integer, ForeignKey('clientes.idcliente'), nullable=True, index=True) # Adicionado
     data_criacao = Column(DateTime, server_default=func.now())
     data_alteracao = Column(DateTime, onupdate=func.now())
     
@@ -52,21 +52,37 @@ class Cliente(Base):
 class Pedido(Base):
     __tablename__ = 'pedidos'
     idpedido = Column(Integer, primary_key=True, autoincrement=True)
-    cliente_id = Column(Integer, ForeignKey('clientes.idcliente'), nullable=False)
-    mesa_id = Column(Integer, ForeignKey('mesas.idmesa'), nullable=False)
-    data_pedido = Column(DateTime, server_default=func.now())
-    status = Column(String(20), default='Pendente')
+    cliente_id = Column(Integer, ForeignKey('clientes.idcliente'), nullable=False, index=True)
+    mesa_id = Column(Integer, ForeignKey('mesas.idmesa'), nullable=False, index=True)
+    # Indexada para o arquivamento, que seleciona os pedidos fechados mais antigos
+    data_pedido = Column(DateTime, server_default=func.now(), index=True)
+    status = Column(String(20), default='Pendente', index=True)
+    # Totais mantidos a cada alteração de itens (ver app/utils/totais.py)
+    total = Column(Numeric(10,2), nullable=False, default=0, server_default='0')
+    item_count = Column(Integer, nullable=False, default=0, server_default='0')
+    # Incrementada a cada alteração do pedido ou dos itens; PUT /pedidos/{id} com versão antiga -> 409
+    version = Column(Integer, nullable=False, default=1, server_default='1')
     
     cliente = relationship("Cliente", back_populates="pedidos")
     mesa = relationship("Mesa", back_populates="pedidos")
     itens = relationship("PedidoProduto", back_populates="pedido")
-    pagamento = relationship("Pagamento", back_populates="pedido", uselist=False)
+    # Um pedido pode ser pago em partes (ex.: metade no cartão, metade em dinheiro)
+    pagamentos = relationship("Pagamento", back_populates="pedido")
+
+    # Pedido aberto da mesa: a busca mais frequente do salão
+    __table_args__ = (
+        Index(
+            "ix_pedidos_mesa_id_aberto", "mesa_id",
+            postgresql_where=text("status = 'aberto'"),
+            sqlite_where=text("status = 'aberto'"),
+        ),
+    )
 
 class PedidoProduto(Base):
     __tablename__ = 'pedido_produtos' 
     idpedido_produto = Column(Integer, primary_key=True, autoincrement=True)
-    pedido_id = Column(Integer, ForeignKey('pedidos.idpedido'), nullable=False)
-    produto_id = Column(Integer, ForeignKey('produtos.idproduto'), nullable=False)
+    pedido_id = Column(Integer, ForeignKey('pedidos.idpedido'), nullable=False, index=True)
+    produto_id = Column(Integer, ForeignKey('produtos.idproduto'), nullable=False, index=True)
     quantidade = Column(Integer, nullable=False)
     preco_unitario = Column(Numeric(10,2), nullable=False)
     data_criacao = Column(DateTime, server_default=func.now())
@@ -78,12 +94,90 @@ class PedidoProduto(Base):
 class Pagamento(Base):
     __tablename__ = 'pagamentos'
     idpagamento = Column(Integer, primary_key=True, autoincrement=True)
-    pedido_id = Column(Integer, ForeignKey('pedidos.idpedido'), nullable=False)
+    pedido_id = Column(Integer, ForeignKey('pedidos.idpedido'), nullable=False, index=True)
     valor = Column(Numeric(10,2), nullable=False)
     data_pagamento = Column(DateTime, server_default=func.now())
     metodo_pagamento = Column(String(50), nullable=False)
     
-    pedido = relationship("Pedido", back_populates="pagamento")
+    pedido = relationship("Pedido", back_populates="pagamentos")
+
+# --- Arquivo de pedidos fechados (preenchido por app/utils/arquivamento.py) ---
+# Mesmas colunas e IDs das tabelas quentes: GET /pedidos/{id} cai aqui quando o pedido já foi
+# arquivado. Sem FK para clientes e mesas: o histórico não impede excluir cadastros
+class PedidoArquivado(Base):
+    __tablename__ = 'pedidos_arquivo'
+    idpedido = Column(Integer, primary_key=True, autoincrement=False)
+    cliente_id = Column(Integer, nullable=False, index=True)
+    mesa_id = Column(Integer, nullable=False, index=True)
+    data_pedido = Column(DateTime, index=True)
+    status = Column(String(20))
+    total = Column(Numeric(10,2), nullable=False, default=0, server_default='0')
+    item_count = Column(Integer, nullable=False, default=0, server_default='0')
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+    data_arquivamento = Column(DateTime, server_default=func.now())
+
+    itens = relationship("PedidoProdutoArquivado", back_populates="pedido")
+    pagamentos = relationship("PagamentoArquivado", back_populates="pedido")
+
+class PedidoProdutoArquivado(Base):
+    __tablename__ = 'pedido_produtos_arquivo'
+    idpedido_produto = Column(Integer, primary_key=True, autoincrement=False)
+    pedido_id = Column(Integer, ForeignKey('pedidos_arquivo.idpedido'), nullable=False, index=True)
+    # FK mantida: o pedido arquivado mostra o produto, que não pode ser excluído (ver excluir_produto)
+    produto_id = Column(Integer, ForeignKey('produtos.idproduto'), nullable=False, index=True)
+    quantidade = Column(Integer, nullable=False)
+    preco_unitario = Column(Numeric(10,2), nullable=False)
+    data_criacao = Column(DateTime)
+    data_alteracao = Column(DateTime)
+
+    pedido = relationship("PedidoArquivado", back_populates="itens")
+    produto = relationship("Produto")
+
+class PagamentoArquivado(Base):
+    __tablename__ = 'pagamentos_arquivo'
+    idpagamento = Column(Integer, primary_key=True, autoincrement=False)
+    pedido_id = Column(Integer, ForeignKey('pedidos_arquivo.idpedido'), nullable=False, index=True)
+    valor = Column(Numeric(10,2), nullable=False)
+    data_pagamento = Column(DateTime)
+    metodo_pagamento = Column(String(50), nullable=False)
+
+    pedido = relationship("PedidoArquivado", back_populates="pagamentos")
+
+# --- Rollup de vendas (preenchido por app/utils/rollup.py; os relatórios leem só daqui) ---
+# categoria '' representa produtos sem categoria (colunas de chave primária não aceitam NULL)
+class VendaHora(Base):
+    __tablename__ = 'vendas_hora'
+    data = Column(Date, primary_key=True)
+    hora = Column(Integer, primary_key=True)
+    produto_id = Column(Integer, primary_key=True)
+    categoria = Column(String(50), primary_key=True)
+    quantidade = Column(Integer, nullable=False, default=0)
+    valor = Column(Numeric(12,2), nullable=False, default=0)
+
+class VendaDia(Base):
+    __tablename__ = 'vendas_dia'
+    data = Column(Date, primary_key=True)
+    produto_id = Column(Integer, primary_key=True)
+    categoria = Column(String(50), primary_key=True)
+    quantidade = Column(Integer, nullable=False, default=0)
+    valor = Column(Numeric(12,2), nullable=False, default=0)
+
+class MarcaRollup(Base):
+    __tablename__ = 'rollup_marcas'
+    nome = Column(String(50), primary_key=True)
+    # Último idpedido_produto já somado ao rollup
+    ultimo_id = Column(Integer, nullable=False, default=0)
+    data_execucao = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class Checkout(Base):
+    __tablename__ = 'checkouts'
+    # Chave enviada pelo cliente (cabeçalho Idempotency-Key): repetir a requisição não cobra de novo
+    chave = Column(String(100), primary_key=True)
+    # Sem FK: o registro continua valendo para reenvios mesmo se o pedido for arquivado
+    pedido_id = Column(Integer, nullable=False)
+    # Hash do corpo da requisição: a mesma chave com outro conteúdo é rejeitada
+    hash_requisicao = Column(String(64), nullable=False)
+    data_criacao = Column(DateTime, server_default=func.now())
 
 class TipoPagamento(Base):
     __tablename__ = "tipo_pagamentos"
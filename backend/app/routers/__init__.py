@@ -7,5 +7,12 @@ from .pedidos import pedidos_router
 from .pagamentos import pagamentos_router
 from .situacao_mesas import situacao_mesas_router
 from .pedido_produtos import pedido_produtos_router
+from .mesas_async import mesas_router as mesas_async_router
+from .pedidos_async import pedidos_router as pedidos_async_router
+from .pedido_produtos_async import pedido_produtos_router as pedido_produtos_async_router
+from .diagnostico import diagnostico_router
+from .relatorios import relatorios_router
+from .metricas import metricas_router
+from .saude import saude_router
 from . import users
 from . import auth
\ No newline at end of file
@@ -1,8 +1,11 @@
+import threading
+import time
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from .. import schemas, models, database
-from ..utils.auth import verify_password
+from ..utils.auth import verify_and_update_password_async
 from ..utils.auth_token import create_access_token
 
 router = APIRouter(
@@ -18,15 +21,62 @@ def get_db():
     finally:
         db.close()
 
+class EstatisticasLogin:
+    """Vazão e latência do /token/login, medidas separadamente das demais rotas."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sucessos = 0
+        self.falhas = 0
+        self.duracao_total = 0.0
+        self.iniciado_em = time.monotonic()
+
+    def registrar(self, sucesso: bool, duracao: float):
+        with self._lock:
+            if sucesso:
+                self.sucessos += 1
+            else:
+                self.falhas += 1
+            self.duracao_total += duracao
+
+    def resumo(self) -> dict:
+        with self._lock:
+            total = self.sucessos + self.falhas
+            return {
+                "sucessos": self.sucessos,
+                "falhas": self.falhas,
+                "duracao_media_ms": round(1000 * self.duracao_total / max(total, 1), 3),
+                "logins_por_segundo": round(total / max(time.monotonic() - self.iniciado_em, 1e-9), 3),
+            }
+
+estatisticas_login = EstatisticasLogin()
+
+def _buscar_usuario(db: Session, username: str):
+    return db.query(models.User).filter(models.User.username == username).first()
+
+def _salvar_novo_hash(db: Session, user: models.User, novo_hash: str):
+    user.hashed_password = novo_hash
+    db.commit()
+
 # Endpoint para login e geração de token JWT
+# Assíncrono: o bcrypt roda no executor dedicado e o acesso ao banco no threadpool,
+# então nenhum worker fica bloqueado durante o cálculo do hash
 @router.post("/login", response_model=schemas.Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    inicio = time.perf_counter()
+    user = await run_in_threadpool(_buscar_usuario, db, form_data.username)
+    valida, novo_hash = (False, None)
+    if user:
+        valida, novo_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+    if not valida:
+        estatisticas_login.registrar(False, time.perf_counter() - inicio)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Senha ou usuário incorretos",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    # O custo do bcrypt mudou desde que a senha foi salva: troca o hash de forma transparente
+    if novo_hash:
+        await run_in_threadpool(_salvar_novo_hash, db, user, novo_hash)
     access_token = create_access_token(data={"sub": user.username})
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    estatisticas_login.registrar(True, time.perf_counter() - inicio)
+    return {"access_token": access_token, "token_type": "bearer"}
@@ -1,25 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path, Query
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Path, Query
+from typing import List, Literal, Optional
+from sqlalchemy.orm import Session, selectinload
 from ..models import Cliente as ClienteModel
-from ..schemas import ClienteCreate, ClienteUpdate, Cliente as ClienteSchema
-from ..database import get_db
+from ..schemas import ClienteCreate, ClienteUpdate, Cliente as ClienteSchema, ResultadoImportacao
+from ..database import fabrica_leitura, get_db, get_db_leitura
+from ..utils.busca import buscar_clientes
+from ..utils.exportacao import resposta_exportacao
+from ..utils.guarda_sql import orcamento_statements
+from ..utils.http_cache import calcular_validador, resposta_condicional
+from ..utils.importacao import EspecificacaoImportacao, formato_da_requisicao, importar
+from ..utils.paginacao import Paginacao
+from ..utils.streaming import pede_ndjson, resposta_ndjson
 
 clientes_router = APIRouter(prefix="/clientes", tags=["Clientes"])
 
 @clientes_router.get("/", response_model=List[ClienteSchema])
 def listar_clientes(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db_leitura),
+    pagina: Paginacao = Depends(),
     nomeRazaoSocial: Optional[str] = Query(None),
     apelidoNomeFantasia: Optional[str] = Query(None),
     cidade: Optional[str] = Query(None),
     situacao: Optional[str] = Query(None),
     celularTelefone: Optional[str] = Query(None),
-    cpf: Optional[str] = Query(None)
+    cpf: Optional[str] = Query(None),
+    formato: Optional[Literal["json", "ndjson"]] = Query(None)
 ):
     """
-    Lista todos os clientes e permite filtrar por diversos campos.
+    Lista os clientes (paginados por cursor) e permite filtrar por diversos campos.
+    Responde 304 quando o cliente envia If-None-Match/If-Modified-Since e nada mudou.
+    Com Accept: application/x-ndjson (ou formato=ndjson) envia todos os clientes a partir
+    do cursor, um JSON por linha, em streaming.
     """
+    ndjson = pede_ndjson(request, formato)
+    if not ndjson:
+        nao_modificado = resposta_condicional(request, response, calcular_validador(db, ClienteModel))
+        if nao_modificado:
+            return nao_modificado
+
     query = db.query(ClienteModel)
     if nomeRazaoSocial:
         query = query.filter(ClienteModel.nome.ilike(f"%{nomeRazaoSocial}%"))
@@ -35,8 +55,46 @@ def listar_clientes(
         query = query.filter(ClienteModel.telefone.ilike(f"%{celularTelefone}%"))
     if cpf:
         query = query.filter(ClienteModel.cpf.ilike(f"%{cpf}%"))
-    
-    return query.all()
+
+    if ndjson:
+        return resposta_ndjson(
+            pagina.ordenar(query, ClienteModel.idcliente).statement, ClienteSchema, sessoes=fabrica_leitura(request)
+        )
+    clientes = pagina.filtrar(query, ClienteModel.idcliente).all()
+    return pagina.fechar(clientes, "idcliente", response)
+
+@clientes_router.get("/busca", response_model=List[ClienteSchema])
+def buscar_clientes_por_termo(
+    q: str = Query(..., min_length=1),
+    limite: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db_leitura)
+):
+    """
+    Busca clientes por nome, apelido ou telefone, ordenados por relevância.
+    """
+    return buscar_clientes(db, q, limite)
+
+IMPORTACAO_CLIENTES = EspecificacaoImportacao(ClienteModel, ClienteCreate, "email")
+COLUNAS_EXPORTACAO = ["idcliente", "nome", "apelido", "email", "telefone", "is_active", "data_criacao", "data_alteracao"]
+
+@clientes_router.post("/importar", response_model=ResultadoImportacao, dependencies=[Depends(orcamento_statements(None))])
+async def importar_clientes(
+    request: Request,
+    formato: Optional[Literal["csv", "ndjson"]] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Importa clientes de um corpo CSV (com cabeçalho) ou NDJSON, lido em streaming e gravado em lotes.
+    Linhas inválidas ou com e-mail já cadastrado são relatadas sem interromper a carga.
+    """
+    return await importar(request, db, IMPORTACAO_CLIENTES, formato_da_requisicao(request, formato))
+
+@clientes_router.get("/exportar")
+def exportar_clientes(formato: Literal["csv", "ndjson"] = "csv"):
+    """
+    Exporta todos os clientes em CSV ou NDJSON, em streaming.
+    """
+    return resposta_exportacao(ClienteModel, COLUNAS_EXPORTACAO, formato, "clientes")
 
 @clientes_router.post("/", response_model=ClienteSchema, status_code=status.HTTP_201_CREATED)
 def criar_cliente(cliente_data: ClienteCreate, db: Session = Depends(get_db)):
@@ -65,7 +123,10 @@ def excluir_cliente(id: int, db: Session = Depends(get_db)):
     """
     Exclui um cliente pelo ID.
     """
-    cliente = db.query(ClienteModel).filter(ClienteModel.idcliente == id).first()
+    # O ORM desvincula as mesas do cliente ao excluí-lo: carrega os relacionamentos na mesma ida ao banco
+    cliente = db.query(ClienteModel).options(
+        selectinload(ClienteModel.mesas), selectinload(ClienteModel.pedidos)
+    ).filter(ClienteModel.idcliente == id).first()
     if not cliente:
         raise HTTPException(status_code=404, detail="Cliente não encontrado")
     
@@ -0,0 +1,49 @@
+# app/routers/diagnostico.py
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from .. import database
+from ..database import get_db
+from .auth import estatisticas_login
+from ..utils.auth import estatisticas_senhas
+from ..utils.cache_tokens import cache_usuarios
+from ..utils.catalogo import catalogo
+from ..utils.pool import resumo_pool
+from ..utils.totais import pedidos_divergentes, verificar_totais
+
+diagnostico_router = APIRouter(prefix="/diagnostico", tags=["Diagnóstico"])
+
+# Estado do pool de conexões, para dimensionar o pool com a carga real
+@diagnostico_router.get("/pool")
+def estatisticas_pool():
+    resposta = {"sincrono": resumo_pool(database.engine)}
+    if database.async_engine is not None:
+        resposta["assincrono"] = resumo_pool(database.async_engine.sync_engine)
+    if database.engine_leitura is not database.engine:
+        resposta["leitura"] = resumo_pool(database.engine_leitura)
+    if database.async_engine_leitura is not database.async_engine:
+        resposta["leitura_assincrono"] = resumo_pool(database.async_engine_leitura.sync_engine)
+    return resposta
+
+# Hits, misses e invalidações do cache do cardápio
+@diagnostico_router.get("/catalogo")
+def estatisticas_catalogo():
+    return catalogo.estatisticas()
+
+# Hits, misses e invalidações do cache token -> usuário
+@diagnostico_router.get("/tokens")
+def estatisticas_cache_tokens():
+    return cache_usuarios.estatisticas()
+
+# Vazão do /token/login e custo do bcrypt no executor dedicado
+@diagnostico_router.get("/login")
+def estatisticas_de_login():
+    return {"login": estatisticas_login.resumo(), "bcrypt": estatisticas_senhas.resumo()}
+
+# Pedidos cujo total/item_count não confere com os itens (mesma verificação de `python -m app.utils.totais`)
+@diagnostico_router.get("/totais")
+def divergencias_de_totais(db: Session = Depends(get_db)):
+    return {"divergentes": pedidos_divergentes(db)}
+
+@diagnostico_router.post("/totais/reparar")
+def reparar_totais_divergentes(db: Session = Depends(get_db)):
+    return verificar_totais(db, reparar=True)
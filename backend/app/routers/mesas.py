@@ -1,19 +1,63 @@
 # app/routers/mesas.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from .. import models, schemas
-from ..database import get_db
+from ..database import get_db, get_db_leitura
+from ..utils.carregamento import opcoes_carregamento
+from ..utils.eventos import CABECALHOS_SSE, canal_mesas, dados_mesa, publicar_mesa, publicar_mesa_removida, transmitir
+from ..utils.http_cache import calcular_validador, resposta_condicional
+from ..utils.paginacao import Paginacao
 
 mesas_router = APIRouter(prefix="/mesas", tags=["Mesas"])
 
+def _consulta_mesas(db: Session):
+    # schemas.Mesa inclui situacao e cliente: carregados na mesma consulta
+    return db.query(models.Mesa).options(*opcoes_carregamento(models.Mesa, schemas.Mesa))
+
+def _obter_mesa(db: Session, id: int):
+    return _consulta_mesas(db).filter(models.Mesa.idmesa == id).populate_existing().first()
+
 @mesas_router.get("/", response_model=list[schemas.Mesa])
-def listar_mesas(db: Session = Depends(get_db)):
-    return db.query(models.Mesa).order_by(models.Mesa.numero).all()
+def listar_mesas(request: Request, response: Response, db: Session = Depends(get_db_leitura), pagina: Paginacao = Depends()):
+    # schemas.Mesa inclui situação e cliente: o validador cobre as três tabelas
+    nao_modificado = resposta_condicional(
+        request, response, calcular_validador(db, models.Mesa, models.SituacaoMesa, models.Cliente)
+    )
+    if nao_modificado:
+        return nao_modificado
+
+    mesas = pagina.filtrar(_consulta_mesas(db), models.Mesa.numero).all()
+    return pagina.fechar(mesas, "numero", response)
+
+def _snapshot_quadro(db: Session):
+    mesas = _consulta_mesas(db).order_by(models.Mesa.numero).all()
+    pedidos_abertos = db.query(models.Pedido.idpedido, models.Pedido.mesa_id).filter(models.Pedido.status == 'aberto').all()
+    return canal_mesas.evento_atual("snapshot", {
+        "mesas": [dados_mesa(mesa) for mesa in mesas],
+        "pedidos_abertos": [{"idpedido": idpedido, "mesa_id": mesa_id} for idpedido, mesa_id in pedidos_abertos],
+    })
+
+# Quadro de mesas em tempo real (Server-Sent Events): snapshot na conexão e depois só as mudanças
+@mesas_router.get("/eventos")
+async def eventos_mesas(db: Session = Depends(get_db)):
+    assinatura = canal_mesas.assinar()
+    try:
+        snapshot = await run_in_threadpool(_snapshot_quadro, db)
+    except Exception:
+        canal_mesas.cancelar(assinatura)
+        raise
+    return StreamingResponse(
+        transmitir(canal_mesas, assinatura, [snapshot]),
+        media_type="text/event-stream",
+        headers=CABECALHOS_SSE
+    )
 
 @mesas_router.get("/{id}", response_model=schemas.Mesa)
-def obter_mesa(id: int, db: Session = Depends(get_db)):
-    mesa = db.query(models.Mesa).filter(models.Mesa.idmesa == id).first()
+def obter_mesa(id: int, db: Session = Depends(get_db_leitura)):
+    mesa = _obter_mesa(db, id)
     if not mesa:
         raise HTTPException(status_code=404, detail="Mesa não encontrada.")
     return mesa
@@ -28,7 +72,8 @@ def criar_mesa(mesa: schemas.MesaCreate, db: Session = Depends(get_db)):
     db_mesa = models.Mesa(**mesa.model_dump())
     db.add(db_mesa)
     db.commit()
-    db.refresh(db_mesa)
+    db_mesa = _obter_mesa(db, db_mesa.idmesa)
+    publicar_mesa(db_mesa)
     return db_mesa
 
 @mesas_router.put("/{id}", response_model=schemas.Mesa)
@@ -41,7 +86,8 @@ def atualizar_mesa(id: int, mesa: schemas.MesaUpdate, db: Session = Depends(get_
         setattr(db_mesa, key, value)
     
     db.commit()
-    db.refresh(db_mesa)
+    db_mesa = _obter_mesa(db, id)
+    publicar_mesa(db_mesa)
     return db_mesa
 
 @mesas_router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -49,5 +95,7 @@ def deletar_mesa(id: int, db: Session = Depends(get_db)):
     mesa = db.query(models.Mesa).filter(models.Mesa.idmesa == id).first()
     if not mesa:
         raise HTTPException(status_code=404, detail="Mesa não encontrada.")
-    db.delete(mesa)
-    db.commit()
\ No newline at end of file
+    # DELETE direto: evita o lazy load de mesa.pedidos que o ORM faria ao excluir a mesa
+    db.query(models.Mesa).filter(models.Mesa.idmesa == id).delete()
+    db.commit()
+    publicar_mesa_removida(id)
\ No newline at end of file
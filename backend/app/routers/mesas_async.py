@@ -0,0 +1,104 @@
+# app/routers/mesas_async.py
+# Versão assíncrona de app/routers/mesas.py (ativada com DB_ASYNC=true)
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import models, schemas
+from ..database import get_async_db, get_async_db_leitura
+from ..utils.carregamento import opcoes_carregamento
+from ..utils.eventos import CABECALHOS_SSE, canal_mesas, dados_mesa, publicar_mesa, publicar_mesa_removida, transmitir
+from ..utils.http_cache import calcular_validador, resposta_condicional
+from ..utils.paginacao import Paginacao
+
+mesas_router = APIRouter(prefix="/mesas", tags=["Mesas"])
+
+def _consulta_mesas():
+    # schemas.Mesa inclui situacao e cliente: carregados antecipadamente (não há lazy load em async)
+    return select(models.Mesa).options(*opcoes_carregamento(models.Mesa, schemas.Mesa))
+
+async def _obter_mesa(db: AsyncSession, id: int):
+    return await db.scalar(
+        _consulta_mesas().filter(models.Mesa.idmesa == id).execution_options(populate_existing=True)
+    )
+
+@mesas_router.get("/", response_model=list[schemas.Mesa])
+async def listar_mesas(request: Request, response: Response, db: AsyncSession = Depends(get_async_db_leitura), pagina: Paginacao = Depends()):
+    # schemas.Mesa inclui situação e cliente: o validador cobre as três tabelas
+    validador = await db.run_sync(calcular_validador, models.Mesa, models.SituacaoMesa, models.Cliente)
+    nao_modificado = resposta_condicional(request, response, validador)
+    if nao_modificado:
+        return nao_modificado
+
+    mesas = await db.scalars(pagina.filtrar(_consulta_mesas(), models.Mesa.numero))
+    return pagina.fechar(mesas.all(), "numero", response)
+
+async def _snapshot_quadro(db: AsyncSession):
+    mesas = await db.scalars(_consulta_mesas().order_by(models.Mesa.numero))
+    pedidos_abertos = await db.execute(
+        select(models.Pedido.idpedido, models.Pedido.mesa_id).filter(models.Pedido.status == 'aberto')
+    )
+    return canal_mesas.evento_atual("snapshot", {
+        "mesas": [dados_mesa(mesa) for mesa in mesas],
+        "pedidos_abertos": [{"idpedido": idpedido, "mesa_id": mesa_id} for idpedido, mesa_id in pedidos_abertos],
+    })
+
+# Quadro de mesas em tempo real (Server-Sent Events): snapshot na conexão e depois só as mudanças
+@mesas_router.get("/eventos")
+async def eventos_mesas(db: AsyncSession = Depends(get_async_db)):
+    assinatura = canal_mesas.assinar()
+    try:
+        snapshot = await _snapshot_quadro(db)
+    except Exception:
+        canal_mesas.cancelar(assinatura)
+        raise
+    return StreamingResponse(
+        transmitir(canal_mesas, assinatura, [snapshot]),
+        media_type="text/event-stream",
+        headers=CABECALHOS_SSE
+    )
+
+@mesas_router.get("/{id}", response_model=schemas.Mesa)
+async def obter_mesa(id: int, db: AsyncSession = Depends(get_async_db_leitura)):
+    mesa = await _obter_mesa(db, id)
+    if not mesa:
+        raise HTTPException(status_code=404, detail="Mesa não encontrada.")
+    return mesa
+
+@mesas_router.post("/", response_model=schemas.Mesa, status_code=status.HTTP_201_CREATED)
+async def criar_mesa(mesa: schemas.MesaCreate, db: AsyncSession = Depends(get_async_db)):
+    db_mesa_existente = await db.scalar(select(models.Mesa.idmesa).filter(models.Mesa.numero == mesa.numero))
+    if db_mesa_existente:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Já existe uma mesa com este número.")
+
+    db_mesa = models.Mesa(**mesa.model_dump())
+    db.add(db_mesa)
+    await db.commit()
+    db_mesa = await _obter_mesa(db, db_mesa.idmesa)
+    publicar_mesa(db_mesa)
+    return db_mesa
+
+@mesas_router.put("/{id}", response_model=schemas.Mesa)
+async def atualizar_mesa(id: int, mesa: schemas.MesaUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_mesa = await db.get(models.Mesa, id)
+    if not db_mesa:
+        raise HTTPException(status_code=404, detail="Mesa não encontrada.")
+
+    for key, value in mesa.model_dump(exclude_unset=True).items():
+        setattr(db_mesa, key, value)
+
+    await db.commit()
+    db_mesa = await _obter_mesa(db, id)
+    publicar_mesa(db_mesa)
+    return db_mesa
+
+@mesas_router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
+async def deletar_mesa(id: int, db: AsyncSession = Depends(get_async_db)):
+    mesa = await db.get(models.Mesa, id)
+    if not mesa:
+        raise HTTPException(status_code=404, detail="Mesa não encontrada.")
+    # DELETE direto: evita o lazy load de mesa.pedidos que o ORM faria ao excluir a mesa
+    await db.execute(delete(models.Mesa).filter(models.Mesa.idmesa == id))
+    await db.commit()
+    publicar_mesa_removida(id)
@@ -0,0 +1,11 @@
+# app/routers/metricas.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ..utils.metricas import metricas
+
+metricas_router = APIRouter(tags=["Diagnóstico"])
+
+# Latência, status e SQL por rota no formato do Prometheus (ver app/utils/metricas.py)
+@metricas_router.get("/metrics", response_class=PlainTextResponse)
+def exposicao_metricas():
+    return PlainTextResponse(metricas.exposicao(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,11 +1,137 @@
 # app/routers/pagamentos.py
-from fastapi import APIRouter, Depends
+import hashlib
+from decimal import Decimal
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from ..database import get_db
+from .. import models, schemas
+from ..config import settings
+from ..database import get_db, get_db_leitura
+from ..utils.carregamento import opcoes_carregamento
+from ..utils.eventos import publicar_mesa, publicar_status_pedido
+from ..utils.paginacao import Paginacao
 
 pagamentos_router = APIRouter(prefix="/pagamentos", tags=["Pagamentos"])
 
-# Rotas de CRUD para pagamentos devem ser implementadas aqui
-@pagamentos_router.get("/")
-def listar_pagamentos(db: Session = Depends(get_db)):
-    return {"mensagem": "Implementar lógica para listar pagamentos"}
\ No newline at end of file
+CENTAVO = Decimal("0.01")
+
+@pagamentos_router.get("/", response_model=list[schemas.Pagamento])
+def listar_pagamentos(response: Response, db: Session = Depends(get_db_leitura), pagina: Paginacao = Depends()):
+    pagamentos = pagina.filtrar(db.query(models.Pagamento), models.Pagamento.idpagamento).all()
+    return pagina.fechar(pagamentos, "idpagamento", response)
+
+def _resposta_checkout(db: Session, pedido_id: int) -> dict:
+    pedido, modelo_pagamento = db.get(models.Pedido, pedido_id), models.Pagamento
+    if pedido is None:
+        # Reenvio de um checkout cujo pedido já foi arquivado
+        pedido, modelo_pagamento = db.get(models.PedidoArquivado, pedido_id), models.PagamentoArquivado
+    pagamentos = db.query(modelo_pagamento).filter(
+        modelo_pagamento.pedido_id == pedido_id
+    ).order_by(modelo_pagamento.idpagamento).all()
+    return {
+        "idpedido": pedido.idpedido,
+        "mesa_id": pedido.mesa_id,
+        "status": pedido.status,
+        "total": pedido.total,
+        "pagamentos": pagamentos,
+    }
+
+def _repetir_checkout(db: Session, chave: str, hash_requisicao: str, response: Response):
+    """Resposta de um checkout já feito com a mesma chave (None se a chave é nova)."""
+    checkout = db.get(models.Checkout, chave)
+    if checkout is None:
+        return None
+    if checkout.hash_requisicao != hash_requisicao:
+        raise HTTPException(status_code=422, detail="Idempotency-Key já usada com outro conteúdo.")
+    response.status_code = status.HTTP_200_OK
+    response.headers["Idempotent-Replayed"] = "true"
+    return _resposta_checkout(db, checkout.pedido_id)
+
+# Fecha a conta numa única transação: calcula o total, registra o(s) pagamento(s),
+# fecha o pedido e libera a mesa. Reenvios com a mesma Idempotency-Key devolvem o
+# resultado original em vez de cobrar de novo.
+@pagamentos_router.post("/checkout", response_model=schemas.Checkout, status_code=status.HTTP_201_CREATED)
+def checkout(
+    dados: schemas.CheckoutCreate,
+    response: Response,
+    idempotency_key: str = Header(..., min_length=1, max_length=100),
+    db: Session = Depends(get_db)
+):
+    hash_requisicao = hashlib.sha256(dados.model_dump_json().encode()).hexdigest()
+    repetido = _repetir_checkout(db, idempotency_key, hash_requisicao, response)
+    if repetido is not None:
+        return repetido
+
+    # FOR UPDATE: checkouts simultâneos do mesmo pedido são serializados
+    pedido = db.query(models.Pedido).filter(models.Pedido.idpedido == dados.pedido_id).with_for_update().first()
+    if not pedido:
+        raise HTTPException(status_code=404, detail="Pedido não encontrado.")
+    if pedido.status != 'aberto':
+        # Outro envio com a mesma chave pode ter fechado o pedido enquanto esperávamos o lock
+        db.rollback()
+        repetido = _repetir_checkout(db, idempotency_key, hash_requisicao, response)
+        if repetido is not None:
+            return repetido
+        raise HTTPException(status_code=409, detail="O pedido não está aberto.")
+
+    # O total cobrado vem dos itens (e corrige o total mantido, se tiver divergido)
+    total = Decimal(str(db.scalar(
+        select(func.coalesce(func.sum(models.PedidoProduto.quantidade * models.PedidoProduto.preco_unitario), 0))
+        .where(models.PedidoProduto.pedido_id == pedido.idpedido)
+    ))).quantize(CENTAVO)
+
+    if not dados.pagamentos:
+        raise HTTPException(status_code=400, detail="Informe ao menos um pagamento.")
+    if len(dados.pagamentos) > 1 and any(parte.valor is None for parte in dados.pagamentos):
+        raise HTTPException(status_code=400, detail="Informe o valor de cada parte do pagamento.")
+    valores = [total if parte.valor is None else parte.valor.quantize(CENTAVO) for parte in dados.pagamentos]
+    if any(valor < 0 for valor in valores):
+        raise HTTPException(status_code=400, detail="Os valores dos pagamentos não podem ser negativos.")
+    if sum(valores) != total:
+        raise HTTPException(status_code=400, detail=f"A soma dos pagamentos ({sum(valores)}) difere do total do pedido ({total}).")
+
+    ids_tipos = {parte.tipo_pagamento_id for parte in dados.pagamentos}
+    tipos = dict(
+        db.query(models.TipoPagamento.idtipopagamento, models.TipoPagamento.descricao)
+        .filter(models.TipoPagamento.idtipopagamento.in_(ids_tipos))
+        .all()
+    )
+    faltantes = sorted(ids_tipos - tipos.keys())
+    if faltantes:
+        raise HTTPException(status_code=404, detail=f"Tipo de pagamento com ID {faltantes[0]} não encontrado.")
+
+    situacao_livre = db.query(models.SituacaoMesa.id_situacao).filter(
+        models.SituacaoMesa.situacao_descricao == settings.situacao_mesa_livre
+    ).scalar()
+    if situacao_livre is None:
+        raise HTTPException(status_code=500, detail=f"Situação de mesa '{settings.situacao_mesa_livre}' não cadastrada.")
+
+    db.add_all([
+        models.Pagamento(pedido_id=pedido.idpedido, valor=valor, metodo_pagamento=tipos[parte.tipo_pagamento_id])
+        for parte, valor in zip(dados.pagamentos, valores)
+    ])
+    pedido.total = total
+    pedido.status = 'fechado'
+    pedido.version = pedido.version + 1
+    mesa = db.get(models.Mesa, pedido.mesa_id)
+    mesa.id_cliente_fk = None
+    mesa.id_situacao_fk = situacao_livre
+    db.add(models.Checkout(chave=idempotency_key, pedido_id=pedido.idpedido, hash_requisicao=hash_requisicao))
+    try:
+        db.commit()
+    except IntegrityError:
+        # Mesma chave confirmada por outra requisição ao mesmo tempo
+        db.rollback()
+        repetido = _repetir_checkout(db, idempotency_key, hash_requisicao, response)
+        if repetido is not None:
+            return repetido
+        raise HTTPException(status_code=400, detail="Erro de integridade ao fechar o pedido.")
+
+    # Recarrega a mesa com situação e cliente para o evento do quadro (formato de schemas.Mesa)
+    mesa = db.query(models.Mesa).options(*opcoes_carregamento(models.Mesa, schemas.Mesa)).filter(
+        models.Mesa.idmesa == mesa.idmesa
+    ).populate_existing().one()
+    publicar_status_pedido(pedido.idpedido, pedido.mesa_id, pedido.status)
+    publicar_mesa(mesa)
+    return _resposta_checkout(db, pedido.idpedido)
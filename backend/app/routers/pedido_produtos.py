@@ -1,15 +1,37 @@
 # app/routers/pedido_produtos.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from .. import models, schemas
-from ..database import get_db
+from ..database import fabrica_leitura, get_db, get_db_leitura
+from ..utils.carregamento import opcoes_carregamento
+from ..utils.catalogo import catalogo
+from ..utils.eventos import (
+    CABECALHOS_SSE, canal_cozinha, cursor_retomada, filtro_categoria, instantaneo_item,
+    publicar_itens_cozinha, snapshot_cozinha, transmitir
+)
+from ..utils.totais import PEDIDO_NAO_ABERTO, ajuste_totais
+from ..utils.paginacao import Paginacao
+from ..utils.streaming import pede_ndjson, resposta_ndjson
 
 pedido_produtos_router = APIRouter(
     prefix="/pedido_produtos", 
     tags=["Itens de Pedido"]
 )
 
+def _opcoes_itens():
+    # schemas.PedidoProduto inclui produto: carregado na mesma consulta
+    return opcoes_carregamento(models.PedidoProduto, schemas.PedidoProduto)
+
+def _obter_item(db: Session, idpedido_produto: int):
+    return db.query(models.PedidoProduto).options(*_opcoes_itens()).filter(
+        models.PedidoProduto.idpedido_produto == idpedido_produto
+    ).populate_existing().first()
+
 @pedido_produtos_router.post("/", response_model=schemas.PedidoProduto, status_code=status.HTTP_201_CREATED)
 def criar_pedido_produto(item: schemas.PedidoProdutoCreate, db: Session = Depends(get_db)):
     # Verifica se o pedido existe e está aberto
@@ -20,9 +42,9 @@ def criar_pedido_produto(item: schemas.PedidoProdutoCreate, db: Session = Depend
     if not pedido:
         raise HTTPException(status_code=404, detail="Pedido não encontrado ou não está aberto.")
     
-    # Verifica se o produto existe
-    produto = db.query(models.Produto).filter(models.Produto.idproduto == item.produto_id).first()
-    if not produto:
+    # Verifica se o produto existe (preço vindo do cache do cardápio)
+    preco = catalogo.preco(db, item.produto_id)
+    if preco is None:
         raise HTTPException(status_code=404, detail="Produto não encontrado.")
     
     # Cria o novo item de pedido
@@ -30,16 +52,56 @@ def criar_pedido_produto(item: schemas.PedidoProdutoCreate, db: Session = Depend
         pedido_id=item.pedido_id,
         produto_id=item.produto_id,
         quantidade=item.quantidade,
-        preco_unitario=produto.preco # Garante que o preço unitário vem do produto
+        preco_unitario=preco # Garante que o preço unitário vem do produto
     )
     db.add(db_item)
+    if db.execute(ajuste_totais(item.pedido_id, preco * item.quantidade, item.quantidade)).rowcount == 0:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=PEDIDO_NAO_ABERTO)
     db.commit()
-    db.refresh(db_item)
+    db_item = _obter_item(db, db_item.idpedido_produto)
+    publicar_itens_cozinha(db, "inserido", [instantaneo_item(db_item)])
     return db_item
 
 @pedido_produtos_router.get("/", response_model=list[schemas.PedidoProduto])
-def listar_pedido_produtos(db: Session = Depends(get_db)):
-    return db.query(models.PedidoProduto).all()
+def listar_pedido_produtos(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db_leitura),
+    pagina: Paginacao = Depends(),
+    formato: Optional[Literal["json", "ndjson"]] = Query(None)
+):
+    # Accept: application/x-ndjson (ou formato=ndjson): todos os itens a partir do cursor, em streaming
+    if pede_ndjson(request, formato):
+        consulta = select(models.PedidoProduto).options(*_opcoes_itens())
+        return resposta_ndjson(
+            pagina.ordenar(consulta, models.PedidoProduto.idpedido_produto), schemas.PedidoProduto,
+            sessoes=fabrica_leitura(request)
+        )
+
+    itens = pagina.filtrar(db.query(models.PedidoProduto).options(*_opcoes_itens()), models.PedidoProduto.idpedido_produto).all()
+    return pagina.fechar(itens, "idpedido_produto", response)
+
+# Fila da cozinha em tempo real (Server-Sent Events). Na reconexão o cliente envia o último
+# cursor (Last-Event-ID ou ?cursor=) e recebe só o que perdeu; sem cursor válido, um snapshot.
+@pedido_produtos_router.get("/eventos")
+async def eventos_cozinha(
+    cursor: Optional[str] = None,
+    categoria: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    assinatura, perdidos = canal_cozinha.assinar_desde(cursor_retomada(cursor, last_event_id))
+    try:
+        iniciais = perdidos if perdidos is not None else [await run_in_threadpool(snapshot_cozinha, db, categoria)]
+    except Exception:
+        canal_cozinha.cancelar(assinatura)
+        raise
+    return StreamingResponse(
+        transmitir(canal_cozinha, assinatura, iniciais, filtro_categoria(categoria)),
+        media_type="text/event-stream",
+        headers=CABECALHOS_SSE
+    )
 
 # --- NOVAS ROTAS ---
 
@@ -49,8 +111,13 @@ def remover_pedido_produto(idpedido_produto: int, db: Session = Depends(get_db))
     if not item:
         raise HTTPException(status_code=404, detail="Item de pedido não encontrado.")
     
+    removido = instantaneo_item(item)
+    if db.execute(ajuste_totais(item.pedido_id, -item.preco_unitario * item.quantidade, -item.quantidade)).rowcount == 0:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=PEDIDO_NAO_ABERTO)
     db.delete(item)
     db.commit()
+    publicar_itens_cozinha(db, "removido", [removido])
     return
 
 @pedido_produtos_router.put("/{idpedido_produto}", response_model=schemas.PedidoProduto)
@@ -62,8 +129,14 @@ def atualizar_quantidade_pedido_produto(idpedido_produto: int, item_update: sche
     if item_update.quantidade is not None:
         if item_update.quantidade <= 0:
             raise HTTPException(status_code=400, detail="A quantidade deve ser maior que zero. Use a rota DELETE para remover o item.")
+        diferenca = item_update.quantidade - item.quantidade
+        ajuste = ajuste_totais(item.pedido_id, item.preco_unitario * diferenca, diferenca)
+        if db.execute(ajuste).rowcount == 0:
+            db.rollback()
+            raise HTTPException(status_code=409, detail=PEDIDO_NAO_ABERTO)
         item.quantidade = item_update.quantidade
 
     db.commit()
-    db.refresh(item)
+    item = _obter_item(db, idpedido_produto)
+    publicar_itens_cozinha(db, "atualizado", [instantaneo_item(item)])
     return item
\ No newline at end of file
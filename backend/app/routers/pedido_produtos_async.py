@@ -0,0 +1,140 @@
+# app/routers/pedido_produtos_async.py
+# Versão assíncrona de app/routers/pedido_produtos.py (ativada com DB_ASYNC=true)
+
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import models, schemas
+from ..database import fabrica_leitura_async, get_async_db, get_async_db_leitura
+from ..utils.carregamento import opcoes_carregamento
+from ..utils.catalogo import catalogo
+from ..utils.eventos import (
+    CABECALHOS_SSE, canal_cozinha, cursor_retomada, filtro_categoria, instantaneo_item,
+    publicar_itens_cozinha, snapshot_cozinha, transmitir
+)
+from ..utils.totais import PEDIDO_NAO_ABERTO, ajuste_totais
+from ..utils.paginacao import Paginacao
+from ..utils.streaming import pede_ndjson, resposta_ndjson
+
+pedido_produtos_router = APIRouter(
+    prefix="/pedido_produtos", 
+    tags=["Itens de Pedido"]
+)
+
+def _consulta_itens():
+    # schemas.PedidoProduto inclui produto: carregado na mesma consulta (não há lazy load em async)
+    return select(models.PedidoProduto).options(*opcoes_carregamento(models.PedidoProduto, schemas.PedidoProduto))
+
+async def _obter_item(db: AsyncSession, idpedido_produto: int):
+    return await db.scalar(
+        _consulta_itens()
+        .filter(models.PedidoProduto.idpedido_produto == idpedido_produto)
+        .execution_options(populate_existing=True)
+    )
+
+@pedido_produtos_router.post("/", response_model=schemas.PedidoProduto, status_code=status.HTTP_201_CREATED)
+async def criar_pedido_produto(item: schemas.PedidoProdutoCreate, db: AsyncSession = Depends(get_async_db)):
+    # Verifica se o pedido existe e está aberto
+    pedido_id = await db.scalar(select(models.Pedido.idpedido).filter(
+        models.Pedido.idpedido == item.pedido_id,
+        models.Pedido.status == 'aberto'
+    ))
+    if not pedido_id:
+        raise HTTPException(status_code=404, detail="Pedido não encontrado ou não está aberto.")
+
+    # Verifica se o produto existe (preço vindo do cache do cardápio)
+    preco = await db.run_sync(catalogo.preco, item.produto_id)
+    if preco is None:
+        raise HTTPException(status_code=404, detail="Produto não encontrado.")
+
+    # Cria o novo item de pedido
+    db_item = models.PedidoProduto(
+        pedido_id=item.pedido_id,
+        produto_id=item.produto_id,
+        quantidade=item.quantidade,
+        preco_unitario=preco # Garante que o preço unitário vem do produto
+    )
+    db.add(db_item)
+    if (await db.execute(ajuste_totais(item.pedido_id, preco * item.quantidade, item.quantidade))).rowcount == 0:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=PEDIDO_NAO_ABERTO)
+    await db.commit()
+    db_item = await _obter_item(db, db_item.idpedido_produto)
+    await db.run_sync(publicar_itens_cozinha, "inserido", [instantaneo_item(db_item)])
+    return db_item
+
+@pedido_produtos_router.get("/", response_model=list[schemas.PedidoProduto])
+async def listar_pedido_produtos(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db_leitura),
+    pagina: Paginacao = Depends(),
+    formato: Optional[Literal["json", "ndjson"]] = Query(None)
+):
+    # Accept: application/x-ndjson (ou formato=ndjson): todos os itens a partir do cursor, em streaming
+    if pede_ndjson(request, formato):
+        return resposta_ndjson(
+            pagina.ordenar(_consulta_itens(), models.PedidoProduto.idpedido_produto), schemas.PedidoProduto,
+            assincrono=True, sessoes=fabrica_leitura_async(request)
+        )
+    itens = await db.scalars(pagina.filtrar(_consulta_itens(), models.PedidoProduto.idpedido_produto))
+    return pagina.fechar(itens.all(), "idpedido_produto", response)
+
+# Fila da cozinha em tempo real (Server-Sent Events). Na reconexão o cliente envia o último
+# cursor (Last-Event-ID ou ?cursor=) e recebe só o que perdeu; sem cursor válido, um snapshot.
+@pedido_produtos_router.get("/eventos")
+async def eventos_cozinha(
+    cursor: Optional[str] = None,
+    categoria: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    assinatura, perdidos = canal_cozinha.assinar_desde(cursor_retomada(cursor, last_event_id))
+    try:
+        iniciais = perdidos if perdidos is not None else [await db.run_sync(snapshot_cozinha, categoria)]
+    except Exception:
+        canal_cozinha.cancelar(assinatura)
+        raise
+    return StreamingResponse(
+        transmitir(canal_cozinha, assinatura, iniciais, filtro_categoria(categoria)),
+        media_type="text/event-stream",
+        headers=CABECALHOS_SSE
+    )
+
+@pedido_produtos_router.delete("/{idpedido_produto}", status_code=status.HTTP_204_NO_CONTENT)
+async def remover_pedido_produto(idpedido_produto: int, db: AsyncSession = Depends(get_async_db)):
+    item = await db.get(models.PedidoProduto, idpedido_produto)
+    if not item:
+        raise HTTPException(status_code=404, detail="Item de pedido não encontrado.")
+
+    removido = instantaneo_item(item)
+    if (await db.execute(ajuste_totais(item.pedido_id, -item.preco_unitario * item.quantidade, -item.quantidade))).rowcount == 0:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=PEDIDO_NAO_ABERTO)
+    await db.delete(item)
+    await db.commit()
+    await db.run_sync(publicar_itens_cozinha, "removido", [removido])
+    return
+
+@pedido_produtos_router.put("/{idpedido_produto}", response_model=schemas.PedidoProduto)
+async def atualizar_quantidade_pedido_produto(idpedido_produto: int, item_update: schemas.PedidoProdutoUpdate, db: AsyncSession = Depends(get_async_db)):
+    item = await db.get(models.PedidoProduto, idpedido_produto)
+    if not item:
+        raise HTTPException(status_code=404, detail="Item de pedido não encontrado.")
+
+    if item_update.quantidade is not None:
+        if item_update.quantidade <= 0:
+            raise HTTPException(status_code=400, detail="A quantidade deve ser maior que zero. Use a rota DELETE para remover o item.")
+        diferenca = item_update.quantidade - item.quantidade
+        ajuste = ajuste_totais(item.pedido_id, item.preco_unitario * diferenca, diferenca)
+        if (await db.execute(ajuste)).rowcount == 0:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail=PEDIDO_NAO_ABERTO)
+        item.quantidade = item_update.quantidade
+
+    await db.commit()
+    item = await _obter_item(db, idpedido_produto)
+    await db.run_sync(publicar_itens_cozinha, "atualizado", [instantaneo_item(item)])
+    return item
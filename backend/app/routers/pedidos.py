@@ -1,40 +1,50 @@
 # app/routers/pedidos.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from decimal import Decimal
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import IntegrityError
 from .. import models, schemas
-from ..database import get_db
+from ..database import get_db, get_db_leitura
+from ..utils.arquivamento import consulta_pedido_arquivado
+from ..utils.carregamento import opcoes_carregamento
+from ..utils.serializacao import resposta_rapida
+from ..utils.eventos import instantaneo_item, publicar_itens_cozinha, publicar_status_pedido
+from ..utils.sql_stats import contar_statements
+from ..utils.totais import PEDIDO_NAO_ABERTO, ajuste_totais
 
 pedidos_router = APIRouter(prefix="/pedidos", tags=["Pedidos"])
 
+def _consulta_pedidos(db: Session):
+    # schemas.Pedido inclui itens -> produto: carregados junto com o pedido
+    return db.query(models.Pedido).options(*opcoes_carregamento(models.Pedido, schemas.Pedido))
+
 @pedidos_router.get("/mesa/{mesa_id}", response_model=schemas.Pedido)
-def buscar_pedido_por_mesa(mesa_id: int, db: Session = Depends(get_db)):
-    pedido = db.query(models.Pedido).filter(
+def buscar_pedido_por_mesa(mesa_id: int, db: Session = Depends(get_db_leitura)):
+    pedido = _consulta_pedidos(db).filter(
         models.Pedido.mesa_id == mesa_id,
         models.Pedido.status == 'aberto'
-    ).options(
-        joinedload(models.Pedido.itens).joinedload(models.PedidoProduto.produto)
     ).first()
     
     if not pedido:
         raise HTTPException(status_code=404, detail="Nenhum pedido aberto encontrado para esta mesa.")
     
-    return pedido
+    # Comanda grande: monta a resposta sem revalidar os itens e codifica com orjson
+    return resposta_rapida(schemas.Pedido, pedido)
 
 # Rota adicionada para buscar um pedido por seu ID (requisitada pelo frontend)
 @pedidos_router.get("/{pedido_id}", response_model=schemas.Pedido)
-def buscar_pedido_por_id(pedido_id: int, db: Session = Depends(get_db)):
-    pedido = db.query(models.Pedido).filter(
-        models.Pedido.idpedido == pedido_id
-    ).options(
-        joinedload(models.Pedido.itens).joinedload(models.PedidoProduto.produto)
-    ).first()
+def buscar_pedido_por_id(pedido_id: int, db: Session = Depends(get_db_leitura)):
+    pedido = _consulta_pedidos(db).filter(models.Pedido.idpedido == pedido_id).first()
+    if not pedido:
+        # Pedidos fechados antigos ficam no arquivo (app/utils/arquivamento.py)
+        pedido = db.scalar(consulta_pedido_arquivado(pedido_id))
     
     if not pedido:
         raise HTTPException(status_code=404, detail="Pedido não encontrado.")
     
-    return pedido
+    return resposta_rapida(schemas.Pedido, pedido)
 
 
 @pedidos_router.post("/mesa/{mesa_id}", response_model=schemas.Pedido, status_code=status.HTTP_201_CREATED)
@@ -51,91 +61,240 @@ def criar_pedido_para_mesa(mesa_id: int, cliente_id: int, db: Session = Depends(
     novo_pedido = models.Pedido(mesa_id=mesa_id, cliente_id=cliente_id, status='aberto')
     db.add(novo_pedido)
     db.commit()
-    db.refresh(novo_pedido)
+    novo_pedido = _consulta_pedidos(db).filter(models.Pedido.idpedido == novo_pedido.idpedido).populate_existing().one()
+    publicar_status_pedido(novo_pedido.idpedido, novo_pedido.mesa_id, novo_pedido.status)
     return novo_pedido
 
+# Transições de status: 'fechado' só pelo checkout (que registra os pagamentos e fecha o total)
+# e um pedido fechado não volta a outro status
+FECHAR_SO_NO_CHECKOUT = "O pedido só pode ser fechado pelo checkout (POST /pagamentos/checkout)."
+PEDIDO_FECHADO_DEFINITIVO = "Um pedido fechado não pode mudar de status."
+
 @pedidos_router.post("/", response_model=schemas.Pedido, status_code=status.HTTP_201_CREATED)
-def criar_pedido_com_itens(pedido: schemas.PedidoCreate, db: Session = Depends(get_db)):
-    novo_pedido = models.Pedido(cliente_id=pedido.cliente_id, mesa_id=pedido.mesa_id, status=pedido.status)
-    db.add(novo_pedido)
-    db.commit()
-    db.refresh(novo_pedido)
-
-    for item_data in pedido.itens:
-        produto = db.query(models.Produto).filter(models.Produto.idproduto == item_data.produto_id).first()
-        if not produto:
-            raise HTTPException(status_code=404, detail=f"Produto com ID {item_data.produto_id} não encontrado.")
-
-        novo_item = models.PedidoProduto(
-            pedido_id=novo_pedido.idpedido,
-            produto_id=item_data.produto_id,
-            quantidade=item_data.quantidade,
-            preco_unitario=produto.preco
-        )
-        db.add(novo_item)
-    
-    try:
-        db.commit()
-        db.refresh(novo_pedido)
-        return novo_pedido
-    except IntegrityError:
-        db.rollback()
-        raise HTTPException(status_code=400, detail="Erro de integridade ao criar pedido.")
+def criar_pedido_com_itens(pedido: schemas.PedidoCreate, response: Response, db: Session = Depends(get_db)):
+    if pedido.status == 'fechado':
+        raise HTTPException(status_code=400, detail=FECHAR_SO_NO_CHECKOUT)
+    with contar_statements() as contador:
+        # Resolve todos os produtos do pedido com uma única consulta (IN)
+        ids_produtos = {item.produto_id for item in pedido.itens}
+        precos = dict(
+            db.query(models.Produto.idproduto, models.Produto.preco)
+            .filter(models.Produto.idproduto.in_(ids_produtos))
+            .all()
+        ) if ids_produtos else {}
 
-@pedidos_router.put("/{id}", response_model=schemas.Pedido)
-def atualizar_pedido(id: int, pedido_atualizado: schemas.PedidoUpdate, db: Session = Depends(get_db)):
-    pedido = db.query(models.Pedido).filter(models.Pedido.idpedido == id).first()
-    if not pedido:
+        faltantes = sorted(ids_produtos - precos.keys())
+        if faltantes:
+            raise HTTPException(status_code=404, detail=f"Produto com ID {faltantes[0]} não encontrado.")
+
+        try:
+            novo_pedido = models.Pedido(
+                cliente_id=pedido.cliente_id,
+                mesa_id=pedido.mesa_id,
+                status=pedido.status,
+                total=sum((precos[item.produto_id] * item.quantidade for item in pedido.itens), 0),
+                item_count=sum(item.quantidade for item in pedido.itens)
+            )
+            db.add(novo_pedido)
+            db.flush()
+
+            # Insere todos os itens em lote e confirma tudo numa única transação
+            if pedido.itens:
+                db.execute(insert(models.PedidoProduto), [
+                    {
+                        "pedido_id": novo_pedido.idpedido,
+                        "produto_id": item_data.produto_id,
+                        "quantidade": item_data.quantidade,
+                        "preco_unitario": precos[item_data.produto_id],
+                    }
+                    for item_data in pedido.itens
+                ])
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Erro de integridade ao criar pedido.")
+        publicar_status_pedido(novo_pedido.idpedido, pedido.mesa_id, pedido.status)
+
+        pedido_criado = _consulta_pedidos(db).filter(models.Pedido.idpedido == novo_pedido.idpedido).populate_existing().first()
+
+    response.headers["X-SQL-Statements"] = str(contador.statements)
+    publicar_itens_cozinha(db, "inserido", [instantaneo_item(item) for item in pedido_criado.itens])
+    return pedido_criado
+
+def aplicar_atualizacao_pedido(db: Session, id: int, pedido_atualizado: schemas.PedidoUpdate):
+    """Aplica o PUT do pedido com comandos em lote, sem commit (também usada pela rota assíncrona).
+
+    Uma consulta de produtos (IN), um INSERT em lote, um UPDATE em lote por chave primária e um
+    DELETE por lista de IDs. O UPDATE do pedido compara a versão (409 se outra edição entrou
+    antes) e já aplica a variação de total/item_count.
+    Fora do status 'aberto' só o status pode mudar, e nunca para 'fechado' nem a partir dele (o
+    checkout fecha o pedido): itens, totais, mesa e cliente ficam como o pagamento os encontrou.
+    Retorna (status, mesa_id) anteriores e os itens inseridos, atualizados e removidos.
+    """
+    # A versão é lida antes dos itens (com lock): um item alterado depois disso muda a versão
+    atual = db.execute(
+        select(models.Pedido.status, models.Pedido.mesa_id, models.Pedido.version)
+        .where(models.Pedido.idpedido == id)
+        .with_for_update()
+    ).first()
+    if not atual:
         raise HTTPException(status_code=404, detail="Pedido não encontrado.")
-    
-    update_data = pedido_atualizado.model_dump(exclude={"itens"}, exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(pedido, key, value)
+    if pedido_atualizado.version is not None and pedido_atualizado.version != atual.version:
+        raise HTTPException(status_code=409, detail="O pedido foi alterado por outra pessoa. Recarregue e tente novamente.")
+
+    valores = pedido_atualizado.model_dump(exclude={"itens", "version"}, exclude_unset=True)
+    if "status" in valores and valores["status"] != atual.status:
+        if valores["status"] == 'fechado':
+            raise HTTPException(status_code=409, detail=FECHAR_SO_NO_CHECKOUT)
+        if atual.status == 'fechado':
+            raise HTTPException(status_code=409, detail=PEDIDO_FECHADO_DEFINITIVO)
+    if atual.status != 'aberto' and (pedido_atualizado.itens is not None or valores.keys() - {"status"}):
+        raise HTTPException(status_code=409, detail=PEDIDO_NAO_ABERTO)
+    inseridos, atualizados, removidos = [], [], []
+    variacao_total, variacao_quantidade = Decimal(0), 0
 
     if pedido_atualizado.itens is not None:
-        itens_existentes = {item.idpedido_produto: item for item in pedido.itens}
+        existentes = {
+            linha.idpedido_produto: linha for linha in db.execute(
+                select(
+                    models.PedidoProduto.idpedido_produto,
+                    models.PedidoProduto.pedido_id,
+                    models.PedidoProduto.produto_id,
+                    models.PedidoProduto.quantidade,
+                    models.PedidoProduto.preco_unitario
+                ).where(models.PedidoProduto.pedido_id == id)
+            )
+        }
         ids_na_requisicao = {item.idpedido_produto for item in pedido_atualizado.itens if item.idpedido_produto is not None}
 
         for item_data in pedido_atualizado.itens:
-            if item_data.idpedido_produto in itens_existentes:
-                item_existente = itens_existentes[item_data.idpedido_produto]
-                if item_data.produto_id is not None:
-                    item_existente.produto_id = item_data.produto_id
-                if item_data.quantidade is not None:
-                    item_existente.quantidade = item_data.quantidade
-            elif item_data.idpedido_produto is None:
-                if item_data.produto_id is not None and item_data.quantidade is not None:
-                    produto = db.query(models.Produto).filter(models.Produto.idproduto == item_data.produto_id).first()
-                    if not produto:
-                        raise HTTPException(status_code=404, detail=f"Produto com ID {item_data.produto_id} não encontrado.")
-                    
-                    novo_item = models.PedidoProduto(
-                        pedido_id=pedido.idpedido,
-                        produto_id=item_data.produto_id,
-                        quantidade=item_data.quantidade,
-                        preco_unitario=produto.preco
-                    )
-                    db.add(novo_item)
-
-        for id_item, item_existente in itens_existentes.items():
+            existente = existentes.get(item_data.idpedido_produto)
+            if existente is None:
+                continue
+            produto_id = existente.produto_id if item_data.produto_id is None else item_data.produto_id
+            quantidade = existente.quantidade if item_data.quantidade is None else item_data.quantidade
+            if (produto_id, quantidade) != (existente.produto_id, existente.quantidade):
+                atualizados.append({
+                    "idpedido_produto": existente.idpedido_produto,
+                    "pedido_id": id,
+                    "produto_id": produto_id,
+                    "quantidade": quantidade,
+                })
+                variacao_total += existente.preco_unitario * (quantidade - existente.quantidade)
+                variacao_quantidade += quantidade - existente.quantidade
+
+        novos_itens = [
+            item_data for item_data in pedido_atualizado.itens
+            if item_data.idpedido_produto is None and item_data.produto_id is not None and item_data.quantidade is not None
+        ]
+        ids_produtos = {item_data.produto_id for item_data in novos_itens}
+        precos = dict(
+            db.query(models.Produto.idproduto, models.Produto.preco)
+            .filter(models.Produto.idproduto.in_(ids_produtos))
+            .all()
+        ) if ids_produtos else {}
+        faltantes = sorted(ids_produtos - precos.keys())
+        if faltantes:
+            raise HTTPException(status_code=404, detail=f"Produto com ID {faltantes[0]} não encontrado.")
+        for item_data in novos_itens:
+            variacao_total += precos[item_data.produto_id] * item_data.quantidade
+            variacao_quantidade += item_data.quantidade
+
+        for id_item, existente in existentes.items():
             if id_item not in ids_na_requisicao:
-                db.delete(item_existente)
+                removidos.append({
+                    "idpedido_produto": existente.idpedido_produto,
+                    "pedido_id": id,
+                    "produto_id": existente.produto_id,
+                    "quantidade": existente.quantidade,
+                })
+                variacao_total -= existente.preco_unitario * existente.quantidade
+                variacao_quantidade -= existente.quantidade
+
+    resultado = db.execute(
+        update(models.Pedido)
+        .where(models.Pedido.idpedido == id, models.Pedido.version == atual.version)
+        .values(
+            **valores,
+            total=models.Pedido.total + variacao_total,
+            item_count=models.Pedido.item_count + variacao_quantidade,
+            version=models.Pedido.version + 1
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if resultado.rowcount == 0:
+        raise HTTPException(status_code=409, detail="O pedido foi alterado por outra pessoa. Recarregue e tente novamente.")
 
+    if pedido_atualizado.itens is not None:
+        if novos_itens:
+            ids_novos = db.scalars(
+                insert(models.PedidoProduto).returning(models.PedidoProduto.idpedido_produto, sort_by_parameter_order=True),
+                [
+                    {
+                        "pedido_id": id,
+                        "produto_id": item_data.produto_id,
+                        "quantidade": item_data.quantidade,
+                        "preco_unitario": precos[item_data.produto_id],
+                    }
+                    for item_data in novos_itens
+                ]
+            ).all()
+            inseridos = [
+                {"idpedido_produto": id_novo, "pedido_id": id, "produto_id": item_data.produto_id, "quantidade": item_data.quantidade}
+                for id_novo, item_data in zip(ids_novos, novos_itens)
+            ]
+        if atualizados:
+            db.execute(update(models.PedidoProduto), [
+                {"idpedido_produto": item["idpedido_produto"], "produto_id": item["produto_id"], "quantidade": item["quantidade"]}
+                for item in atualizados
+            ])
+        if removidos:
+            db.execute(
+                delete(models.PedidoProduto)
+                .where(models.PedidoProduto.idpedido_produto.in_([item["idpedido_produto"] for item in removidos]))
+                .execution_options(synchronize_session=False)
+            )
+
+    return (atual.status, atual.mesa_id), inseridos, atualizados, removidos
+
+@pedidos_router.put("/{id}", response_model=schemas.Pedido)
+def atualizar_pedido(id: int, pedido_atualizado: schemas.PedidoUpdate, db: Session = Depends(get_db)):
+    estado_anterior, inseridos, atualizados, removidos = aplicar_atualizacao_pedido(db, id, pedido_atualizado)
     db.commit()
-    db.refresh(pedido)
+
+    pedido = _consulta_pedidos(db).filter(models.Pedido.idpedido == id).populate_existing().first()
+    if (pedido.status, pedido.mesa_id) != estado_anterior:
+        publicar_status_pedido(pedido.idpedido, pedido.mesa_id, pedido.status)
+    publicar_itens_cozinha(db, "inserido", inseridos)
+    publicar_itens_cozinha(db, "atualizado", atualizados)
+    publicar_itens_cozinha(db, "removido", removidos)
     return pedido
 
+# Pedidos fechados ou com pagamento não são excluídos: o pagamento registrado no checkout
+# precisa continuar apontando para o pedido (e para o total) que ele quitou
+PEDIDO_NAO_EXCLUIVEL = "Só pedidos abertos e sem pagamentos podem ser excluídos."
+
 @pedidos_router.delete("/{id_pedido}", status_code=status.HTTP_204_NO_CONTENT)
 def deletar_pedido(id_pedido: int, db: Session = Depends(get_db)):
-    pedido = db.query(models.Pedido).filter(models.Pedido.idpedido == id_pedido).first()
+    # Lock no pedido: um checkout concorrente espera a exclusão terminar (ou a exclusão espera o checkout)
+    pedido = db.query(models.Pedido).options(
+        selectinload(models.Pedido.itens), selectinload(models.Pedido.pagamentos)
+    ).filter(models.Pedido.idpedido == id_pedido).with_for_update().first()
     if not pedido:
         raise HTTPException(status_code=404, detail="Pedido não encontrado.")
+    if pedido.status != 'aberto' or pedido.pagamentos:
+        raise HTTPException(status_code=409, detail=PEDIDO_NAO_EXCLUIVEL)
     
+    removidos = []
     for item in pedido.itens:
+        removidos.append(instantaneo_item(item))
         db.delete(item)
 
+    mesa_id = pedido.mesa_id
     db.delete(pedido)
     db.commit()
+    publicar_status_pedido(id_pedido, mesa_id, None)
+    publicar_itens_cozinha(db, "removido", removidos)
 
 @pedidos_router.delete("/{id_pedido}/itens/{id_item}", status_code=status.HTTP_204_NO_CONTENT)
 def deletar_item_do_pedido(id_pedido: int, id_item: int, db: Session = Depends(get_db)):
@@ -147,7 +306,12 @@ def deletar_item_do_pedido(id_pedido: int, id_item: int, db: Session = Depends(g
     if not item:
         raise HTTPException(status_code=404, detail="Item de pedido não encontrado.")
 
+    removido = instantaneo_item(item)
+    if db.execute(ajuste_totais(id_pedido, -item.preco_unitario * item.quantidade, -item.quantidade)).rowcount == 0:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=PEDIDO_NAO_ABERTO)
     db.delete(item)
     db.commit()
+    publicar_itens_cozinha(db, "removido", [removido])
     
     
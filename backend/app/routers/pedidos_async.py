@@ -0,0 +1,174 @@
+# app/routers/pedidos_async.py
+# Versão assíncrona de app/routers/pedidos.py (ativada com DB_ASYNC=true)
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from .. import models, schemas
+from ..database import get_async_db, get_async_db_leitura
+from ..utils.arquivamento import consulta_pedido_arquivado
+from ..utils.carregamento import opcoes_carregamento
+from ..utils.serializacao import resposta_rapida
+from ..utils.eventos import instantaneo_item, publicar_itens_cozinha, publicar_status_pedido
+from ..utils.sql_stats import contar_statements
+from ..utils.totais import PEDIDO_NAO_ABERTO, ajuste_totais
+from .pedidos import FECHAR_SO_NO_CHECKOUT, PEDIDO_NAO_EXCLUIVEL, aplicar_atualizacao_pedido
+
+pedidos_router = APIRouter(prefix="/pedidos", tags=["Pedidos"])
+
+def _consulta_pedidos():
+    # schemas.Pedido inclui itens -> produto: carregados antecipadamente (não há lazy load em async)
+    return select(models.Pedido).options(
+        *opcoes_carregamento(models.Pedido, schemas.Pedido)
+    ).execution_options(populate_existing=True)
+
+async def _obter_pedido(db: AsyncSession, pedido_id: int):
+    return await db.scalar(_consulta_pedidos().filter(models.Pedido.idpedido == pedido_id))
+
+@pedidos_router.get("/mesa/{mesa_id}", response_model=schemas.Pedido)
+async def buscar_pedido_por_mesa(mesa_id: int, db: AsyncSession = Depends(get_async_db_leitura)):
+    pedido = await db.scalar(_consulta_pedidos().filter(
+        models.Pedido.mesa_id == mesa_id,
+        models.Pedido.status == 'aberto'
+    ).limit(1))
+
+    if not pedido:
+        raise HTTPException(status_code=404, detail="Nenhum pedido aberto encontrado para esta mesa.")
+
+    # Comanda grande: monta a resposta sem revalidar os itens e codifica com orjson
+    return resposta_rapida(schemas.Pedido, pedido)
+
+@pedidos_router.get("/{pedido_id}", response_model=schemas.Pedido)
+async def buscar_pedido_por_id(pedido_id: int, db: AsyncSession = Depends(get_async_db_leitura)):
+    pedido = await _obter_pedido(db, pedido_id)
+    if not pedido:
+        # Pedidos fechados antigos ficam no arquivo (app/utils/arquivamento.py)
+        pedido = await db.scalar(consulta_pedido_arquivado(pedido_id))
+
+    if not pedido:
+        raise HTTPException(status_code=404, detail="Pedido não encontrado.")
+
+    return resposta_rapida(schemas.Pedido, pedido)
+
+@pedidos_router.post("/mesa/{mesa_id}", response_model=schemas.Pedido, status_code=status.HTTP_201_CREATED)
+async def criar_pedido_para_mesa(mesa_id: int, cliente_id: int, db: AsyncSession = Depends(get_async_db)):
+    # Verifica se já existe um pedido aberto para esta mesa
+    existing_pedido = await db.scalar(select(models.Pedido.idpedido).filter(
+        models.Pedido.mesa_id == mesa_id,
+        models.Pedido.status == 'aberto'
+    ).limit(1))
+
+    if existing_pedido:
+        raise HTTPException(status_code=400, detail="Já existe um pedido aberto para esta mesa.")
+
+    novo_pedido = models.Pedido(mesa_id=mesa_id, cliente_id=cliente_id, status='aberto')
+    db.add(novo_pedido)
+    await db.commit()
+    publicar_status_pedido(novo_pedido.idpedido, mesa_id, 'aberto')
+    return await _obter_pedido(db, novo_pedido.idpedido)
+
+@pedidos_router.post("/", response_model=schemas.Pedido, status_code=status.HTTP_201_CREATED)
+async def criar_pedido_com_itens(pedido: schemas.PedidoCreate, response: Response, db: AsyncSession = Depends(get_async_db)):
+    if pedido.status == 'fechado':
+        raise HTTPException(status_code=400, detail=FECHAR_SO_NO_CHECKOUT)
+    with contar_statements() as contador:
+        # Resolve todos os produtos do pedido com uma única consulta (IN)
+        ids_produtos = {item.produto_id for item in pedido.itens}
+        precos = dict((await db.execute(
+            select(models.Produto.idproduto, models.Produto.preco)
+            .filter(models.Produto.idproduto.in_(ids_produtos))
+        )).all()) if ids_produtos else {}
+
+        faltantes = sorted(ids_produtos - precos.keys())
+        if faltantes:
+            raise HTTPException(status_code=404, detail=f"Produto com ID {faltantes[0]} não encontrado.")
+
+        try:
+            novo_pedido = models.Pedido(
+                cliente_id=pedido.cliente_id,
+                mesa_id=pedido.mesa_id,
+                status=pedido.status,
+                total=sum((precos[item.produto_id] * item.quantidade for item in pedido.itens), 0),
+                item_count=sum(item.quantidade for item in pedido.itens)
+            )
+            db.add(novo_pedido)
+            await db.flush()
+
+            # Insere todos os itens em lote e confirma tudo numa única transação
+            if pedido.itens:
+                await db.execute(insert(models.PedidoProduto), [
+                    {
+                        "pedido_id": novo_pedido.idpedido,
+                        "produto_id": item_data.produto_id,
+                        "quantidade": item_data.quantidade,
+                        "preco_unitario": precos[item_data.produto_id],
+                    }
+                    for item_data in pedido.itens
+                ])
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail="Erro de integridade ao criar pedido.")
+        publicar_status_pedido(novo_pedido.idpedido, pedido.mesa_id, pedido.status)
+
+        pedido_criado = await _obter_pedido(db, novo_pedido.idpedido)
+
+    response.headers["X-SQL-Statements"] = str(contador.statements)
+    await db.run_sync(publicar_itens_cozinha, "inserido", [instantaneo_item(item) for item in pedido_criado.itens])
+    return pedido_criado
+
+@pedidos_router.put("/{id}", response_model=schemas.Pedido)
+async def atualizar_pedido(id: int, pedido_atualizado: schemas.PedidoUpdate, db: AsyncSession = Depends(get_async_db)):
+    estado_anterior, inseridos, atualizados, removidos = await db.run_sync(aplicar_atualizacao_pedido, id, pedido_atualizado)
+    await db.commit()
+
+    pedido = await _obter_pedido(db, id)
+    if (pedido.status, pedido.mesa_id) != estado_anterior:
+        publicar_status_pedido(pedido.idpedido, pedido.mesa_id, pedido.status)
+    await db.run_sync(publicar_itens_cozinha, "inserido", inseridos)
+    await db.run_sync(publicar_itens_cozinha, "atualizado", atualizados)
+    await db.run_sync(publicar_itens_cozinha, "removido", removidos)
+    return pedido
+
+@pedidos_router.delete("/{id_pedido}", status_code=status.HTTP_204_NO_CONTENT)
+async def deletar_pedido(id_pedido: int, db: AsyncSession = Depends(get_async_db)):
+    pedido = await db.get(models.Pedido, id_pedido, with_for_update=True)
+    if not pedido:
+        raise HTTPException(status_code=404, detail="Pedido não encontrado.")
+    pago = await db.scalar(select(exists().where(models.Pagamento.pedido_id == id_pedido)))
+    if pedido.status != 'aberto' or pago:
+        raise HTTPException(status_code=409, detail=PEDIDO_NAO_EXCLUIVEL)
+
+    # DELETE direto: evita o lazy load de pedido.itens que o ORM faria ao excluir o pai
+    removidos = await db.execute(
+        delete(models.PedidoProduto).filter(models.PedidoProduto.pedido_id == id_pedido).returning(
+            models.PedidoProduto.idpedido_produto,
+            models.PedidoProduto.pedido_id,
+            models.PedidoProduto.produto_id,
+            models.PedidoProduto.quantidade
+        )
+    )
+    removidos = [dict(linha._mapping) for linha in removidos]
+    await db.execute(delete(models.Pedido).filter(models.Pedido.idpedido == id_pedido))
+    await db.commit()
+    publicar_status_pedido(id_pedido, pedido.mesa_id, None)
+    await db.run_sync(publicar_itens_cozinha, "removido", removidos)
+
+@pedidos_router.delete("/{id_pedido}/itens/{id_item}", status_code=status.HTTP_204_NO_CONTENT)
+async def deletar_item_do_pedido(id_pedido: int, id_item: int, db: AsyncSession = Depends(get_async_db)):
+    item = await db.scalar(select(models.PedidoProduto).filter(
+        models.PedidoProduto.idpedido_produto == id_item,
+        models.PedidoProduto.pedido_id == id_pedido
+    ))
+
+    if not item:
+        raise HTTPException(status_code=404, detail="Item de pedido não encontrado.")
+
+    removido = instantaneo_item(item)
+    if (await db.execute(ajuste_totais(id_pedido, -item.preco_unitario * item.quantidade, -item.quantidade))).rowcount == 0:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=PEDIDO_NAO_ABERTO)
+    await db.delete(item)
+    await db.commit()
+    await db.run_sync(publicar_itens_cozinha, "removido", [removido])
@@ -1,25 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from decimal import Decimal
-from typing import List, Optional
-from ..models import Produto, User
-from ..schemas import ProdutoCreate, Produto as ProdutoSchema, ProdutoUpdate
-from ..database import get_db
+from typing import List, Literal, Optional
+from ..models import PedidoProdutoArquivado, Produto, User
+from ..schemas import ProdutoCreate, Produto as ProdutoSchema, ProdutoUpdate, ResultadoImportacao
+from ..database import get_db, get_db_leitura
 from .users import get_current_active_user
+from ..utils.busca import buscar_produtos
+from ..utils.catalogo import catalogo
+from ..utils.exportacao import resposta_exportacao
+from ..utils.guarda_sql import orcamento_statements
+from ..utils.http_cache import resposta_condicional
+from ..utils.importacao import EspecificacaoImportacao, formato_da_requisicao, importar
+from ..utils.paginacao import Paginacao
 
 produtos_router = APIRouter(
     prefix="/produtos",
     tags=["Produtos"]
 )
 
-# Rota para listar produtos com filtros (pública)
+# Rota para listar produtos com filtros (pública). Fica no primário: o cardápio em cache é carregado
+# por esta rota e, lido de uma réplica atrasada, ficaria desatualizado por todo o TTL
 @produtos_router.get("/", response_model=List[ProdutoSchema])
 def listar_produtos(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
+    pagina: Paginacao = Depends(),
     descricao: str = Query(None),
     status_ativo: bool = Query(None, alias="status")
 ):
+    # Tablet já tem a versão atual do cardápio: 304 sem serializar nada
+    nao_modificado = resposta_condicional(request, response, catalogo.validador(db))
+    if nao_modificado:
+        return nao_modificado
+
+    # O cardápio muda pouco: serve a partir do cache em memória quando possível, já serializado
+    # (a resposta retornada diretamente não passa pelo response_model; os cabeçalhos vão junto)
+    if descricao is None and status_ativo is None and pagina.limit is None:
+        conteudo = catalogo.conteudo(db)
+        if conteudo is not None:
+            return Response(conteudo, media_type="application/json", headers=dict(response.headers))
+    produtos = catalogo.listar(db, descricao=descricao, status=status_ativo)
+    if produtos is not None:
+        produtos = pagina.fatiar(produtos, "idproduto", response)
+        return ORJSONResponse(produtos, headers=dict(response.headers))
+
     query = db.query(Produto)
     
     if descricao:
@@ -28,7 +56,37 @@ def listar_produtos(
     if status_ativo is not None:
         query = query.filter(Produto.status == status_ativo)
     
-    return query.all()
+    produtos = pagina.filtrar(query, Produto.idproduto).all()
+    return pagina.fechar(produtos, "idproduto", response)
+
+# Busca por relevância na descrição (índice trigram no Postgres, FTS5 no SQLite)
+@produtos_router.get("/busca", response_model=List[ProdutoSchema])
+def buscar_produtos_por_descricao(
+    q: str = Query(..., min_length=1),
+    limite: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db_leitura)
+):
+    return buscar_produtos(db, q, limite)
+
+IMPORTACAO_PRODUTOS = EspecificacaoImportacao(Produto, ProdutoCreate, "descricao")
+COLUNAS_EXPORTACAO = ["idproduto", "descricao", "preco", "categoria", "status", "data_criacao", "data_alteracao"]
+
+# Importação em lote: corpo CSV (com cabeçalho) ou NDJSON, lido em streaming e gravado em lotes.
+# Linhas inválidas ou com descrição já cadastrada são relatadas sem interromper a carga.
+@produtos_router.post("/importar", response_model=ResultadoImportacao, dependencies=[Depends(orcamento_statements(None))])
+async def importar_produtos(
+    request: Request,
+    formato: Optional[Literal["csv", "ndjson"]] = None,
+    db: Session = Depends(get_db)
+):
+    resultado = await importar(request, db, IMPORTACAO_PRODUTOS, formato_da_requisicao(request, formato))
+    if resultado["importados"]:
+        catalogo.invalidar()
+    return resultado
+
+@produtos_router.get("/exportar")
+def exportar_produtos(formato: Literal["csv", "ndjson"] = "csv"):
+    return resposta_exportacao(Produto, COLUNAS_EXPORTACAO, formato, "produtos")
 
 # Rota para criar um novo produto (SEM AUTENTICAÇÃO - TEMPORÁRIO)
 @produtos_router.post("/", response_model=ProdutoSchema, status_code=status.HTTP_201_CREATED)
@@ -55,6 +113,7 @@ def criar_produto(
         db_produto = Produto(**produto_data)
         db.add(db_produto)
         db.commit()
+        catalogo.invalidar()
         db.refresh(db_produto)
         
         print(f"DEBUG: Produto criado com ID: {db_produto.idproduto}")    # Para debug
@@ -100,6 +159,7 @@ def atualizar_produto(
 
     try:
         db.commit()
+        catalogo.invalidar()
         db.refresh(produto)
         return produto
     except IntegrityError:
@@ -127,12 +187,17 @@ def excluir_produto(
     from ..models import PedidoProduto # <--- Adicione esta linha no topo do arquivo
 
     associacao_existente = db.query(PedidoProduto).filter(PedidoProduto.produto_id == id).first()
+    # Itens de pedidos arquivados também mostram o produto
+    if not associacao_existente:
+        associacao_existente = db.query(PedidoProdutoArquivado).filter(PedidoProdutoArquivado.produto_id == id).first()
     if associacao_existente:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Este produto não pode ser excluído porque está associado a um pedido."
         )
 
-    db.delete(produto)
+    # Sem itens associados (verificado acima): DELETE direto, sem carregar a coleção pedido_produtos
+    db.query(Produto).filter(Produto.idproduto == id).delete()
     db.commit()
+    catalogo.invalidar()
     return
\ No newline at end of file
@@ -0,0 +1,66 @@
+# app/routers/relatorios.py
+# Relatórios de vendas: leem apenas as tabelas de rollup (vendas_hora / vendas_dia)
+from datetime import date
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from .. import models, schemas
+from ..database import get_db, get_db_leitura
+from ..utils.catalogo import catalogo
+from ..utils.guarda_sql import orcamento_statements
+from ..utils.rollup import atualizar_rollup, recalcular_rollup
+
+relatorios_router = APIRouter(prefix="/relatorios", tags=["Relatórios"])
+
+Dimensao = Literal["data", "hora", "produto_id", "categoria"]
+
+@relatorios_router.get("/vendas", response_model=list[schemas.LinhaVendas])
+def relatorio_vendas(
+    inicio: date,
+    fim: date,
+    agrupar: List[Dimensao] = Query(["data"]),
+    categoria: Optional[str] = None,
+    produto_id: Optional[int] = None,
+    db: Session = Depends(get_db_leitura)
+):
+    if fim < inicio:
+        raise HTTPException(status_code=400, detail="A data final deve ser igual ou posterior à inicial.")
+    dimensoes = list(dict.fromkeys(agrupar))
+
+    # Só agrupamentos por hora precisam do rollup horário; o diário tem 24x menos linhas
+    tabela = models.VendaHora if "hora" in dimensoes else models.VendaDia
+    colunas = [getattr(tabela, dimensao) for dimensao in dimensoes]
+    consulta = select(
+        *colunas,
+        func.sum(tabela.quantidade).label("quantidade"),
+        func.sum(tabela.valor).label("valor")
+    ).where(tabela.data >= inicio, tabela.data <= fim)
+    if categoria is not None:
+        consulta = consulta.where(tabela.categoria == categoria)
+    if produto_id is not None:
+        consulta = consulta.where(tabela.produto_id == produto_id)
+
+    linhas = []
+    for linha in db.execute(consulta.group_by(*colunas).order_by(*colunas)):
+        dados = dict(linha._mapping)
+        if "categoria" in dados:
+            dados["categoria"] = dados["categoria"] or None
+        if "produto_id" in dados:
+            produto = catalogo.obter(db, dados["produto_id"])
+            dados["descricao"] = produto.descricao if produto else None
+        linhas.append(dados)
+    return linhas
+
+# Executa o job incremental (o mesmo de `python -m app.utils.rollup`)
+# Jobs em lote: statements proporcionais ao volume processado, fora do orçamento do modo estrito
+@relatorios_router.post("/vendas/atualizar", dependencies=[Depends(orcamento_statements(None))])
+def atualizar_vendas(db: Session = Depends(get_db)):
+    return atualizar_rollup(db)
+
+# Refaz o período a partir dos itens (alterações e exclusões de itens já somados)
+@relatorios_router.post("/vendas/recalcular", dependencies=[Depends(orcamento_statements(None))])
+def recalcular_vendas(inicio: date, fim: date, db: Session = Depends(get_db)):
+    if fim < inicio:
+        raise HTTPException(status_code=400, detail="A data final deve ser igual ou posterior à inicial.")
+    return recalcular_rollup(db, inicio, fim)
@@ -0,0 +1,50 @@
+# app/routers/saude.py
+# Probes do orquestrador: liveness não toca no banco (um banco fora do ar não deve reiniciar
+# os workers); readiness tira o worker do balanceador enquanto o banco não responde.
+import time
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from .. import database
+
+saude_router = APIRouter(prefix="/health", tags=["Saúde"])
+
+def _verificar_sincrono(engine) -> float:
+    inicio = time.perf_counter()
+    with engine.connect() as conexao:
+        conexao.execute(text("SELECT 1"))
+    return time.perf_counter() - inicio
+
+async def _verificar_assincrono(engine) -> float:
+    inicio = time.perf_counter()
+    async with engine.connect() as conexao:
+        await conexao.execute(text("SELECT 1"))
+    return time.perf_counter() - inicio
+
+# O processo está de pé e atendendo (sem consultar o banco)
+@saude_router.get("/live")
+def vivacidade():
+    return {"status": "ok"}
+
+async def _resultado(verificacao) -> dict:
+    try:
+        return {"status": "ok", "ms": round(await verificacao * 1000, 2)}
+    except Exception as erro:
+        return {"status": "erro", "detalhe": f"{type(erro).__name__}: {erro}"[:300]}
+
+# O worker consegue falar com o banco (engine síncrono e, com DB_ASYNC, o assíncrono; réplica inclusa)
+@saude_router.get("/ready")
+async def prontidao():
+    verificacoes = {"sincrono": await _resultado(run_in_threadpool(_verificar_sincrono, database.engine))}
+    if database.async_engine is not None:
+        verificacoes["assincrono"] = await _resultado(_verificar_assincrono(database.async_engine))
+    if database.engine_leitura is not database.engine:
+        verificacoes["leitura"] = await _resultado(run_in_threadpool(_verificar_sincrono, database.engine_leitura))
+    if database.async_engine_leitura is not database.async_engine:
+        verificacoes["leitura_assincrono"] = await _resultado(_verificar_assincrono(database.async_engine_leitura))
+    pronto = all(verificacao["status"] == "ok" for verificacao in verificacoes.values())
+    return JSONResponse(
+        {"status": "ok" if pronto else "indisponivel", "banco": verificacoes},
+        status_code=200 if pronto else 503
+    )
@@ -1,9 +1,10 @@
 # app/routers/situacao_mesas.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from ..database import get_db
+from ..database import get_db_leitura
 from ..models import SituacaoMesa as SituacaoMesaModel
 from ..schemas import SituacaoMesa as SituacaoMesaSchema
+from ..utils.http_cache import calcular_validador, resposta_condicional
 
 situacao_mesas_router = APIRouter(
     prefix="/situacoes_mesas",
@@ -11,5 +12,8 @@ situacao_mesas_router = APIRouter(
 )
 
 @situacao_mesas_router.get("/", response_model=list[SituacaoMesaSchema])
-def listar_situacoes_mesa(db: Session = Depends(get_db)):
+def listar_situacoes_mesa(request: Request, response: Response, db: Session = Depends(get_db_leitura)):
+    nao_modificado = resposta_condicional(request, response, calcular_validador(db, SituacaoMesaModel))
+    if nao_modificado:
+        return nao_modificado
     return db.query(SituacaoMesaModel).all()
\ No newline at end of file
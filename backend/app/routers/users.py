@@ -1,23 +1,15 @@
 # app/routers/users.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from typing import Optional
-from passlib.context import CryptContext
-from jose import JWTError, jwt
 
 from .. import schemas, models, database
-from ..utils.auth import get_password_hash
-
-# Configurações do token JWT
-SECRET_KEY = "sua-chave-secreta-altamente-segura"  # <--- ALTERE ESTA CHAVE!
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
-
-# Contexto para hash de senhas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from ..utils.auth import get_password_hash_async
+from ..utils.auth_token import decode_token
+from ..utils.cache_tokens import cache_usuarios
+from ..utils.paginacao import Paginacao
 
 # Esquema de autenticação OAuth2
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/token/login")
@@ -36,65 +28,84 @@ def get_db():
     finally:
         db.close()
 
-# Funções de token JWT (Agora aqui no users.py)
-def get_user_from_token(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+# Resolve o usuário do token JWT (mesmo verificador de utils/auth_token usado no login)
+def get_user_from_token(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> schemas.User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Credenciais de autenticação inválidas",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        token_data = schemas.TokenData(username=username)
-    except JWTError:
-        raise credentials_exception
-    
+    payload = decode_token(token, credentials_exception)
+    token_data = schemas.TokenData(username=payload["sub"])
+
+    # Cache por (sub, exp): evita o SELECT em users a cada request protegida
+    chave = (token_data.username, payload.get("exp"))
+    usuario = cache_usuarios.obter(chave)
+    if usuario is not None:
+        return usuario
+
+    geracao = cache_usuarios.geracao
     user = db.query(models.User).filter(models.User.username == token_data.username).first()
     if user is None:
         raise credentials_exception
-    return user
+    usuario = schemas.User.model_validate(user)
+    if usuario.is_active:
+        cache_usuarios.guardar(chave, usuario, geracao, expira_em=payload.get("exp"))
+    return usuario
 
-def get_current_active_user(current_user: models.User = Depends(get_user_from_token)):
+def get_current_active_user(current_user: schemas.User = Depends(get_user_from_token)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Usuário inativo")
     return current_user
 
-# Rota para criar um novo usuário (POST) - NÃO precisa de proteção
-@router.post("/", response_model=schemas.User, status_code=status.HTTP_201_CREATED)
-def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.username == user.username).first()
-    if db_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Usuário já registrado"
-        )
-    
-    hashed_password = get_password_hash(user.password)
-    
+def _usuario_por_nome(db: Session, username: str):
+    return db.query(models.User).filter(models.User.username == username).first()
+
+def _usuario_por_id(db: Session, user_id: int):
+    return db.query(models.User).filter(models.User.id == user_id).first()
+
+def _salvar_novo_usuario(db: Session, username: str, hashed_password: str):
     new_user = models.User(
-        username=user.username,
+        username=username,
         hashed_password=hashed_password,
         is_active=True
     )
-    
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
-    
     return new_user
 
+def _salvar_atualizacao(db: Session, db_user: models.User, update_data: dict):
+    for key, value in update_data.items():
+        setattr(db_user, key, value)
+    db.commit()
+    cache_usuarios.invalidar_usuario(db_user.id)
+    db.refresh(db_user)
+    return db_user
+
+# Rota para criar um novo usuário (POST) - NÃO precisa de proteção
+# Assíncrona como o login: o bcrypt roda no executor dedicado e o banco no threadpool
+@router.post("/", response_model=schemas.User, status_code=status.HTTP_201_CREATED)
+async def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(_usuario_por_nome, db, user.username)
+    if db_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Usuário já registrado"
+        )
+    
+    hashed_password = await get_password_hash_async(user.password)
+    return await run_in_threadpool(_salvar_novo_usuario, db, user.username, hashed_password)
+
 # Rota para obter todos os usuários (GET) - PROTEGIDA
 @router.get("/", response_model=list[schemas.User])
-def get_all_users(current_user: models.User = Depends(get_current_active_user), db: Session = Depends(get_db)):
-    users = db.query(models.User).all()
-    return users
+def get_all_users(response: Response, current_user: schemas.User = Depends(get_current_active_user), db: Session = Depends(get_db), pagina: Paginacao = Depends()):
+    users = pagina.filtrar(db.query(models.User), models.User.id).all()
+    return pagina.fechar(users, "id", response)
 
 # Rota para obter um usuário pelo ID (GET) - PROTEGIDA
 @router.get("/{user_id}", response_model=schemas.User)
-def get_user(user_id: int, current_user: models.User = Depends(get_current_active_user), db: Session = Depends(get_db)):
+def get_user(user_id: int, current_user: schemas.User = Depends(get_current_active_user), db: Session = Depends(get_db)):
     user = db.query(models.User).filter(models.User.id == user_id).first()
     if user is None:
         raise HTTPException(
@@ -105,8 +116,8 @@ def get_user(user_id: int, current_user: models.User = Depends(get_current_activ
 
 # Rota para atualizar um usuário (PATCH) - PROTEGIDA
 @router.patch("/{user_id}", response_model=schemas.User)
-def update_user(user_id: int, user_update: schemas.UserUpdate, current_user: models.User = Depends(get_current_active_user), db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+async def update_user(user_id: int, user_update: schemas.UserUpdate, current_user: schemas.User = Depends(get_current_active_user), db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(_usuario_por_id, db, user_id)
     if db_user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -114,20 +125,14 @@ def update_user(user_id: int, user_update: schemas.UserUpdate, current_user: mod
         )
     
     update_data = user_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        if key == "password" and value:
-            setattr(db_user, "hashed_password", get_password_hash(value))
-        else:
-            setattr(db_user, key, value)
-            
-    db.commit()
-    db.refresh(db_user)
-    
-    return db_user
+    senha = update_data.pop("password", None)
+    if senha:
+        update_data["hashed_password"] = await get_password_hash_async(senha)
+    return await run_in_threadpool(_salvar_atualizacao, db, db_user, update_data)
 
 # Rota para "deletar" um usuário (DELETE) - PROTEGIDA
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(user_id: int, current_user: models.User = Depends(get_current_active_user), db: Session = Depends(get_db)):
+def delete_user(user_id: int, current_user: schemas.User = Depends(get_current_active_user), db: Session = Depends(get_db)):
     db_user = db.query(models.User).filter(models.User.id == user_id).first()
     if db_user is None:
         raise HTTPException(
@@ -137,4 +142,5 @@ def delete_user(user_id: int, current_user: models.User = Depends(get_current_ac
     
     db_user.is_active = False  # Desativa o usuário em vez de deletar
     db.commit()
+    cache_usuarios.invalidar_usuario(user_id)
     return {}
\ No newline at end of file
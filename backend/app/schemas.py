@@ -3,6 +3,7 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from datetime import datetime, date
+from decimal import Decimal
 
 # --- Schemas para Produto ---
 class ProdutoBase(BaseModel):
@@ -100,6 +101,7 @@ class PedidoProdutoCreate(BaseModel):
 class PedidoCreate(BaseModel):
     cliente_id: int
     mesa_id: int
+    status: str = 'aberto'
     itens: List[PedidoProdutoCreate]
 
 # Schema para o retorno de um item de pedido
@@ -116,6 +118,10 @@ class Pedido(BaseModel):
     mesa_id: int
     data_pedido: datetime
     status: str
+    # Soma de quantidade * preco_unitario e soma das quantidades dos itens
+    total: float
+    item_count: int
+    version: int
     # NOVO: Garante que a lista de itens do pedido usa o novo esquema
     itens: List[PedidoProduto]
     model_config = ConfigDict(from_attributes=True)
@@ -126,11 +132,61 @@ class PedidoProdutoUpdate(BaseModel):
     quantidade: Optional[int] = None
 
 class PedidoUpdate(BaseModel):
+    # Versão do pedido lida pelo cliente: se informada e desatualizada, a alteração é recusada (409)
+    version: Optional[int] = None
     cliente_id: Optional[int] = None
     mesa_id: Optional[int] = None
+    # 'fechado' só pelo checkout; um pedido fechado não muda de status (409)
     status: Optional[str] = None
     itens: Optional[List[PedidoProdutoUpdate]] = None
 
+# --- Schemas para Pagamentos ---
+class Pagamento(BaseModel):
+    idpagamento: int
+    pedido_id: int
+    valor: float
+    data_pagamento: Optional[datetime] = None
+    metodo_pagamento: str
+    model_config = ConfigDict(from_attributes=True)
+
+# Uma parte do pagamento; valor omitido só quando há uma única parte (paga o total)
+class PagamentoCheckout(BaseModel):
+    tipo_pagamento_id: int
+    valor: Optional[Decimal] = None
+
+class CheckoutCreate(BaseModel):
+    pedido_id: int
+    pagamentos: List[PagamentoCheckout]
+
+class Checkout(BaseModel):
+    idpedido: int
+    mesa_id: int
+    status: str
+    total: float
+    pagamentos: List[Pagamento]
+
+# --- Schemas para Importação em lote ---
+class ErroImportacao(BaseModel):
+    linha: int
+    erro: str
+
+class ResultadoImportacao(BaseModel):
+    importados: int
+    total_erros: int
+    # Limitado aos primeiros erros; total_erros traz a contagem completa
+    erros: List[ErroImportacao]
+
+# --- Schemas para Relatórios ---
+# Linha do relatório de vendas: só as dimensões agrupadas vêm preenchidas
+class LinhaVendas(BaseModel):
+    data: Optional[date] = None
+    hora: Optional[int] = None
+    produto_id: Optional[int] = None
+    descricao: Optional[str] = None
+    categoria: Optional[str] = None
+    quantidade: int
+    valor: float
+
 # --- Schemas para Auth e Users ---
 class UserCreate(BaseModel):
     username: str
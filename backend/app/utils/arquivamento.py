@@ -0,0 +1,120 @@
+# app/utils/arquivamento.py
+# Arquivamento de pedidos fechados: pedidos (com itens e pagamentos) fechados há mais de
+# ARQUIVO_DIAS dias saem de pedidos/pedido_produtos/pagamentos para as tabelas *_arquivo, em
+# lotes de ARQUIVO_LOTE pedidos (um commit por lote). As tabelas quentes ficam do tamanho do
+# movimento recente, e não do histórico inteiro.
+#
+# Uso (a partir de backend/):
+#   python -m app.utils.arquivamento                         # usa ARQUIVO_DIAS e ARQUIVO_LOTE
+#   python -m app.utils.arquivamento --dias 30 --lote 1000
+#
+# O rollup de vendas roda antes: um item só é arquivado depois de somado (idpedido_produto até
+# a marca do rollup). Os IDs são preservados; GET /pedidos/{id} procura no arquivo quando o
+# pedido não está mais nas tabelas quentes (consulta_pedido_arquivado).
+import sys
+from datetime import timedelta
+from typing import List, Optional
+from sqlalchemy import delete, exists, func, insert, select
+from sqlalchemy.orm import Session
+from .. import models, schemas
+from ..config import settings
+from .carregamento import opcoes_carregamento
+from .rollup import NOME_MARCA, atualizar_rollup
+
+STATUS_ARQUIVAVEL = "fechado"
+
+def _limite_idade(db: Session, dias: int):
+    # Relógio do banco, o mesmo que preenche data_pedido
+    if db.get_bind().dialect.name == "sqlite":
+        return func.datetime("now", f"-{int(dias)} days")
+    return func.now() - timedelta(days=dias)
+
+def _pedidos_protegidos(db: Session) -> set:
+    # No SQLite o próximo ID é o maior ID + 1: se a linha de maior ID fosse arquivada, o ID seria
+    # reutilizado e colidiria com o arquivo. Os pedidos donos do maior ID de cada tabela ficam
+    if db.get_bind().dialect.name != "sqlite":
+        return set()
+    protegidos = {
+        db.scalar(select(func.max(models.Pedido.idpedido))),
+        db.scalar(select(models.PedidoProduto.pedido_id).order_by(models.PedidoProduto.idpedido_produto.desc()).limit(1)),
+        db.scalar(select(models.Pagamento.pedido_id).order_by(models.Pagamento.idpagamento.desc()).limit(1)),
+    }
+    protegidos.discard(None)
+    return protegidos
+
+def _copiar(db: Session, origem, destino, filtro):
+    colunas = [coluna.name for coluna in origem.__table__.columns]
+    db.execute(insert(destino.__table__).from_select(colunas, select(*origem.__table__.columns).where(filtro)))
+
+def arquivar_pedidos(db: Session, dias: Optional[int] = None, lote: Optional[int] = None) -> dict:
+    """Move os pedidos fechados há mais de `dias` dias para o arquivo, `lote` pedidos por transação."""
+    dias = settings.arquivo_dias if dias is None else dias
+    lote = lote or settings.arquivo_lote
+    if dias < 0:
+        raise ValueError("O número de dias para arquivamento não pode ser negativo.")
+
+    atualizar_rollup(db)
+    marca = db.scalar(select(models.MarcaRollup.ultimo_id).where(models.MarcaRollup.nome == NOME_MARCA)) or 0
+    item_fora_do_rollup = exists().where(
+        models.PedidoProduto.pedido_id == models.Pedido.idpedido,
+        models.PedidoProduto.idpedido_produto > marca
+    )
+    filtros = [
+        models.Pedido.status == STATUS_ARQUIVAVEL,
+        models.Pedido.data_pedido < _limite_idade(db, dias),
+        ~item_fora_do_rollup,
+    ]
+    protegidos = _pedidos_protegidos(db)
+    if protegidos:
+        filtros.append(models.Pedido.idpedido.notin_(protegidos))
+
+    pedidos = itens = pagamentos = lotes = 0
+    ultimo_id = 0
+    while True:
+        # SKIP LOCKED (Postgres): pedidos bloqueados por outra transação ficam para a próxima execução
+        ids = db.scalars(
+            select(models.Pedido.idpedido)
+            .where(*filtros, models.Pedido.idpedido > ultimo_id)
+            .order_by(models.Pedido.idpedido)
+            .limit(lote)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not ids:
+            db.commit()
+            break
+
+        _copiar(db, models.Pedido, models.PedidoArquivado, models.Pedido.idpedido.in_(ids))
+        _copiar(db, models.PedidoProduto, models.PedidoProdutoArquivado, models.PedidoProduto.pedido_id.in_(ids))
+        _copiar(db, models.Pagamento, models.PagamentoArquivado, models.Pagamento.pedido_id.in_(ids))
+        pagamentos += db.execute(delete(models.Pagamento).where(models.Pagamento.pedido_id.in_(ids))).rowcount
+        itens += db.execute(delete(models.PedidoProduto).where(models.PedidoProduto.pedido_id.in_(ids))).rowcount
+        db.execute(delete(models.Pedido).where(models.Pedido.idpedido.in_(ids)))
+        db.commit()
+
+        pedidos += len(ids)
+        lotes += 1
+        ultimo_id = ids[-1]
+        if len(ids) < lote:
+            break
+    return {"pedidos": pedidos, "itens": itens, "pagamentos": pagamentos, "lotes": lotes}
+
+def consulta_pedido_arquivado(pedido_id: int):
+    """Select do pedido arquivado (com itens e produtos, como schemas.Pedido), para sessões síncronas e assíncronas."""
+    return select(models.PedidoArquivado).options(
+        *opcoes_carregamento(models.PedidoArquivado, schemas.Pedido)
+    ).where(models.PedidoArquivado.idpedido == pedido_id)
+
+def main(argv: List[str]) -> int:
+    from ..database import SessionLocal
+    dias = int(argv[argv.index("--dias") + 1]) if "--dias" in argv else None
+    lote = int(argv[argv.index("--lote") + 1]) if "--lote" in argv else None
+    with SessionLocal() as db:
+        resultado = arquivar_pedidos(db, dias=dias, lote=lote)
+    print(
+        f"{resultado['pedidos']} pedido(s) arquivado(s) em {resultado['lotes']} lote(s): "
+        f"{resultado['itens']} item(ns) e {resultado['pagamentos']} pagamento(s)."
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,12 +1,91 @@
 # app/utils/auth.py
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 from passlib.context import CryptContext
+from ..config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max iguais ao custo configurado: hashes com outro custo são marcados para re-hash
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+    bcrypt__max_rounds=settings.bcrypt_rounds,
+)
+
+# Executor dedicado ao bcrypt: limita quantos hashes rodam ao mesmo tempo e tira esse
+# trabalho do threadpool que atende as rotas (o bcrypt libera o GIL durante o cálculo)
+_executor_senhas = ThreadPoolExecutor(max_workers=settings.bcrypt_workers, thread_name_prefix="bcrypt")
+
+class EstatisticasSenhas:
+    """Contadores do trabalho de bcrypt (espera na fila e tempo de cálculo)."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.operacoes = 0
+        self.rehashes = 0
+        self.espera_total = 0.0
+        self.calculo_total = 0.0
+
+    def registrar(self, espera: float, calculo: float):
+        with self._lock:
+            self.operacoes += 1
+            self.espera_total += espera
+            self.calculo_total += calculo
+
+    def registrar_rehash(self):
+        with self._lock:
+            self.rehashes += 1
+
+    def resumo(self) -> dict:
+        with self._lock:
+            operacoes = max(self.operacoes, 1)
+            return {
+                "operacoes": self.operacoes,
+                "rehashes": self.rehashes,
+                "espera_media_ms": round(1000 * self.espera_total / operacoes, 3),
+                "calculo_medio_ms": round(1000 * self.calculo_total / operacoes, 3),
+                "bcrypt_rounds": settings.bcrypt_rounds,
+                "workers": settings.bcrypt_workers,
+            }
+
+estatisticas_senhas = EstatisticasSenhas()
+
+def _medir(funcao, *args):
+    enfileirado_em = time.perf_counter()
+    def executar():
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args)
+        finally:
+            estatisticas_senhas.registrar(inicio - enfileirado_em, time.perf_counter() - inicio)
+    return executar
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica se a senha em texto puro corresponde à senha hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return _executor_senhas.submit(_medir(pwd_context.verify, plain_password, hashed_password)).result()
 
 def get_password_hash(password: str) -> str:
     """Retorna o hash de uma senha em texto puro."""
-    return pwd_context.hash(password)
\ No newline at end of file
+    return _executor_senhas.submit(_medir(pwd_context.hash, password)).result()
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verifica a senha sem bloquear o event loop.
+
+    Retorna (valida, novo_hash); novo_hash vem preenchido quando o hash salvo usa um
+    custo diferente do configurado e deve ser substituído.
+    """
+    loop = asyncio.get_running_loop()
+    valida, novo_hash = await loop.run_in_executor(
+        _executor_senhas, _medir(pwd_context.verify_and_update, plain_password, hashed_password)
+    )
+    if novo_hash:
+        estatisticas_senhas.registrar_rehash()
+    return valida, novo_hash
+
+async def get_password_hash_async(password: str) -> str:
+    """Retorna o hash de uma senha sem bloquear o event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor_senhas, _medir(pwd_context.hash, password))
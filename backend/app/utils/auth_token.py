@@ -1,17 +1,7 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from pydantic_settings import BaseSettings
-
-class Settings(BaseSettings):
-    secret_key: str
-    algorithm: str
-    access_token_expire_minutes: int
-
-    class Config: 
-        env_file = ".env"
-
-settings = Settings()
+from ..config import settings
 
 # Funções JWT 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -24,12 +14,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
-def verify_token(token: str, credentials_exception):
+def decode_token(token: str, credentials_exception) -> dict:
+    """Valida o token e retorna o payload (com "sub" garantido)."""
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        return username
     except JWTError:
-        raise credentials_exception
\ No newline at end of file
+        raise credentials_exception
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
+
+def verify_token(token: str, credentials_exception):
+    return decode_token(token, credentials_exception)["sub"]
\ No newline at end of file
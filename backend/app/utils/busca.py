@@ -0,0 +1,89 @@
+# app/utils/busca.py
+# Busca por substring com índice: pg_trgm (GIN) no Postgres e FTS5 (tokenizer trigram) no SQLite.
+from typing import List
+from sqlalchemy import event, func, or_, text
+from sqlalchemy.orm import Session
+from ..models import Cliente, Produto
+
+# Tabelas pesquisáveis: tabela -> (chave primária, colunas indexadas)
+TABELAS_PESQUISAVEIS = {
+    "produtos": ("idproduto", ["descricao"]),
+    "clientes": ("idcliente", ["nome", "apelido", "telefone"]),
+}
+
+# O tokenizer trigram do FTS5 só indexa termos com pelo menos 3 caracteres
+TAMANHO_MINIMO_TRIGRAMA = 3
+
+def ddl_fts_sqlite(tabela: str) -> List[str]:
+    """Comandos que criam a tabela FTS5 de `tabela` e os triggers que a mantêm sincronizada."""
+    chave, colunas = TABELAS_PESQUISAVEIS[tabela]
+    fts = f"{tabela}_fts"
+    lista = ", ".join(colunas)
+    novos = ", ".join(f"new.{c}" for c in colunas)
+    antigos = ", ".join(f"old.{c}" for c in colunas)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({lista}, content='{tabela}', content_rowid='{chave}', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {tabela} BEGIN "
+        f"INSERT INTO {fts}(rowid, {lista}) VALUES (new.{chave}, {novos}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {tabela} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {lista}) VALUES ('delete', old.{chave}, {antigos}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {tabela} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {lista}) VALUES ('delete', old.{chave}, {antigos}); "
+        f"INSERT INTO {fts}(rowid, {lista}) VALUES (new.{chave}, {novos}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+def _criar_fts_apos_create(tabela, conexao, **kw):
+    # Mantém a busca funcionando em bancos SQLite criados via Base.metadata.create_all
+    if conexao.dialect.name == "sqlite":
+        for comando in ddl_fts_sqlite(tabela.name):
+            conexao.exec_driver_sql(comando)
+
+event.listen(Produto.__table__, "after_create", _criar_fts_apos_create)
+event.listen(Cliente.__table__, "after_create", _criar_fts_apos_create)
+
+def _ids_fts_sqlite(db: Session, tabela: str, termo: str, limite: int) -> List[int]:
+    # Frase entre aspas: o termo é tratado como substring, sem a sintaxe de consulta do FTS5
+    frase = '"' + termo.replace('"', '""') + '"'
+    linhas = db.execute(
+        text(f"SELECT rowid FROM {tabela}_fts WHERE {tabela}_fts MATCH :frase ORDER BY rank LIMIT :limite"),
+        {"frase": frase, "limite": limite},
+    )
+    return [linha[0] for linha in linhas]
+
+def _ordenar_por_ids(registros, chave: str, ids: List[int]):
+    por_id = {getattr(r, chave): r for r in registros}
+    return [por_id[i] for i in ids if i in por_id]
+
+def buscar_produtos(db: Session, termo: str, limite: int) -> List[Produto]:
+    """Produtos cuja descrição contém `termo`, do mais para o menos relevante."""
+    dialeto = db.get_bind().dialect.name
+    if dialeto == "sqlite" and len(termo) >= TAMANHO_MINIMO_TRIGRAMA:
+        ids = _ids_fts_sqlite(db, "produtos", termo, limite)
+        return _ordenar_por_ids(db.query(Produto).filter(Produto.idproduto.in_(ids)).all(), "idproduto", ids)
+
+    query = db.query(Produto).filter(Produto.descricao.icontains(termo, autoescape=True))
+    if dialeto == "postgresql":
+        # ILIKE '%termo%' usa o índice GIN gin_trgm_ops; similarity() ordena por relevância
+        query = query.order_by(func.similarity(Produto.descricao, termo).desc())
+    return query.order_by(Produto.idproduto).limit(limite).all()
+
+def buscar_clientes(db: Session, termo: str, limite: int) -> List[Cliente]:
+    """Clientes cujo nome, apelido ou telefone contém `termo`, do mais para o menos relevante."""
+    dialeto = db.get_bind().dialect.name
+    if dialeto == "sqlite" and len(termo) >= TAMANHO_MINIMO_TRIGRAMA:
+        ids = _ids_fts_sqlite(db, "clientes", termo, limite)
+        return _ordenar_por_ids(db.query(Cliente).filter(Cliente.idcliente.in_(ids)).all(), "idcliente", ids)
+
+    query = db.query(Cliente).filter(or_(
+        Cliente.nome.icontains(termo, autoescape=True),
+        Cliente.apelido.icontains(termo, autoescape=True),
+        Cliente.telefone.icontains(termo, autoescape=True),
+    ))
+    if dialeto == "postgresql":
+        query = query.order_by(func.greatest(
+            func.similarity(Cliente.nome, termo),
+            func.similarity(func.coalesce(Cliente.apelido, ""), termo),
+            func.similarity(func.coalesce(Cliente.telefone, ""), termo),
+        ).desc())
+    return query.order_by(Cliente.idcliente).limit(limite).all()
@@ -0,0 +1,70 @@
+# app/utils/cache_tokens.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+from ..config import settings
+from ..schemas import User as UserSchema
+
+class CacheUsuariosPorToken:
+    """Cache com TTL do usuário resolvido a partir de um token JWT.
+
+    A chave é (sub, exp) do token. Cada entrada expira no que vier primeiro: o TTL
+    do cache ou a expiração do próprio token.
+    """
+    def __init__(self, ttl_segundos: float, max_itens: int):
+        self.ttl_segundos = ttl_segundos
+        self.max_itens = max_itens
+        self._lock = threading.Lock()
+        self._entradas: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # Incrementada a cada invalidação: leituras do banco iniciadas antes dela não são guardadas
+        self.geracao = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidacoes = 0
+
+    def obter(self, chave: Hashable) -> Optional[UserSchema]:
+        agora = time.time()
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and entrada[1] > agora:
+                self._entradas.move_to_end(chave)
+                self.hits += 1
+                return entrada[0]
+            if entrada is not None:
+                del self._entradas[chave]
+            self.misses += 1
+            return None
+
+    def guardar(self, chave: Hashable, usuario: UserSchema, geracao: int, expira_em: Optional[float] = None):
+        validade = time.time() + self.ttl_segundos
+        if expira_em is not None:
+            validade = min(validade, expira_em)
+        with self._lock:
+            if geracao != self.geracao:
+                return
+            self._entradas[chave] = (usuario, validade)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_itens:
+                self._entradas.popitem(last=False)
+
+    def invalidar_usuario(self, user_id: int):
+        """Remove todas as entradas do usuário (chamado após alterar ou desativar o usuário)."""
+        with self._lock:
+            for chave in [c for c, (usuario, _) in self._entradas.items() if usuario.id == user_id]:
+                del self._entradas[chave]
+            self.geracao += 1
+            self.invalidacoes += 1
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                "itens": len(self._entradas),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidacoes": self.invalidacoes,
+                "ttl_segundos": self.ttl_segundos,
+                "max_itens": self.max_itens,
+            }
+
+cache_usuarios = CacheUsuariosPorToken(settings.cache_token_ttl_segundos, settings.cache_token_max_itens)
@@ -0,0 +1,46 @@
+# app/utils/carregamento.py
+# Opções de carregamento antecipado derivadas do schema de resposta: os relacionamentos que o
+# schema serializa são carregados junto com a consulta, em vez de um lazy load por objeto.
+from functools import lru_cache
+from typing import Optional, Tuple, Type, Union, get_args, get_origin
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+def _esquema_aninhado(anotacao) -> Optional[Type[BaseModel]]:
+    """Schema de um campo aninhado (X, Optional[X] ou List[X]); None para campos simples."""
+    origem = get_origin(anotacao)
+    if origem is Union or origem is list:
+        for argumento in get_args(anotacao):
+            esquema = _esquema_aninhado(argumento)
+            if esquema is not None:
+                return esquema
+        return None
+    if isinstance(anotacao, type) and issubclass(anotacao, BaseModel):
+        return anotacao
+    return None
+
+def _opcoes(modelo, esquema: Type[BaseModel]) -> list:
+    relacionamentos = inspect(modelo).relationships
+    opcoes = []
+    for nome, campo in esquema.model_fields.items():
+        relacionamento = relacionamentos.get(nome)
+        aninhado = _esquema_aninhado(campo.annotation)
+        if relacionamento is None or aninhado is None:
+            continue
+        # Coleção: SELECT ... IN separado (não multiplica as linhas do pai nem quebra LIMIT/yield_per).
+        # Muitos-para-um: JOIN na própria consulta
+        estrategia = selectinload if relacionamento.uselist else joinedload
+        opcao = estrategia(getattr(modelo, nome))
+        filhas = _opcoes(relacionamento.mapper.class_, aninhado)
+        opcoes.append(opcao.options(*filhas) if filhas else opcao)
+    return opcoes
+
+@lru_cache(maxsize=None)
+def opcoes_carregamento(modelo, esquema: Type[BaseModel]) -> Tuple:
+    """Loader options para consultar `modelo` já com tudo que `esquema` serializa.
+
+    Ex.: opcoes_carregamento(models.Mesa, schemas.Mesa) -> (joinedload(Mesa.situacao), joinedload(Mesa.cliente)).
+    Acompanha o schema: um campo aninhado novo passa a ser carregado sem mudar a rota.
+    """
+    return tuple(_opcoes(modelo, esquema))
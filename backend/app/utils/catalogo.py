@@ -0,0 +1,133 @@
+# app/utils/catalogo.py
+import threading
+import time
+from decimal import Decimal
+from typing import Dict, List, NamedTuple, Optional
+import orjson
+from sqlalchemy.orm import Session
+from ..config import settings
+from ..models import Produto
+from ..schemas import Produto as ProdutoSchema
+from .http_cache import Validador, calcular_validador, validador_de_valores
+
+class _Cardapio(NamedTuple):
+    produtos: Dict[int, ProdutoSchema]
+    validador: Validador
+    # Produtos já no formato JSON da resposta (model_dump(mode="json")) e o cardápio inteiro codificado
+    serializados: List[dict]
+    conteudo: bytes
+
+class CatalogoProdutos:
+    """Cache em memória do cardápio (tabela produtos).
+
+    O catálogo inteiro é carregado com um único SELECT e mantido até expirar o TTL
+    ou até uma rota de escrita de produtos chamar `invalidar()`. Catálogos maiores
+    que `max_itens` não são mantidos em memória: as consultas vão direto ao banco.
+    A serialização também é feita na carga: a listagem devolve os dicts (ou os bytes)
+    guardados, sem revalidar cada produto pelo response_model.
+    """
+    def __init__(self, ttl_segundos: float, max_itens: int):
+        self.ttl_segundos = ttl_segundos
+        self.max_itens = max_itens
+        self._lock = threading.Lock()
+        self._cardapio: Optional[_Cardapio] = None
+        self._carregado_em = 0.0
+        # Incrementada a cada invalidação: uma carga iniciada antes dela não é guardada
+        self._geracao = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidacoes = 0
+
+    def _carregar(self, db: Session) -> Optional[_Cardapio]:
+        with self._lock:
+            geracao = self._geracao
+        linhas = db.query(Produto).order_by(Produto.idproduto).limit(self.max_itens + 1).all()
+        if len(linhas) > self.max_itens:
+            return None
+        produtos = {p.idproduto: ProdutoSchema.model_validate(p) for p in linhas}
+        # Mesmos valores de calcular_validador(db, Produto), mas obtidos das linhas já carregadas
+        datas = [p.data_alteracao or p.data_criacao for p in linhas if p.data_alteracao or p.data_criacao]
+        validador = validador_de_valores((len(linhas), linhas[-1].idproduto if linhas else None, max(datas) if datas else None))
+        serializados = [produto.model_dump(mode="json") for produto in produtos.values()]
+        cardapio = _Cardapio(produtos, validador, serializados, orjson.dumps(serializados))
+        with self._lock:
+            if geracao == self._geracao:
+                self._cardapio = cardapio
+                self._carregado_em = time.monotonic()
+        return cardapio
+
+    def _em_cache(self):
+        # Deve ser chamado com o lock adquirido
+        if self._cardapio is not None and time.monotonic() - self._carregado_em < self.ttl_segundos:
+            self.hits += 1
+            return self._cardapio
+        self.misses += 1
+        return None
+
+    def _cardapio_atual(self, db: Session) -> Optional[_Cardapio]:
+        with self._lock:
+            cardapio = self._em_cache()
+        return cardapio or self._carregar(db)
+
+    def produtos(self, db: Session) -> Optional[Dict[int, ProdutoSchema]]:
+        """Retorna o catálogo indexado por idproduto, ou None se ele excede o limite do cache."""
+        cardapio = self._cardapio_atual(db)
+        return cardapio.produtos if cardapio else None
+
+    def validador(self, db: Session) -> Validador:
+        """Validador (ETag/Last-Modified) do cardápio; sem consulta ao banco quando o cache está válido."""
+        cardapio = self._cardapio_atual(db)
+        return cardapio.validador if cardapio else calcular_validador(db, Produto)
+
+    def listar(self, db: Session, descricao: Optional[str] = None, status: Optional[bool] = None) -> Optional[List[dict]]:
+        """Filtra o catálogo em memória (mesma semântica do ilike('%descricao%') e do filtro de status).
+
+        Devolve os produtos já serializados, na ordem de idproduto, para a resposta JSON direta.
+        """
+        cardapio = self._cardapio_atual(db)
+        if cardapio is None:
+            return None
+        termo = descricao.casefold() if descricao else None
+        return [
+            p for p in cardapio.serializados
+            if (termo is None or termo in p["descricao"].casefold())
+            and (status is None or p["status"] == status)
+        ]
+
+    def conteudo(self, db: Session) -> Optional[bytes]:
+        """O cardápio inteiro já codificado em JSON (listagem sem filtros nem paginação)."""
+        cardapio = self._cardapio_atual(db)
+        return cardapio.conteudo if cardapio else None
+
+    def obter(self, db: Session, idproduto: int) -> Optional[ProdutoSchema]:
+        """Busca um produto pelo ID, usando o catálogo em memória quando disponível."""
+        produtos = self.produtos(db)
+        if produtos is not None:
+            return produtos.get(idproduto)
+        produto = db.query(Produto).filter(Produto.idproduto == idproduto).first()
+        return ProdutoSchema.model_validate(produto) if produto else None
+
+    def preco(self, db: Session, idproduto: int) -> Optional[Decimal]:
+        """Preço atual do produto como Decimal (compatível com a coluna Numeric), ou None."""
+        produto = self.obter(db, idproduto)
+        return Decimal(str(produto.preco)) if produto else None
+
+    def invalidar(self):
+        with self._lock:
+            self._cardapio = None
+            self._geracao += 1
+            self.invalidacoes += 1
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                "itens": len(self._cardapio.produtos) if self._cardapio is not None else 0,
+                "carregado": self._cardapio is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidacoes": self.invalidacoes,
+                "ttl_segundos": self.ttl_segundos,
+                "max_itens": self.max_itens,
+            }
+
+catalogo = CatalogoProdutos(settings.catalogo_ttl_segundos, settings.catalogo_max_itens)
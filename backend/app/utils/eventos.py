@@ -0,0 +1,229 @@
+# app/utils/eventos.py
+# Canais de eventos em memória para as rotas de streaming (Server-Sent Events).
+import asyncio
+import json
+import threading
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from .. import models, schemas
+from ..config import settings
+from .catalogo import catalogo
+
+@dataclass(frozen=True)
+class Evento:
+    cursor: int
+    tipo: str
+    dados: Any = field(default=None)
+    origem: str = ""
+
+    @property
+    def id(self) -> str:
+        """Cursor qualificado pelo processo que publicou ("<origem>:<n>"), enviado como id do SSE."""
+        return f"{self.origem}:{self.cursor}"
+
+    def sse(self) -> str:
+        """Formata o evento no protocolo text/event-stream."""
+        return f"id: {self.id}\nevent: {self.tipo}\ndata: {json.dumps(self.dados, default=str)}\n\n"
+
+class Assinatura:
+    """Fila de eventos de um cliente conectado, ligada ao event loop que a consome."""
+    def __init__(self, loop: asyncio.AbstractEventLoop, tamanho_fila: int):
+        self.loop = loop
+        self.fila: asyncio.Queue = asyncio.Queue(maxsize=tamanho_fila)
+        # Cliente lento demais: perdeu eventos e precisa reconectar para receber um novo snapshot
+        self.atrasada = False
+
+    def _entregar(self, evento: Evento):
+        try:
+            self.fila.put_nowait(evento)
+        except asyncio.QueueFull:
+            self.atrasada = True
+
+    async def proximo(self, timeout: float) -> Optional[Evento]:
+        """Próximo evento, ou None se nada chegou dentro do timeout."""
+        try:
+            return await asyncio.wait_for(self.fila.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class CanalEventos:
+    """Publica eventos para todos os clientes conectados.
+
+    `publicar` pode ser chamado tanto das rotas síncronas (threadpool) quanto das
+    assíncronas; a entrega acontece no event loop de cada assinante. Com
+    `tamanho_historico` > 0 o canal guarda os últimos eventos para que um cliente
+    reconectado retome a partir do último cursor recebido.
+
+    O canal vive na memória do processo: cada worker numera os seus eventos. Os cursores levam
+    a origem (um id gerado a cada início do processo), e um cursor de outro worker ou de antes
+    de um restart não é retomado; o cliente recebe um snapshot.
+    """
+    def __init__(self, nome: str, tamanho_fila: int = 1000, tamanho_historico: int = 0):
+        self.nome = nome
+        self.tamanho_fila = tamanho_fila
+        self.origem = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self._assinaturas: set = set()
+        self._cursor = 0
+        self._historico: deque = deque(maxlen=tamanho_historico)
+
+    def publicar(self, tipo: str, dados: Any = None) -> Evento:
+        with self._lock:
+            self._cursor += 1
+            evento = Evento(self._cursor, tipo, dados, self.origem)
+            if self._historico.maxlen:
+                self._historico.append(evento)
+            assinaturas = list(self._assinaturas)
+        for assinatura in assinaturas:
+            try:
+                assinatura.loop.call_soon_threadsafe(assinatura._entregar, evento)
+            except RuntimeError:
+                # Event loop já encerrado: o cliente foi embora
+                self.cancelar(assinatura)
+        return evento
+
+    def assinar(self) -> Assinatura:
+        assinatura = Assinatura(asyncio.get_running_loop(), self.tamanho_fila)
+        with self._lock:
+            self._assinaturas.add(assinatura)
+        return assinatura
+
+    def _posicao(self, cursor: Optional[str]) -> Optional[int]:
+        # "<origem>:<n>" deste processo -> n; qualquer outro valor não é retomável
+        origem, _, numero = (cursor or "").rpartition(":")
+        if origem != self.origem or not numero.isdigit():
+            return None
+        return int(numero)
+
+    def assinar_desde(self, cursor: Optional[str]) -> Tuple[Assinatura, Optional[List[Evento]]]:
+        """Assina o canal e devolve os eventos publicados depois de `cursor` (Evento.id).
+
+        Retorna None no lugar da lista quando o cursor não pode ser retomado (ausente, mais
+        antigo que o histórico ou de outro processo): o cliente precisa de um snapshot.
+        Assinatura e cópia do histórico acontecem sob o mesmo lock, sem lacunas nem repetições.
+        """
+        assinatura = Assinatura(asyncio.get_running_loop(), self.tamanho_fila)
+        cursor = self._posicao(cursor)
+        with self._lock:
+            self._assinaturas.add(assinatura)
+            if cursor is None or cursor > self._cursor:
+                return assinatura, None
+            if cursor == self._cursor:
+                return assinatura, []
+            if not self._historico or self._historico[0].cursor > cursor + 1:
+                return assinatura, None
+            return assinatura, [evento for evento in self._historico if evento.cursor > cursor]
+
+    def cancelar(self, assinatura: Assinatura):
+        with self._lock:
+            self._assinaturas.discard(assinatura)
+
+    def evento_atual(self, tipo: str, dados: Any = None) -> Evento:
+        """Evento com o cursor atual do canal (usado nos snapshots enviados na conexão)."""
+        with self._lock:
+            return Evento(self._cursor, tipo, dados, self.origem)
+
+    @property
+    def conectados(self) -> int:
+        with self._lock:
+            return len(self._assinaturas)
+
+# Cabeçalhos das respostas text/event-stream (sem cache e sem buffer em proxies como o nginx)
+CABECALHOS_SSE = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# Intervalo entre comentários de keep-alive (mantém proxies e o EventSource conectados)
+INTERVALO_KEEPALIVE = 15
+
+async def transmitir(
+    canal: CanalEventos,
+    assinatura: Assinatura,
+    iniciais: Iterable[Evento] = (),
+    filtro: Optional[Callable[[Evento], bool]] = None
+) -> AsyncIterator[str]:
+    """Gera o corpo text/event-stream: eventos iniciais (snapshot ou retomada) e depois as mudanças publicadas."""
+    try:
+        for evento in iniciais:
+            if filtro is None or filtro(evento):
+                yield evento.sse()
+        while not assinatura.atrasada:
+            evento = await assinatura.proximo(INTERVALO_KEEPALIVE)
+            if evento is None:
+                yield ": keep-alive\n\n"
+            elif filtro is None or filtro(evento):
+                yield evento.sse()
+    finally:
+        canal.cancelar(assinatura)
+
+# Quadro de mesas (situação das mesas e abertura/fechamento de pedidos)
+canal_mesas = CanalEventos("mesas")
+
+def dados_mesa(mesa) -> dict:
+    return schemas.Mesa.model_validate(mesa).model_dump(mode="json")
+
+def publicar_mesa(mesa):
+    """Publica o estado atual da mesa (mesmo formato de schemas.Mesa)."""
+    canal_mesas.publicar("mesa", dados_mesa(mesa))
+
+def publicar_mesa_removida(idmesa: int):
+    canal_mesas.publicar("mesa_removida", {"idmesa": idmesa})
+
+def publicar_status_pedido(idpedido: int, mesa_id: int, status: Optional[str]):
+    """Avisa o quadro que um pedido abriu, mudou de status, fechou ou foi excluído (status None)."""
+    canal_mesas.publicar("pedido", {"idpedido": idpedido, "mesa_id": mesa_id, "status": status})
+
+# Fila da cozinha (itens de pedido inseridos, alterados e removidos).
+# Com vários workers, o cliente só retoma no worker que emitiu o cursor; nos demais (e após um
+# restart) recebe um snapshot.
+canal_cozinha = CanalEventos("cozinha", tamanho_historico=settings.cozinha_historico_eventos)
+
+def instantaneo_item(item) -> dict:
+    """Campos do PedidoProduto usados nos eventos da cozinha (capturados antes do commit)."""
+    return {
+        "idpedido_produto": item.idpedido_produto,
+        "pedido_id": item.pedido_id,
+        "produto_id": item.produto_id,
+        "quantidade": item.quantidade,
+    }
+
+def dados_item_cozinha(db: Session, acao: str, item: dict) -> dict:
+    # Descrição e categoria vêm do cache do cardápio, sem consulta extra por item
+    produto = catalogo.obter(db, item["produto_id"])
+    return {
+        **item,
+        "acao": acao,
+        "descricao": produto.descricao if produto else None,
+        "categoria": produto.categoria if produto else None,
+    }
+
+def publicar_itens_cozinha(db: Session, acao: str, itens: List[dict]):
+    """Publica itens "inserido", "atualizado" ou "removido" (use instantaneo_item para montar a lista)."""
+    for item in itens:
+        canal_cozinha.publicar("item", dados_item_cozinha(db, acao, item))
+
+def snapshot_cozinha(db: Session, categoria: Optional[str] = None) -> Evento:
+    """Itens dos pedidos abertos, com o cursor atual do canal (enviado quando não há retomada)."""
+    itens = db.query(models.PedidoProduto).join(models.Pedido).filter(
+        models.Pedido.status == 'aberto'
+    ).order_by(models.PedidoProduto.idpedido_produto).all()
+    dados = [dados_item_cozinha(db, "inserido", instantaneo_item(item)) for item in itens]
+    if categoria:
+        dados = [item for item in dados if (item["categoria"] or "").casefold() == categoria.casefold()]
+    return canal_cozinha.evento_atual("snapshot", {"itens": dados})
+
+def cursor_retomada(cursor: Optional[str], last_event_id: Optional[str]) -> Optional[str]:
+    # O EventSource reenvia o último id recebido no cabeçalho Last-Event-ID ao reconectar
+    return cursor or last_event_id or None
+
+def filtro_categoria(categoria: Optional[str]) -> Optional[Callable[[Evento], bool]]:
+    """Filtro de eventos por Produto.categoria (cada estação vê só os seus itens)."""
+    if not categoria:
+        return None
+    alvo = categoria.casefold()
+    def filtro(evento: Evento) -> bool:
+        if evento.tipo == "snapshot":
+            return True
+        return (evento.dados.get("categoria") or "").casefold() == alvo
+    return filtro
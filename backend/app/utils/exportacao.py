@@ -0,0 +1,60 @@
+# app/utils/exportacao.py
+# Exportação em streaming (CSV ou NDJSON): as linhas saem do banco em blocos, sem montar a tabela em memória.
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterator, List
+from fastapi.responses import StreamingResponse
+from sqlalchemy import inspect, select
+from .. import database
+
+# Linhas buscadas por vez (cursor no servidor no Postgres) e escritas por pedaço da resposta
+TAMANHO_BLOCO = 1000
+
+TIPOS_MIDIA = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+def _json_padrao(valor):
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+def _linhas(modelo, colunas: List[str]) -> Iterator[list]:
+    # Sessão própria: a sessão da dependência get_db já foi fechada quando o corpo é enviado.
+    # Exportação é leitura em massa: vai para a réplica, quando configurada
+    chave = inspect(modelo).primary_key[0]
+    with database.SessionLeitura() as db:
+        resultado = db.execute(
+            select(*[getattr(modelo, coluna) for coluna in colunas])
+            .order_by(chave)
+            .execution_options(yield_per=TAMANHO_BLOCO)
+        )
+        for bloco in resultado.partitions():
+            yield bloco
+
+def _gerar_csv(modelo, colunas: List[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(colunas)
+    for bloco in _linhas(modelo, colunas):
+        escritor.writerows(bloco)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    yield buffer.getvalue()
+
+def _gerar_ndjson(modelo, colunas: List[str]) -> Iterator[str]:
+    for bloco in _linhas(modelo, colunas):
+        yield "".join(json.dumps(dict(zip(colunas, linha)), default=_json_padrao, ensure_ascii=False) + "\n" for linha in bloco)
+
+def resposta_exportacao(modelo, colunas: List[str], formato: str, nome_arquivo: str) -> StreamingResponse:
+    """StreamingResponse com todas as linhas de `modelo` (colunas na ordem dada, ordenadas pela PK)."""
+    gerador = _gerar_ndjson if formato == "ndjson" else _gerar_csv
+    return StreamingResponse(
+        gerador(modelo, colunas),
+        media_type=TIPOS_MIDIA[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nome_arquivo}.{formato}"'}
+    )
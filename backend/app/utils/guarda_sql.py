@@ -0,0 +1,59 @@
+# app/utils/guarda_sql.py
+# Modo estrito de SQL para testes e desenvolvimento (SQL_MODO_ESTRITO=true): a requisição falha
+# quando faz lazy load de um relacionamento (o N+1 que opcoes_carregamento evita) ou quando
+# passa do orçamento de statements (SQL_ORCAMENTO_STATEMENTS).
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from .sql_stats import ContadorSQL, contar_statements
+
+class LazyLoadNaoPermitido(RuntimeError):
+    """Relacionamento carregado sob demanda durante uma requisição em modo estrito."""
+
+# Contador da requisição em andamento (None fora de requisições, ex.: jobs e CLI)
+_requisicao_atual: ContextVar[Optional[ContadorSQL]] = ContextVar("guarda_sql_requisicao", default=None)
+
+def _ao_executar_orm(estado):
+    if not estado.is_select or estado.lazy_loaded_from is None or _requisicao_atual.get() is None:
+        return
+    origem = estado.lazy_loaded_from
+    caminho = estado.loader_strategy_path
+    relacionamento = caminho[-1].key if caminho is not None and len(caminho) else "?"
+    raise LazyLoadNaoPermitido(
+        f"Lazy load de {origem.class_.__name__}.{relacionamento} durante a requisição. "
+        "Carregue o relacionamento na consulta (ver app/utils/carregamento.py)."
+    )
+
+def ativar_guarda_lazy_load():
+    """Registra a verificação de lazy load em todas as sessões (inclusive as internas das AsyncSession)."""
+    if not event.contains(Session, "do_orm_execute", _ao_executar_orm):
+        event.listen(Session, "do_orm_execute", _ao_executar_orm)
+
+def orcamento_statements(limite: Optional[int]):
+    """Dependência que troca o orçamento da requisição (None: sem limite), para rotas de lote.
+
+    Ex.: @router.post("/importar", dependencies=[Depends(orcamento_statements(None))])
+    """
+    def ajustar():
+        contador = _requisicao_atual.get()
+        if contador is not None:
+            contador.limite = limite
+    return ajustar
+
+class GuardaSQLMiddleware:
+    """Middleware ASGI do modo estrito: marca a requisição e aplica o orçamento de statements."""
+    def __init__(self, app, orcamento: Optional[int] = None):
+        self.app = app
+        self.orcamento = orcamento
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with contar_statements(self.orcamento) as contador:
+            token = _requisicao_atual.set(contador)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _requisicao_atual.reset(token)
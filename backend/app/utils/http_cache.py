@@ -0,0 +1,70 @@
+# app/utils/http_cache.py
+# GET condicional: ETag / Last-Modified e resposta 304 sem carregar as linhas.
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Sequence
+from fastapi import Request, Response, status
+from sqlalchemy import func, inspect, select
+from sqlalchemy.orm import Session
+
+@dataclass(frozen=True)
+class Validador:
+    """Resumo barato do estado de uma ou mais tabelas."""
+    valores: tuple
+    ultima_modificacao: Optional[datetime] = None
+
+def validador_de_valores(valores: Sequence) -> Validador:
+    datas = [v for v in valores if isinstance(v, datetime)]
+    return Validador(tuple(valores), max(datas) if datas else None)
+
+def _agregados(modelo) -> list:
+    # Quantidade de linhas e maior PK detectam inserções e exclusões; a maior data, as alterações
+    chave = inspect(modelo).primary_key[0]
+    colunas = [func.count(), func.max(chave)]
+    if hasattr(modelo, "data_alteracao"):
+        colunas.append(func.max(func.coalesce(modelo.data_alteracao, modelo.data_criacao)))
+    return [select(coluna).select_from(modelo).scalar_subquery() for coluna in colunas]
+
+def calcular_validador(db: Session, *modelos) -> Validador:
+    """Calcula o validador das tabelas com um único SELECT de agregados."""
+    colunas = [coluna for modelo in modelos for coluna in _agregados(modelo)]
+    return validador_de_valores(db.execute(select(*colunas)).one())
+
+def _etag(validador: Validador, request: Request) -> str:
+    # A query string entra no ETag: filtros e páginas diferentes têm validadores diferentes
+    resumo = hashlib.sha1(repr((validador.valores, request.url.path, request.url.query)).encode()).hexdigest()[:20]
+    return f'W/"{resumo}"'
+
+def _nao_modificado_desde(request: Request, ultima_modificacao: datetime) -> bool:
+    cabecalho = request.headers.get("if-modified-since")
+    if not cabecalho:
+        return False
+    try:
+        desde = parsedate_to_datetime(cabecalho)
+    except (TypeError, ValueError):
+        return False
+    if desde.tzinfo is None:
+        desde = desde.replace(tzinfo=timezone.utc)
+    return ultima_modificacao.replace(tzinfo=timezone.utc, microsecond=0) <= desde
+
+def resposta_condicional(request: Request, response: Response, validador: Validador) -> Optional[Response]:
+    """Define ETag/Last-Modified na resposta e retorna um 304 quando o cliente já tem a versão atual.
+
+    If-None-Match tem precedência; If-Modified-Since só é usado quando o cliente não envia ETag
+    (exclusões não alteram a data máxima, apenas o ETag as detecta).
+    """
+    cabecalhos = {"ETag": _etag(validador, request), "Cache-Control": "no-cache"}
+    if validador.ultima_modificacao is not None:
+        cabecalhos["Last-Modified"] = format_datetime(validador.ultima_modificacao.replace(tzinfo=timezone.utc), usegmt=True)
+    response.headers.update(cabecalhos)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etags = {etag.strip() for etag in if_none_match.split(",")}
+        if "*" in etags or cabecalhos["ETag"] in etags or cabecalhos["ETag"][2:] in etags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos)
+    elif validador.ultima_modificacao is not None and _nao_modificado_desde(request, validador.ultima_modificacao):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos)
+    return None
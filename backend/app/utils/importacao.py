@@ -0,0 +1,175 @@
+# app/utils/importacao.py
+# Importação em lote (CSV ou NDJSON) lida do corpo da requisição à medida que chega.
+import codecs
+import csv
+import json
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import AsyncIterator, List, Optional, Tuple, Type
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+# Linhas gravadas por INSERT (e por commit)
+TAMANHO_LOTE = 1000
+# Limite de erros detalhados na resposta (os demais só entram na contagem)
+MAX_ERROS_LISTADOS = 1000
+
+@dataclass(frozen=True)
+class EspecificacaoImportacao:
+    modelo: type
+    esquema: Type[BaseModel]
+    # Coluna UNIQUE usada para apontar linhas duplicadas
+    chave_unica: str
+
+def formato_da_requisicao(request: Request, formato: Optional[str]) -> str:
+    if formato:
+        return formato
+    return "ndjson" if "json" in request.headers.get("content-type", "") else "csv"
+
+async def _linhas(request: Request) -> AsyncIterator[str]:
+    # Decodifica em partes: um caractere UTF-8 pode chegar dividido entre dois pedaços
+    decodificador = codecs.getincrementaldecoder("utf-8-sig")()
+    resto = ""
+    async for pedaco in request.stream():
+        resto += decodificador.decode(pedaco)
+        *linhas, resto = resto.split("\n")
+        for linha in linhas:
+            yield linha.rstrip("\r")
+    resto += decodificador.decode(b"", final=True)
+    if resto:
+        yield resto.rstrip("\r")
+
+async def _registros(request: Request, formato: str) -> AsyncIterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Gera (número da linha, dados, erro) para cada registro do corpo."""
+    numero = 0
+    if formato == "ndjson":
+        async for linha in _linhas(request):
+            numero += 1
+            if not linha.strip():
+                continue
+            try:
+                dados = json.loads(linha)
+            except ValueError as e:
+                yield numero, None, f"JSON inválido: {e}"
+                continue
+            if not isinstance(dados, dict):
+                yield numero, None, "Esperado um objeto JSON por linha."
+                continue
+            yield numero, dados, None
+        return
+
+    cabecalho, pendente, inicio = None, "", 0
+    async for linha in _linhas(request):
+        numero += 1
+        if pendente:
+            pendente += "\n" + linha
+        else:
+            pendente, inicio = linha, numero
+        # Campo entre aspas com quebra de linha: o registro continua na próxima linha
+        if pendente.count('"') % 2:
+            continue
+        registro, pendente = pendente, ""
+        if not registro.strip():
+            continue
+        campos = next(csv.reader([registro]))
+        if cabecalho is None:
+            cabecalho = [campo.strip() for campo in campos]
+            continue
+        if len(campos) != len(cabecalho):
+            yield inicio, None, f"Esperadas {len(cabecalho)} colunas, encontradas {len(campos)}."
+            continue
+        yield inicio, {nome: (valor if valor != "" else None) for nome, valor in zip(cabecalho, campos)}, None
+    if pendente:
+        yield inicio, None, "Aspas não fechadas."
+
+def _registrar_erro(resultado: dict, linha: int, erro: str):
+    resultado["total_erros"] += 1
+    if len(resultado["erros"]) < MAX_ERROS_LISTADOS:
+        resultado["erros"].append({"linha": linha, "erro": erro})
+
+def _mensagem_validacao(erro: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(parte) for parte in detalhe['loc'])}: {detalhe['msg']}" for detalhe in erro.errors())
+
+def _inserir(db: Session, especificacao: EspecificacaoImportacao, linhas: List[dict]) -> set:
+    """Insere as linhas ignorando conflitos na chave única; retorna as chaves inseridas."""
+    tabela = especificacao.modelo.__table__
+    coluna = tabela.c[especificacao.chave_unica]
+    dialeto = db.get_bind().dialect.name
+    if dialeto in ("postgresql", "sqlite"):
+        # INSERT de várias linhas com ON CONFLICT DO NOTHING: o RETURNING traz só as inseridas
+        insercao = (postgresql if dialeto == "postgresql" else sqlite).insert(tabela)
+        comando = insercao.on_conflict_do_nothing(index_elements=[coluna.name]).returning(coluna)
+        return set(db.execute(comando, linhas).scalars())
+
+    chaves = [linha[coluna.name] for linha in linhas if linha[coluna.name] is not None]
+    existentes = set(db.scalars(select(coluna).where(coluna.in_(chaves)))) if chaves else set()
+    novas = [linha for linha in linhas if linha[coluna.name] not in existentes]
+    if novas:
+        db.execute(insert(tabela), novas)
+    return {linha[coluna.name] for linha in novas}
+
+def _gravar_lote(db: Session, especificacao: EspecificacaoImportacao, lote: List[Tuple[int, dict]], resultado: dict):
+    chave = especificacao.chave_unica
+    vistos, linhas = {}, []
+    for numero, dados in lote:
+        valor = dados.get(chave)
+        if valor is not None and valor in vistos:
+            _registrar_erro(resultado, numero, f"{chave} '{valor}' repetido no arquivo (linha {vistos[valor]}).")
+            continue
+        if valor is not None:
+            vistos[valor] = numero
+        linhas.append((numero, dados))
+
+    try:
+        inseridas = _inserir(db, especificacao, [dados for _, dados in linhas])
+        db.commit()
+    except IntegrityError:
+        # Outra violação (não a chave única): grava linha a linha para apontar as culpadas
+        db.rollback()
+        for numero, dados in linhas:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(especificacao.modelo.__table__), [dados])
+                resultado["importados"] += 1
+            except IntegrityError as e:
+                _registrar_erro(resultado, numero, f"Erro de integridade: {e.orig}")
+        db.commit()
+        return
+
+    for numero, dados in linhas:
+        valor = dados.get(chave)
+        if valor is None or valor in inseridas:
+            resultado["importados"] += 1
+        else:
+            _registrar_erro(resultado, numero, f"{chave} '{valor}' já cadastrado.")
+
+async def importar(request: Request, db: Session, especificacao: EspecificacaoImportacao, formato: str) -> dict:
+    """Lê o corpo em streaming, valida cada registro com o schema e grava em lotes de TAMANHO_LOTE.
+
+    Cada lote é confirmado separadamente: em caso de erro, os lotes anteriores permanecem gravados.
+    """
+    resultado = {"importados": 0, "total_erros": 0, "erros": []}
+    lote = []
+    async for numero, dados, erro in _registros(request, formato):
+        if erro is None:
+            try:
+                dados = especificacao.esquema.model_validate(dados).model_dump()
+            except ValidationError as e:
+                erro = _mensagem_validacao(e)
+        if erro is not None:
+            _registrar_erro(resultado, numero, erro)
+            continue
+        # Numeric: float convertido via str, como em criar_produto
+        lote.append((numero, {k: Decimal(str(v)) if isinstance(v, float) else v for k, v in dados.items()}))
+        if len(lote) >= TAMANHO_LOTE:
+            await run_in_threadpool(_gravar_lote, db, especificacao, lote, resultado)
+            lote = []
+    if lote:
+        await run_in_threadpool(_gravar_lote, db, especificacao, lote, resultado)
+    resultado["erros"].sort(key=lambda erro: erro["linha"])
+    return resultado
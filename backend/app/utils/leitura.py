@@ -0,0 +1,51 @@
+# app/utils/leitura.py
+# Read-your-writes com réplica de leitura: depois de uma escrita bem-sucedida o cliente recebe um
+# cookie com o prazo até o qual get_db_leitura usa o primário, cobrindo o atraso de replicação
+# (a réplica pode ainda não ter o pedido que o próprio garçom acabou de lançar).
+import time
+from http.cookies import SimpleCookie
+from fastapi import Request
+
+COOKIE_LER_PRIMARIO = "ler_primario_ate"
+
+# Métodos que não alteram dados: não abrem a janela de leitura no primário
+METODOS_SEGUROS = {"GET", "HEAD", "OPTIONS"}
+
+def le_do_primario(request: Request) -> bool:
+    """True se o cliente escreveu há menos de leitura_apos_escrita_segundos."""
+    valor = request.cookies.get(COOKIE_LER_PRIMARIO)
+    if not valor:
+        return False
+    try:
+        return float(valor) > time.time()
+    except ValueError:
+        return False
+
+class LeituraAposEscritaMiddleware:
+    """Middleware ASGI que marca, por cookie, os clientes que acabaram de escrever.
+
+    O prazo vai no valor do cookie (e não só no Max-Age) para valer também com clientes que
+    ignoram a expiração; como fica no cliente, vale em qualquer worker.
+    """
+    def __init__(self, app, janela_segundos: float):
+        self.app = app
+        self.janela_segundos = janela_segundos
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in METODOS_SEGUROS:
+            await self.app(scope, receive, send)
+            return
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "http.response.start" and mensagem["status"] < 400:
+                cookie = SimpleCookie()
+                cookie[COOKIE_LER_PRIMARIO] = repr(time.time() + self.janela_segundos)
+                cookie[COOKIE_LER_PRIMARIO]["max-age"] = max(1, round(self.janela_segundos))
+                cookie[COOKIE_LER_PRIMARIO]["path"] = "/"
+                cookie[COOKIE_LER_PRIMARIO]["httponly"] = True
+                cookie[COOKIE_LER_PRIMARIO]["samesite"] = "Lax"
+                cabecalho = cookie.output(header="").strip().encode("latin-1")
+                mensagem = {**mensagem, "headers": list(mensagem.get("headers", [])) + [(b"set-cookie", cabecalho)]}
+            await send(mensagem)
+
+        await self.app(scope, receive, enviar)
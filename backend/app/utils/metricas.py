@@ -0,0 +1,167 @@
+# app/utils/metricas.py
+# Métricas por rota (latência, status, requisições em andamento, statements e tempo de SQL)
+# no formato texto do Prometheus, servidas em GET /metrics.
+#
+# Os valores ficam na memória de cada processo: com vários workers, o Prometheus deve coletar
+# cada worker (ou somar as séries por instância).
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+from .sql_stats import contar_statements
+
+# Limites dos buckets (segundos e statements por requisição)
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_STATEMENTS = (1, 2, 3, 5, 10, 20, 50, 100, 200)
+BUCKETS_TEMPO_SQL = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Rótulo das requisições que não casaram com nenhuma rota (404): o caminho bruto não vira
+# rótulo, senão cada URL inexistente criaria uma série nova
+ROTA_DESCONHECIDA = "<sem rota>"
+
+Rotulos = Tuple[Tuple[str, str], ...]
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _formatar_rotulos(rotulos: Rotulos) -> str:
+    if not rotulos:
+        return ""
+    return "{" + ",".join(f'{nome}="{_escapar(valor)}"' for nome, valor in rotulos) + "}"
+
+def _formatar_numero(valor: float) -> str:
+    if valor == math.inf:
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+class Contador:
+    def __init__(self, nome: str, ajuda: str):
+        self.nome, self.ajuda = nome, ajuda
+        self.valores: Dict[Rotulos, float] = {}
+
+    def incrementar(self, rotulos: Rotulos, valor: float = 1):
+        self.valores[rotulos] = self.valores.get(rotulos, 0) + valor
+
+    def linhas(self) -> Iterable[str]:
+        yield f"# HELP {self.nome} {self.ajuda}"
+        yield f"# TYPE {self.nome} counter"
+        for rotulos, valor in sorted(self.valores.items()):
+            yield f"{self.nome}{_formatar_rotulos(rotulos)} {_formatar_numero(valor)}"
+
+class Medidor(Contador):
+    def definir(self, rotulos: Rotulos, valor: float):
+        self.valores[rotulos] = valor
+
+    def linhas(self) -> Iterable[str]:
+        yield f"# HELP {self.nome} {self.ajuda}"
+        yield f"# TYPE {self.nome} gauge"
+        for rotulos, valor in sorted(self.valores.items()):
+            yield f"{self.nome}{_formatar_rotulos(rotulos)} {_formatar_numero(valor)}"
+
+class Histograma:
+    def __init__(self, nome: str, ajuda: str, buckets: Tuple[float, ...]):
+        self.nome, self.ajuda = nome, ajuda
+        self.buckets = tuple(buckets) + (math.inf,)
+        # rótulos -> [contagens por bucket (não acumuladas), soma, quantidade]
+        self.valores: Dict[Rotulos, list] = {}
+
+    def observar(self, rotulos: Rotulos, valor: float):
+        serie = self.valores.get(rotulos)
+        if serie is None:
+            serie = self.valores[rotulos] = [[0] * len(self.buckets), 0.0, 0]
+        for indice, limite in enumerate(self.buckets):
+            if valor <= limite:
+                serie[0][indice] += 1
+                break
+        serie[1] += valor
+        serie[2] += 1
+
+    def linhas(self) -> Iterable[str]:
+        yield f"# HELP {self.nome} {self.ajuda}"
+        yield f"# TYPE {self.nome} histogram"
+        for rotulos, (contagens, soma, quantidade) in sorted(self.valores.items()):
+            acumulado = 0
+            for limite, contagem in zip(self.buckets, contagens):
+                acumulado += contagem
+                rotulos_bucket = rotulos + (("le", _formatar_numero(float(limite))),)
+                yield f"{self.nome}_bucket{_formatar_rotulos(rotulos_bucket)} {acumulado}"
+            yield f"{self.nome}_sum{_formatar_rotulos(rotulos)} {_formatar_numero(soma)}"
+            yield f"{self.nome}_count{_formatar_rotulos(rotulos)} {quantidade}"
+
+class RegistroMetricas:
+    """Métricas HTTP e de SQL por rota; atualizadas pelo MetricasMiddleware."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requisicoes = Contador("http_requests_total", "Requisições HTTP atendidas, por rota, método e status.")
+        self.em_andamento = Medidor("http_requests_in_progress", "Requisições HTTP em andamento, por método.")
+        self.latencia = Histograma("http_request_duration_seconds", "Latência das requisições HTTP, por rota e método.", BUCKETS_LATENCIA)
+        self.statements = Histograma("http_request_db_statements", "Statements SQL emitidos por requisição, por rota e método.", BUCKETS_STATEMENTS)
+        self.tempo_sql = Histograma("http_request_db_duration_seconds", "Tempo gasto no banco por requisição, por rota e método.", BUCKETS_TEMPO_SQL)
+        self.inicializacao = Medidor("app_startup_seconds", "Tempo de inicialização do worker, por fase (import, lifespan, total).")
+
+    def _metricas(self) -> List:
+        return [self.requisicoes, self.em_andamento, self.latencia, self.statements, self.tempo_sql, self.inicializacao]
+
+    def iniciar(self, metodo: str):
+        with self._lock:
+            self.em_andamento.incrementar((("method", metodo),))
+
+    def registrar(self, metodo: str, rota: str, status: int, duracao: float, statements: int, segundos_sql: float):
+        rotulos = (("method", metodo), ("route", rota))
+        with self._lock:
+            self.em_andamento.incrementar((("method", metodo),), -1)
+            self.requisicoes.incrementar(rotulos + (("status", str(status)),))
+            self.latencia.observar(rotulos, duracao)
+            self.statements.observar(rotulos, statements)
+            self.tempo_sql.observar(rotulos, segundos_sql)
+
+    def registrar_inicializacao(self, fase: str, segundos: float):
+        with self._lock:
+            self.inicializacao.definir((("phase", fase),), segundos)
+
+    def exposicao(self) -> str:
+        """Texto no formato de exposição do Prometheus (text/plain; version=0.0.4)."""
+        with self._lock:
+            return "\n".join(linha for metrica in self._metricas() for linha in metrica.linhas()) + "\n"
+
+metricas = RegistroMetricas()
+
+class MetricasMiddleware:
+    """Middleware ASGI que mede cada requisição HTTP e o SQL emitido por ela.
+
+    A rota é lida de scope["route"] depois do roteamento, então o rótulo é o caminho
+    declarado (ex.: /pedidos/{pedido_id}) e não a URL com os IDs. O SQL é contado com
+    contar_statements, que acompanha a requisição também nas rotas síncronas (threadpool).
+    """
+    def __init__(self, app, registro: RegistroMetricas = metricas):
+        self.app = app
+        self.registro = registro
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metodo = scope["method"]
+        status = 500
+        async def enviar(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        self.registro.iniciar(metodo)
+        inicio = time.perf_counter()
+        with contar_statements() as contador:
+            try:
+                await self.app(scope, receive, enviar)
+            finally:
+                rota = scope.get("route")
+                self.registro.registrar(
+                    metodo,
+                    getattr(rota, "path", ROTA_DESCONHECIDA),
+                    status,
+                    time.perf_counter() - inicio,
+                    contador.statements,
+                    contador.segundos
+                )
@@ -0,0 +1,73 @@
+# app/utils/paginacao.py
+# Paginação por cursor (keyset): WHERE chave > ultimo_valor ORDER BY chave LIMIT n
+# Opcional: sem `limit` nem `cursor` a listagem volta inteira, como antes da paginação; com
+# `cursor` e sem `limit`, as páginas têm LIMITE_PADRAO registros.
+import base64
+import json
+from typing import Optional
+from fastapi import HTTPException, Query, Response
+
+LIMITE_PADRAO = 100
+LIMITE_MAXIMO = 500
+
+# Cabeçalho com o cursor da próxima página (ausente na última página)
+CABECALHO_PROXIMO_CURSOR = "X-Next-Cursor"
+
+def codificar_cursor(valor) -> str:
+    return base64.urlsafe_b64encode(json.dumps(valor).encode()).decode().rstrip("=")
+
+def decodificar_cursor(cursor: str):
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido.")
+
+def _chave(registro, chave: str):
+    # Objetos ORM/schemas ou dicts já serializados (cardápio em cache)
+    return registro[chave] if isinstance(registro, dict) else getattr(registro, chave)
+
+class Paginacao:
+    """Parâmetros `limit` e `cursor` das rotas de listagem (use com Depends())."""
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO),
+        cursor: Optional[str] = Query(None)
+    ):
+        if limit is None and cursor is not None:
+            limit = LIMITE_PADRAO
+        # None: listagem sem paginação (nem limit nem cursor informados)
+        self.limit = limit
+        self.cursor = cursor
+
+    def ordenar(self, consulta, coluna):
+        """Aplica o cursor e a ordem estável pela coluna, sem limite (usado nas respostas em streaming)."""
+        if self.cursor is not None:
+            consulta = consulta.filter(coluna > decodificar_cursor(self.cursor))
+        return consulta.order_by(coluna)
+
+    def filtrar(self, consulta, coluna):
+        """Aplica o cursor, a ordem estável pela coluna e o limite (+1 para detectar a próxima página).
+
+        Funciona tanto com Query (db.query) quanto com Select (select()).
+        """
+        consulta = self.ordenar(consulta, coluna)
+        if self.limit is None:
+            return consulta
+        return consulta.limit(self.limit + 1)
+
+    def fechar(self, registros: list, chave: str, response: Response) -> list:
+        """Corta a linha extra e publica o cursor da próxima página no cabeçalho da resposta."""
+        if self.limit is not None and len(registros) > self.limit:
+            registros = registros[:self.limit]
+            response.headers[CABECALHO_PROXIMO_CURSOR] = codificar_cursor(_chave(registros[-1], chave))
+        return registros
+
+    def fatiar(self, registros: list, chave: str, response: Response) -> list:
+        """Mesma paginação aplicada a uma lista já em memória (objetos ou dicts)."""
+        registros = sorted(registros, key=lambda r: _chave(r, chave))
+        if self.cursor is not None:
+            ultimo = decodificar_cursor(self.cursor)
+            registros = [r for r in registros if _chave(r, chave) > ultimo]
+        if self.limit is not None:
+            registros = registros[:self.limit + 1]
+        return self.fechar(registros, chave, response)
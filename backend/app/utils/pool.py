@@ -0,0 +1,66 @@
+# app/utils/pool.py
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+class EstatisticasPool:
+    """Acumula checkouts, tempo de espera e timeouts de um pool de conexões."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+
+    def registrar(self, espera: float, timeout: bool = False):
+        with self._lock:
+            if timeout:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.espera_total += espera
+            self.espera_maxima = max(self.espera_maxima, espera)
+
+class _PoolMonitorado:
+    """Mede o tempo que cada checkout espera por uma conexão livre."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.estatisticas = EstatisticasPool()
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexao = super()._do_get()
+        except PoolTimeoutError:
+            self.estatisticas.registrar(time.perf_counter() - inicio, timeout=True)
+            raise
+        self.estatisticas.registrar(time.perf_counter() - inicio)
+        return conexao
+
+class QueuePoolMonitorado(_PoolMonitorado, QueuePool):
+    pass
+
+class AsyncQueuePoolMonitorado(_PoolMonitorado, AsyncAdaptedQueuePool):
+    pass
+
+def resumo_pool(engine) -> dict:
+    """Retorna o estado atual do pool do engine (conexões em uso, ociosas, overflow e espera)."""
+    pool = engine.pool
+    resumo = {"classe": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        resumo.update({
+            "tamanho": pool.size(),
+            "em_uso": pool.checkedout(),
+            "ociosas": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+    estatisticas = getattr(pool, "estatisticas", None)
+    if estatisticas is not None:
+        resumo.update({
+            "checkouts": estatisticas.checkouts,
+            "timeouts": estatisticas.timeouts,
+            "espera_media_ms": round(1000 * estatisticas.espera_total / max(estatisticas.checkouts + estatisticas.timeouts, 1), 3),
+            "espera_maxima_ms": round(1000 * estatisticas.espera_maxima, 3),
+        })
+    return resumo
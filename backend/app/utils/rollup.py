@@ -0,0 +1,176 @@
+# app/utils/rollup.py
+# Rollup incremental de vendas: hora/dia × produto × categoria, a partir de pedido_produtos.
+#
+# Uso (a partir de backend/):
+#   python -m app.utils.rollup                                      # soma os itens novos desde a última marca
+#   python -m app.utils.rollup --recalcular 2026-10-01 2026-10-31   # refaz o período a partir dos itens
+#
+# O job incremental só lê itens com idpedido_produto acima da marca salva em rollup_marcas;
+# a marca e as somas são gravadas na mesma transação. Alterações e exclusões de itens já
+# somados entram no rollup com --recalcular (ex.: rodado toda noite para o dia anterior), que
+# também lê os itens já arquivados (app/utils/arquivamento.py).
+import sys
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from .. import models
+from ..config import settings
+
+NOME_MARCA = "vendas"
+
+def _momento_item(item=models.PedidoProduto, pedido=models.Pedido):
+    # Itens antigos podem não ter data_criacao: usa a data do pedido
+    return func.coalesce(item.data_criacao, pedido.data_pedido)
+
+def _consulta_itens(item=models.PedidoProduto, pedido=models.Pedido):
+    # item/pedido: tabelas quentes ou as de arquivo (PedidoProdutoArquivado/PedidoArquivado)
+    return (
+        select(
+            item.idpedido_produto,
+            item.produto_id,
+            item.quantidade,
+            item.preco_unitario,
+            _momento_item(item, pedido),
+            models.Produto.categoria
+        )
+        .join(pedido, pedido.idpedido == item.pedido_id)
+        .join(models.Produto, models.Produto.idproduto == item.produto_id)
+    )
+
+def _limite_atraso(db: Session, segundos: int):
+    if db.get_bind().dialect.name == "sqlite":
+        return func.datetime("now", f"-{int(segundos)} seconds")
+    return func.now() - timedelta(seconds=segundos)
+
+def _agregar(linhas: Iterable) -> Tuple[Dict, Dict, int]:
+    """Soma as linhas de itens por (data, hora, produto, categoria) e por (data, produto, categoria)."""
+    horas = defaultdict(lambda: [0, Decimal(0)])
+    contagem = 0
+    for _, produto_id, quantidade, preco_unitario, momento, categoria in linhas:
+        contagem += 1
+        soma = horas[(momento.date(), momento.hour, produto_id, categoria or "")]
+        soma[0] += quantidade
+        soma[1] += Decimal(str(preco_unitario)) * quantidade
+
+    dias = defaultdict(lambda: [0, Decimal(0)])
+    for (data, _, produto_id, categoria), (quantidade, valor) in horas.items():
+        soma = dias[(data, produto_id, categoria)]
+        soma[0] += quantidade
+        soma[1] += valor
+    return horas, dias, contagem
+
+def _somar(db: Session, modelo, chaves: List[str], somas: Dict):
+    """Soma `somas` às linhas do rollup (INSERT ... ON CONFLICT DO UPDATE quando o banco suporta)."""
+    if not somas:
+        return
+    linhas = [
+        {**dict(zip(chaves, chave)), "quantidade": quantidade, "valor": valor}
+        for chave, (quantidade, valor) in somas.items()
+    ]
+    dialeto = db.get_bind().dialect.name
+    if dialeto in ("postgresql", "sqlite"):
+        insercao = (postgresql if dialeto == "postgresql" else sqlite).insert(modelo)
+        tabela = modelo.__table__
+        db.execute(
+            insercao.on_conflict_do_update(
+                index_elements=chaves,
+                set_={
+                    "quantidade": tabela.c.quantidade + insercao.excluded.quantidade,
+                    "valor": tabela.c.valor + insercao.excluded.valor,
+                }
+            ),
+            linhas
+        )
+        return
+    for linha in linhas:
+        existente = db.get(modelo, tuple(linha[c] for c in chaves))
+        if existente is None:
+            db.add(modelo(**linha))
+        else:
+            existente.quantidade += linha["quantidade"]
+            existente.valor += linha["valor"]
+    db.flush()
+
+def _gravar(db: Session, linhas: Iterable) -> int:
+    horas, dias, contagem = _agregar(linhas)
+    _somar(db, models.VendaHora, ["data", "hora", "produto_id", "categoria"], horas)
+    _somar(db, models.VendaDia, ["data", "produto_id", "categoria"], dias)
+    return contagem
+
+def _marca(db: Session) -> models.MarcaRollup:
+    # FOR UPDATE: duas execuções simultâneas do job não somam os mesmos itens
+    marca = db.get(models.MarcaRollup, NOME_MARCA, with_for_update=True)
+    if marca is None:
+        marca = models.MarcaRollup(nome=NOME_MARCA, ultimo_id=0)
+        db.add(marca)
+        db.flush()
+    return marca
+
+def atualizar_rollup(db: Session, lote: Optional[int] = None, atraso_segundos: Optional[int] = None) -> dict:
+    """Soma ao rollup os itens criados depois da marca, em lotes de `lote` itens (um commit por lote)."""
+    lote = lote or settings.rollup_lote
+    atraso = settings.rollup_atraso_segundos if atraso_segundos is None else atraso_segundos
+    processados = 0
+    while True:
+        marca = _marca(db)
+        recentes = models.PedidoProduto.idpedido_produto > marca.ultimo_id
+        # Para no primeiro item ainda dentro do atraso: a marca nunca passa por cima de um ID
+        # que outra transação ainda pode confirmar
+        primeiro_recente = db.scalar(
+            select(func.min(models.PedidoProduto.idpedido_produto))
+            .join(models.Pedido, models.Pedido.idpedido == models.PedidoProduto.pedido_id)
+            .where(recentes, _momento_item() > _limite_atraso(db, atraso))
+        )
+        consulta = _consulta_itens().where(recentes)
+        if primeiro_recente is not None:
+            consulta = consulta.where(models.PedidoProduto.idpedido_produto < primeiro_recente)
+        linhas = db.execute(consulta.order_by(models.PedidoProduto.idpedido_produto).limit(lote)).all()
+        if not linhas:
+            db.commit()
+            break
+
+        _gravar(db, linhas)
+        marca.ultimo_id = linhas[-1][0]
+        db.commit()
+        processados += len(linhas)
+        if len(linhas) < lote:
+            break
+    return {"itens_processados": processados, "ultimo_id": marca.ultimo_id}
+
+def recalcular_rollup(db: Session, inicio: date, fim: date) -> dict:
+    """Refaz o rollup de `inicio` a `fim` (inclusive) a partir dos itens já cobertos pela marca."""
+    marca = _marca(db)
+    for modelo in (models.VendaHora, models.VendaDia):
+        db.execute(delete(modelo).where(modelo.data >= inicio, modelo.data <= fim))
+
+    processados = 0
+    # Itens das tabelas quentes e do arquivo (arquivados só depois de somados, sempre até a marca)
+    for item, pedido in ((models.PedidoProduto, models.Pedido), (models.PedidoProdutoArquivado, models.PedidoArquivado)):
+        consulta = _consulta_itens(item, pedido).where(
+            item.idpedido_produto <= marca.ultimo_id,
+            _momento_item(item, pedido) >= datetime.combine(inicio, datetime.min.time()),
+            _momento_item(item, pedido) < datetime.combine(fim + timedelta(days=1), datetime.min.time())
+        ).execution_options(yield_per=settings.rollup_lote)
+        # Os itens são lidos em blocos e somados em memória: só os totais do período ficam retidos
+        processados += _gravar(db, db.execute(consulta))
+    db.commit()
+    return {"itens_processados": processados, "ultimo_id": marca.ultimo_id}
+
+def main(argv: List[str]) -> int:
+    from ..database import SessionLocal
+    with SessionLocal() as db:
+        if "--recalcular" in argv:
+            posicao = argv.index("--recalcular")
+            inicio, fim = (date.fromisoformat(valor) for valor in argv[posicao + 1:posicao + 3])
+            resultado = recalcular_rollup(db, inicio, fim)
+        else:
+            resultado = atualizar_rollup(db)
+    print(f"{resultado['itens_processados']} item(ns) processado(s); marca em idpedido_produto {resultado['ultimo_id']}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
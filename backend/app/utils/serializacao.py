@@ -0,0 +1,55 @@
+# app/utils/serializacao.py
+# Caminho rápido de resposta para objetos ORM confiáveis: monta os dicts direto dos atributos,
+# sem revalidar com o Pydantic, e codifica com orjson.
+from functools import lru_cache
+from typing import Any, Callable, Optional, Tuple, Type, Union, get_args, get_origin
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+Conversor = Optional[Callable[[Any], Any]]
+
+def _conversor(anotacao) -> Conversor:
+    """Função que converte o valor do atributo para o campo do schema (None: usa o valor como está)."""
+    origem = get_origin(anotacao)
+    if origem is Union:
+        tipos = [tipo for tipo in get_args(anotacao) if tipo is not type(None)]
+        interno = _conversor(tipos[0]) if len(tipos) == 1 else None
+        if interno is None:
+            return None
+        return lambda valor: None if valor is None else interno(valor)
+    if origem is list:
+        interno = _conversor(get_args(anotacao)[0])
+        if interno is None:
+            return list
+        return lambda valores: [interno(valor) for valor in valores]
+    if isinstance(anotacao, type) and issubclass(anotacao, BaseModel):
+        plano = _plano(anotacao)
+        return lambda objeto: _montar(plano, objeto)
+    if anotacao is float:
+        # Numeric do banco chega como Decimal; o schema o publica como número
+        return float
+    return None
+
+@lru_cache(maxsize=None)
+def _plano(esquema: Type[BaseModel]) -> Tuple[Tuple[str, Conversor], ...]:
+    # Calculado uma vez por schema a partir dos campos declarados: acompanha mudanças no schema
+    return tuple((nome, _conversor(campo.annotation)) for nome, campo in esquema.model_fields.items())
+
+def _montar(plano, objeto) -> dict:
+    dados = {}
+    for nome, conversor in plano:
+        valor = getattr(objeto, nome)
+        dados[nome] = valor if conversor is None else conversor(valor)
+    return dados
+
+def serializar(esquema: Type[BaseModel], objeto) -> dict:
+    """Dict com os campos de `esquema` lidos de `objeto` (mesmo resultado de model_validate + model_dump)."""
+    return _montar(_plano(esquema), objeto)
+
+def resposta_rapida(esquema: Type[BaseModel], objeto, status_code: int = 200) -> ORJSONResponse:
+    """Resposta JSON de `objeto` no formato de `esquema`, sem a validação do response_model.
+
+    Só para dados vindos do banco pelos modelos ORM; a rota mantém o response_model para a
+    documentação, mas a resposta retornada diretamente não passa por ele.
+    """
+    return ORJSONResponse(serializar(esquema, objeto), status_code=status_code)
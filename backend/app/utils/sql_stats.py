@@ -0,0 +1,68 @@
+# app/utils/sql_stats.py
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+
+class OrcamentoSQLExcedido(RuntimeError):
+    """Um trecho contado com limite emitiu mais statements do que o permitido."""
+
+class ContadorSQL:
+    """Acumula a quantidade de statements SQL emitidos num trecho de código e o tempo gasto no banco."""
+    def __init__(self, limite: Optional[int] = None):
+        self.statements = 0
+        self.segundos = 0.0
+        # Máximo de statements no trecho (None: sem limite); o statement excedente não é executado
+        self.limite = limite
+
+# Contadores ativos no contexto atual (request/thread). Uma tupla permite aninhar contagens.
+_contadores_ativos: ContextVar[tuple] = ContextVar("contadores_sql_ativos", default=())
+
+def _antes_de_executar(conn, cursor, statement, parameters, context, executemany):
+    contadores = _contadores_ativos.get()
+    for contador in contadores:
+        contador.statements += 1
+        if contador.limite is not None and contador.statements > contador.limite:
+            raise OrcamentoSQLExcedido(
+                f"Limite de {contador.limite} statements SQL excedido. Statement recusado: {statement[:200]}"
+            )
+    if contadores:
+        conn.info.setdefault("inicio_statements", []).append(time.perf_counter())
+
+def _depois_de_executar(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("inicio_statements")
+    if not inicios:
+        return
+    duracao = time.perf_counter() - inicios.pop()
+    for contador in _contadores_ativos.get():
+        contador.segundos += duracao
+
+def _erro_ao_executar(contexto_excecao):
+    # Statement com erro não chega ao after_cursor_execute: descarta o início registrado
+    conn = contexto_excecao.connection
+    if conn is not None and conn.info.get("inicio_statements"):
+        conn.info["inicio_statements"].pop()
+
+def instrumentar_engine(engine):
+    """Registra os hooks de contagem e de tempo de SQL no engine informado."""
+    for evento, funcao in (
+        ("before_cursor_execute", _antes_de_executar),
+        ("after_cursor_execute", _depois_de_executar),
+        ("handle_error", _erro_ao_executar),
+    ):
+        if not event.contains(engine, evento, funcao):
+            event.listen(engine, evento, funcao)
+
+@contextmanager
+def contar_statements(limite: Optional[int] = None):
+    """Conta os statements (e o tempo no banco) emitidos dentro do bloco `with` no contexto atual.
+
+    Com `limite`, o statement que ultrapassar o limite levanta OrcamentoSQLExcedido.
+    """
+    contador = ContadorSQL(limite)
+    token = _contadores_ativos.set(_contadores_ativos.get() + (contador,))
+    try:
+        yield contador
+    finally:
+        _contadores_ativos.reset(token)
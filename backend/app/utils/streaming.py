@@ -0,0 +1,45 @@
+# app/utils/streaming.py
+# Listagens em NDJSON (uma linha JSON por registro) enviadas à medida que são serializadas.
+# Opt-in: cabeçalho Accept: application/x-ndjson ou ?formato=ndjson.
+from typing import Optional, Type
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from .. import database
+
+TIPO_NDJSON = "application/x-ndjson"
+
+# Registros buscados por vez (cursor no servidor no Postgres) e escritos por pedaço da resposta
+TAMANHO_BLOCO = 500
+
+def pede_ndjson(request: Request, formato: Optional[str] = None) -> bool:
+    return formato == "ndjson" or TIPO_NDJSON in request.headers.get("accept", "")
+
+def _linhas(esquema: Type[BaseModel], bloco) -> bytes:
+    return b"".join(esquema.model_validate(registro).model_dump_json().encode() + b"\n" for registro in bloco)
+
+def _gerar(consulta, esquema: Type[BaseModel], sessoes):
+    # Sessão própria: a sessão da dependência get_db já foi fechada quando o corpo é enviado
+    with sessoes() as db:
+        resultado = db.scalars(consulta.execution_options(yield_per=TAMANHO_BLOCO))
+        for bloco in resultado.partitions():
+            yield _linhas(esquema, bloco)
+
+async def _gerar_assincrono(consulta, esquema: Type[BaseModel], sessoes):
+    async with sessoes() as db:
+        resultado = await db.stream_scalars(consulta.execution_options(yield_per=TAMANHO_BLOCO))
+        async for bloco in resultado.partitions():
+            yield _linhas(esquema, bloco)
+
+def resposta_ndjson(consulta, esquema: Type[BaseModel], assincrono: bool = False, sessoes=None) -> StreamingResponse:
+    """Executa `consulta` (select de uma entidade) e envia cada bloco assim que é serializado com `esquema`.
+
+    Memória e tempo até o primeiro byte não dependem do tamanho do resultado. Relacionamentos
+    usados pelo esquema devem vir com opcoes_carregamento (coleções em selectinload, compatível
+    com yield_per). `sessoes` escolhe o banco (ex.: database.fabrica_leitura(request)); padrão: primário.
+    """
+    if assincrono:
+        gerador = _gerar_assincrono(consulta, esquema, sessoes or database.AsyncSessionLocal)
+    else:
+        gerador = _gerar(consulta, esquema, sessoes or database.SessionLocal)
+    return StreamingResponse(gerador, media_type=TIPO_NDJSON)
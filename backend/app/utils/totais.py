@@ -0,0 +1,115 @@
+# app/utils/totais.py
+# Totais denormalizados do pedido (total e item_count) e verificação de divergências.
+#
+# Uso (a partir de backend/):
+#   python -m app.utils.totais            # lista pedidos cujos totais não batem com os itens
+#   python -m app.utils.totais --reparar  # recalcula os totais divergentes a partir dos itens
+# Sai com código 1 quando encontra divergências e não as repara.
+import sys
+from decimal import Decimal
+from typing import List
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+from .. import models
+
+PEDIDO_NAO_ABERTO = "O pedido não está aberto."
+
+def ajuste_totais(pedido_id: int, valor, quantidade: int):
+    """UPDATE incremental (total = total + valor) para executar na mesma transação dos itens.
+
+    O incremento é feito pelo banco, sem ler o total antes: escritas concorrentes no mesmo
+    pedido não se sobrescrevem. Também incrementa Pedido.version, invalidando edições
+    baseadas na versão anterior do pedido.
+
+    Só altera pedidos abertos: se o checkout fechou o pedido depois da leitura feita pela rota,
+    o UPDATE (que no Postgres espera o lock do checkout e reavalia o WHERE) não altera nenhuma
+    linha. A rota confere o rowcount e, se for 0, desfaz a transação e responde 409.
+    """
+    return update(models.Pedido).where(
+        models.Pedido.idpedido == pedido_id,
+        models.Pedido.status == 'aberto'
+    ).values(
+        total=models.Pedido.total + Decimal(str(valor)),
+        item_count=models.Pedido.item_count + quantidade,
+        version=models.Pedido.version + 1
+    )
+
+def _total_itens():
+    return func.coalesce(func.sum(models.PedidoProduto.quantidade * models.PedidoProduto.preco_unitario), 0)
+
+def _quantidade_itens():
+    return func.coalesce(func.sum(models.PedidoProduto.quantidade), 0)
+
+def pedidos_divergentes(db: Session) -> List[dict]:
+    """Pedidos cujo total ou item_count difere do calculado a partir de pedido_produtos."""
+    soma = select(
+        models.PedidoProduto.pedido_id,
+        _total_itens().label("total"),
+        _quantidade_itens().label("item_count")
+    ).group_by(models.PedidoProduto.pedido_id).subquery()
+    total_itens = func.round(func.coalesce(soma.c.total, 0), 2)
+    quantidade_itens = func.coalesce(soma.c.item_count, 0)
+
+    linhas = db.execute(
+        select(models.Pedido.idpedido, models.Pedido.total, models.Pedido.item_count, total_itens, quantidade_itens)
+        .outerjoin(soma, soma.c.pedido_id == models.Pedido.idpedido)
+        .where(or_(func.round(models.Pedido.total, 2) != total_itens, models.Pedido.item_count != quantidade_itens))
+        .order_by(models.Pedido.idpedido)
+    )
+    return [
+        {
+            "idpedido": idpedido,
+            "total": total,
+            "item_count": item_count,
+            "total_itens": total_calculado,
+            "item_count_itens": quantidade_calculada,
+        }
+        for idpedido, total, item_count, total_calculado, quantidade_calculada in linhas
+    ]
+
+def reparar_totais(db: Session, ids_pedidos: List[int]) -> int:
+    """Recalcula total e item_count dos pedidos informados a partir dos itens (sem commit)."""
+    if not ids_pedidos:
+        return 0
+    filtro_itens = models.PedidoProduto.pedido_id == models.Pedido.idpedido
+    resultado = db.execute(
+        update(models.Pedido)
+        .where(models.Pedido.idpedido.in_(ids_pedidos))
+        .values(
+            total=select(_total_itens()).where(filtro_itens).scalar_subquery(),
+            item_count=select(_quantidade_itens()).where(filtro_itens).scalar_subquery()
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return resultado.rowcount
+
+def verificar_totais(db: Session, reparar: bool = False) -> dict:
+    """Procura divergências e, com `reparar`, corrige-as e confirma a transação."""
+    divergentes = pedidos_divergentes(db)
+    reparados = 0
+    if reparar and divergentes:
+        reparados = reparar_totais(db, [d["idpedido"] for d in divergentes])
+        db.commit()
+    return {"divergentes": divergentes, "reparados": reparados}
+
+def main(argv: List[str]) -> int:
+    from ..database import SessionLocal
+    reparar = "--reparar" in argv
+    with SessionLocal() as db:
+        resultado = verificar_totais(db, reparar=reparar)
+
+    for d in resultado["divergentes"]:
+        print(
+            f"Pedido {d['idpedido']}: total {d['total']} (itens: {d['total_itens']}), "
+            f"item_count {d['item_count']} (itens: {d['item_count_itens']})"
+        )
+    if not resultado["divergentes"]:
+        print("Todos os totais de pedido conferem com os itens.")
+        return 0
+    if reparar:
+        print(f"{resultado['reparados']} pedido(s) reparado(s).")
+        return 0
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,66 @@
+# app/utils/verificar_indices.py
+# Verifica se toda chave estrangeira tem um índice que a sustente.
+#
+# Uso (a partir de backend/):
+#   python -m app.utils.verificar_indices          # confere os modelos (Base.metadata)
+#   python -m app.utils.verificar_indices --banco  # confere o banco apontado por DATABASE_URL
+# Sai com código 1 quando encontra alguma chave estrangeira sem índice.
+import sys
+from typing import Iterable, List, Sequence, Tuple
+from sqlalchemy import inspect
+
+def _coberta(colunas_fk: Sequence[str], prefixos: Iterable[Sequence[str]]) -> bool:
+    # Um índice serve à FK quando as colunas da FK são o início (prefixo) do índice
+    return any(list(prefixo[:len(colunas_fk)]) == list(colunas_fk) for prefixo in prefixos)
+
+def fks_sem_indice_nos_modelos(metadata) -> List[Tuple[str, List[str]]]:
+    """Chaves estrangeiras declaradas nos modelos sem índice (ou PK/UNIQUE) que as cubra."""
+    faltando = []
+    for tabela in metadata.sorted_tables:
+        prefixos = [[c.name for c in tabela.primary_key.columns]]
+        prefixos += [
+            [c.name for c in indice.columns] for indice in tabela.indexes
+            # Índices parciais não atendem a todas as consultas pela FK
+            if not any(indice.dialect_options[d].get("where") is not None for d in ("postgresql", "sqlite"))
+        ]
+        prefixos += [[c.name for c in uc.columns] for uc in tabela.constraints if uc.__class__.__name__ == "UniqueConstraint"]
+        prefixos += [[c.name] for c in tabela.columns if c.unique]
+        for fk in tabela.foreign_key_constraints:
+            colunas = [c.name for c in fk.columns]
+            if not _coberta(colunas, prefixos):
+                faltando.append((tabela.name, colunas))
+    return faltando
+
+def fks_sem_indice_no_banco(engine) -> List[Tuple[str, List[str]]]:
+    """Mesma verificação, mas lendo o catálogo do banco (após as migrations)."""
+    inspetor = inspect(engine)
+    faltando = []
+    for tabela in inspetor.get_table_names():
+        prefixos = [inspetor.get_pk_constraint(tabela).get("constrained_columns") or []]
+        prefixos += [
+            indice["column_names"] for indice in inspetor.get_indexes(tabela)
+            if not (indice.get("dialect_options") or {}).get("postgresql_where")
+        ]
+        prefixos += [uc["column_names"] for uc in inspetor.get_unique_constraints(tabela)]
+        for fk in inspetor.get_foreign_keys(tabela):
+            if not _coberta(fk["constrained_columns"], prefixos):
+                faltando.append((tabela, fk["constrained_columns"]))
+    return faltando
+
+def main(argv: List[str]) -> int:
+    if "--banco" in argv:
+        from ..database import engine
+        faltando = fks_sem_indice_no_banco(engine)
+    else:
+        from .. import models
+        faltando = fks_sem_indice_nos_modelos(models.Base.metadata)
+
+    for tabela, colunas in faltando:
+        print(f"FK sem índice: {tabela}({', '.join(colunas)})")
+    if faltando:
+        return 1
+    print("Todas as chaves estrangeiras têm índice.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,157 @@
+# benchmarks/dados.py
+# Gerador determinístico da massa de dados dos benchmarks: a mesma semente e escala geram
+# sempre as mesmas linhas, para que execuções em commits diferentes sejam comparáveis.
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.orm import Session
+from app import models
+from app.utils.auth import get_password_hash
+
+# Datas fixas (e não relativas a agora): a massa não muda de um dia para o outro
+DATA_BASE = datetime(2025, 1, 1, 12, 0, 0)
+DIAS_HISTORICO = 180
+
+USUARIO = "benchmark"
+SENHA = "benchmark"
+
+SITUACOES = ["Livre", "Ocupada", "Reservada"]
+TIPOS_PAGAMENTO = ["Dinheiro", "Cartão de crédito", "Cartão de débito", "Pix"]
+CATEGORIAS = ["bebidas", "entradas", "grelhados", "massas", "sobremesas", "bar"]
+PALAVRAS = [
+    "frango", "carne", "peixe", "queijo", "tomate", "alho", "cebola", "limão", "chocolate", "café",
+    "arroz", "feijão", "batata", "salada", "molho", "picanha", "camarão", "pudim", "suco", "cerveja",
+]
+NOMES = ["Ana", "Bruno", "Carla", "Diego", "Elisa", "Fábio", "Gabriela", "Hugo", "Isabela", "João", "Larissa", "Marcos"]
+SOBRENOMES = ["Silva", "Souza", "Oliveira", "Santos", "Pereira", "Lima", "Costa", "Ribeiro", "Almeida", "Gomes"]
+
+@dataclass(frozen=True)
+class Volumes:
+    produtos: int
+    clientes: int
+    mesas: int
+    # Histórico de pedidos fechados (com pagamento); as mesas ocupadas têm ainda um pedido aberto
+    pedidos_fechados: int
+    itens_por_pedido: int
+
+def volumes(escala: float) -> Volumes:
+    """Volumes de um restaurante médio (escala 1) multiplicados por `escala`."""
+    def n(valor: int) -> int:
+        return max(1, int(valor * escala))
+    return Volumes(produtos=n(300), clientes=n(5000), mesas=n(60), pedidos_fechados=n(20000), itens_por_pedido=6)
+
+def banco_vazio(db: Session) -> bool:
+    return not any(db.scalar(select(func.count()).select_from(modelo)) for modelo in (models.Produto, models.Pedido, models.User))
+
+def _ajustar_sequencias(db: Session):
+    # As linhas são inseridas com a PK explícita: no Postgres as sequences precisam avançar
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for tabela, coluna in [
+        ("produtos", "idproduto"), ("clientes", "idcliente"), ("situacao_mesa", "id_situacao"), ("mesas", "idmesa"),
+        ("pedidos", "idpedido"), ("pedido_produtos", "idpedido_produto"), ("pagamentos", "idpagamento"),
+        ("tipo_pagamentos", "idtipopagamento"), ("users", "id"),
+    ]:
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{tabela}', '{coluna}'), COALESCE((SELECT MAX({coluna}) FROM {tabela}), 0) + 1, false)"
+        ))
+
+def _inserir(db: Session, modelo, linhas: list, lote: int = 5000):
+    for inicio in range(0, len(linhas), lote):
+        db.execute(insert(modelo), linhas[inicio:inicio + lote])
+
+def gerar(db: Session, vol: Volumes, semente: int = 42) -> dict:
+    """Insere a massa de dados num banco vazio e retorna a quantidade de linhas por tabela."""
+    aleatorio = random.Random(semente)
+
+    situacoes = [{"id_situacao": i + 1, "situacao_descricao": descricao} for i, descricao in enumerate(SITUACOES)]
+    tipos = [{"idtipopagamento": i + 1, "descricao": descricao} for i, descricao in enumerate(TIPOS_PAGAMENTO)]
+
+    produtos = []
+    for i in range(vol.produtos):
+        descricao = f"{aleatorio.choice(PALAVRAS).capitalize()} {aleatorio.choice(PALAVRAS)} {i + 1}"
+        produtos.append({
+            "idproduto": i + 1,
+            "descricao": descricao,
+            "preco": Decimal(aleatorio.randint(500, 12000)) / 100,
+            "categoria": aleatorio.choice(CATEGORIAS),
+            "status": aleatorio.random() > 0.05,
+            "data_criacao": DATA_BASE - timedelta(days=DIAS_HISTORICO + 30),
+        })
+
+    clientes = []
+    for i in range(vol.clientes):
+        nome, sobrenome = aleatorio.choice(NOMES), aleatorio.choice(SOBRENOMES)
+        clientes.append({
+            "idcliente": i + 1,
+            "nome": f"{nome} {sobrenome}",
+            "apelido": nome if aleatorio.random() < 0.3 else None,
+            "email": f"{nome.lower()}.{sobrenome.lower()}.{i + 1}@exemplo.com" if aleatorio.random() < 0.7 else None,
+            "telefone": f"11 9{aleatorio.randint(1000, 9999)}-{aleatorio.randint(1000, 9999)}",
+            "is_active": aleatorio.random() > 0.1,
+            "data_criacao": DATA_BASE - timedelta(days=aleatorio.randint(0, DIAS_HISTORICO)),
+        })
+
+    # 60% das mesas ocupadas, cada uma com um pedido aberto
+    mesas, ocupadas = [], []
+    for i in range(vol.mesas):
+        ocupada = aleatorio.random() < 0.6
+        cliente = aleatorio.randint(1, vol.clientes) if ocupada else None
+        mesas.append({"idmesa": i + 1, "numero": i + 1, "id_situacao_fk": 2 if ocupada else 1, "id_cliente_fk": cliente})
+        if ocupada:
+            ocupadas.append((i + 1, cliente))
+
+    pedidos, itens, pagamentos = [], [], []
+    def novo_pedido(mesa_id: int, cliente_id: int, status: str, data: datetime):
+        idpedido = len(pedidos) + 1
+        total, quantidade_total = Decimal("0"), 0
+        for _ in range(aleatorio.randint(1, 2 * vol.itens_por_pedido - 1)):
+            produto = aleatorio.choice(produtos)
+            quantidade = aleatorio.randint(1, 4)
+            itens.append({
+                "idpedido_produto": len(itens) + 1,
+                "pedido_id": idpedido,
+                "produto_id": produto["idproduto"],
+                "quantidade": quantidade,
+                "preco_unitario": produto["preco"],
+                "data_criacao": data,
+            })
+            total += quantidade * produto["preco"]
+            quantidade_total += quantidade
+        pedidos.append({
+            "idpedido": idpedido, "cliente_id": cliente_id, "mesa_id": mesa_id, "data_pedido": data,
+            "status": status, "total": total, "item_count": quantidade_total, "version": 1,
+        })
+        if status == "fechado":
+            pagamentos.append({
+                "idpagamento": len(pagamentos) + 1, "pedido_id": idpedido, "valor": total,
+                "data_pagamento": data + timedelta(minutes=aleatorio.randint(20, 120)),
+                "metodo_pagamento": aleatorio.choice(TIPOS_PAGAMENTO),
+            })
+
+    for _ in range(vol.pedidos_fechados):
+        data = DATA_BASE - timedelta(days=aleatorio.randint(1, DIAS_HISTORICO), minutes=aleatorio.randint(0, 12 * 60))
+        novo_pedido(aleatorio.randint(1, vol.mesas), aleatorio.randint(1, vol.clientes), "fechado", data)
+    for mesa_id, cliente_id in ocupadas:
+        novo_pedido(mesa_id, cliente_id, "aberto", DATA_BASE - timedelta(minutes=aleatorio.randint(5, 90)))
+
+    usuarios = [{"id": 1, "username": USUARIO, "hashed_password": get_password_hash(SENHA), "is_active": True}]
+
+    for modelo, linhas in [
+        (models.SituacaoMesa, situacoes), (models.TipoPagamento, tipos), (models.Produto, produtos),
+        (models.Cliente, clientes), (models.Mesa, mesas), (models.Pedido, pedidos),
+        (models.PedidoProduto, itens), (models.Pagamento, pagamentos), (models.User, usuarios),
+    ]:
+        _inserir(db, modelo, linhas)
+    _ajustar_sequencias(db)
+    db.commit()
+
+    return {
+        "volumes": asdict(vol),
+        "linhas": {
+            "produtos": len(produtos), "clientes": len(clientes), "mesas": len(mesas), "pedidos": len(pedidos),
+            "pedido_produtos": len(itens), "pagamentos": len(pagamentos),
+        },
+    }
@@ -0,0 +1,444 @@
+# benchmarks/endpoints.py
+# Mede a latência (p50/p95/p99) e a quantidade de statements SQL de cada rota de app/routers,
+# contra uma massa de dados determinística (benchmarks/dados.py), e salva o resultado em JSON.
+#
+# Uso (a partir de backend/):
+#   python -m benchmarks.endpoints                                   # SQLite temporário
+#   python -m benchmarks.endpoints --database-url postgresql://localhost/restaurante_bench --recriar
+#   python -m benchmarks.endpoints --comparar benchmarks/resultados/<anterior>.json
+#   DB_ASYNC=1 python -m benchmarks.endpoints                        # rotas assíncronas do salão
+#
+# DATABASE_URL do .env é ignorada de propósito: o benchmark grava no banco e nunca deve rodar
+# contra o banco do restaurante. Use um banco local vazio (ou --recriar para apagá-lo antes).
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+DIRETORIO_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+
+# Rotas que não terminam (fluxos SSE): não há latência de resposta a medir
+IGNORADAS = {
+    "eventos_mesas": "fluxo SSE contínuo",
+    "eventos_cozinha": "fluxo SSE contínuo",
+}
+
+def _argumentos(argv):
+    parser = argparse.ArgumentParser(description="Latência e statements SQL por rota")
+    parser.add_argument("--database-url", help="Banco local para o benchmark (padrão: SQLite temporário)")
+    parser.add_argument("--recriar", action="store_true", help="Apaga e recria as tabelas se o banco não estiver vazio")
+    parser.add_argument("--escala", type=float, default=1.0, help="Multiplicador dos volumes da massa de dados")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--repeticoes", type=int, default=50, help="Requisições medidas por rota")
+    parser.add_argument("--aquecimento", type=int, default=5, help="Requisições descartadas antes da medição")
+    parser.add_argument("--rotas", nargs="*", help="Mede só as rotas cujo nome ou caminho contém algum dos termos")
+    parser.add_argument("--saida", help="Arquivo JSON do resultado (padrão: benchmarks/resultados/<data>-<commit>.json)")
+    parser.add_argument("--comparar", help="Resultado anterior (JSON) para comparar com esta execução")
+    return parser.parse_args(argv)
+
+def _configurar_ambiente(args):
+    # Precisa acontecer antes de importar o app: as configurações são lidas na importação
+    if args.database_url:
+        url = args.database_url
+    else:
+        url = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="benchmark-"), "benchmark.db")
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+
+def _commit_atual() -> Optional[str]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        sujo = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-sujo" if sujo else "")
+
+# --- Contexto e cenários ---
+
+class Contexto:
+    """IDs da massa de dados e geradores usados para montar as requisições."""
+    def __init__(self, semente: int, token: str):
+        from app import database, models
+        self.database, self.models = database, models
+        self.aleatorio = random.Random(semente)
+        self._sequencia = itertools.count(1)
+        self.autorizacao = {"Authorization": f"Bearer {token}"}
+        with database.SessionLocal() as db:
+            self.produtos = [i for (i,) in db.query(models.Produto.idproduto).filter(models.Produto.status.is_(True)).order_by(models.Produto.idproduto)]
+            self.clientes = [i for (i,) in db.query(models.Cliente.idcliente).order_by(models.Cliente.idcliente)]
+            self.mesas = [i for (i,) in db.query(models.Mesa.idmesa).order_by(models.Mesa.idmesa)]
+            self.pedidos = [i for (i,) in db.query(models.Pedido.idpedido).order_by(models.Pedido.idpedido)]
+            self.pedidos_abertos = dict(
+                db.query(models.Pedido.mesa_id, models.Pedido.idpedido).filter(models.Pedido.status == "aberto").order_by(models.Pedido.mesa_id)
+            )
+            self.itens_abertos = [
+                i for (i,) in db.query(models.PedidoProduto.idpedido_produto)
+                .join(models.Pedido, models.Pedido.idpedido == models.PedidoProduto.pedido_id)
+                .filter(models.Pedido.status == "aberto").order_by(models.PedidoProduto.idpedido_produto)
+            ]
+
+    def unico(self) -> int:
+        """Número novo a cada chamada (nomes, números de mesa e chaves que não podem repetir)."""
+        return next(self._sequencia)
+
+    def escolher(self, valores: list):
+        return self.aleatorio.choice(valores)
+
+    # Registros criados direto no banco, fora do tempo medido (ex.: alvo de um DELETE)
+
+    def _criar(self, *registros):
+        with self.database.SessionLocal() as db:
+            db.add_all(registros)
+            db.commit()
+            for registro in registros:
+                db.refresh(registro)
+            return registros
+
+    def nova_mesa(self) -> int:
+        (mesa,) = self._criar(self.models.Mesa(numero=100000 + self.unico(), id_situacao_fk=1))
+        return mesa.idmesa
+
+    def novo_pedido(self, itens: int = 3) -> dict:
+        models = self.models
+        mesa_id, cliente_id = self.nova_mesa(), self.escolher(self.clientes)
+        with self.database.SessionLocal() as db:
+            precos = dict(db.query(models.Produto.idproduto, models.Produto.preco).filter(models.Produto.idproduto.in_(self.produtos[:50])))
+            pedido = models.Pedido(cliente_id=cliente_id, mesa_id=mesa_id, status="aberto")
+            escolhidos = [self.escolher(list(precos)) for _ in range(itens)]
+            pedido.total = sum(precos[produto] for produto in escolhidos)
+            pedido.item_count = itens
+            pedido.itens = [models.PedidoProduto(produto_id=produto, quantidade=1, preco_unitario=precos[produto]) for produto in escolhidos]
+            db.add(pedido)
+            db.commit()
+            return {"idpedido": pedido.idpedido, "mesa_id": mesa_id, "itens": [item.idpedido_produto for item in pedido.itens]}
+
+    def novo_produto(self) -> int:
+        (produto,) = self._criar(self.models.Produto(descricao=f"Produto avulso {self.unico()}", preco=Decimal("9.90")))
+        return produto.idproduto
+
+    def novo_cliente(self) -> int:
+        (cliente,) = self._criar(self.models.Cliente(nome=f"Cliente avulso {self.unico()}"))
+        return cliente.idcliente
+
+    def novo_usuario(self) -> int:
+        (usuario,) = self._criar(self.models.User(username=f"avulso{self.unico()}", hashed_password="-", is_active=True))
+        return usuario.id
+
+@dataclass
+class Cenario:
+    # Monta os argumentos de TestClient.request (url, params, json, data, content, headers)
+    requisicao: Callable[[Contexto, Any], dict]
+    # Executado fora do tempo medido; o retorno é passado para `requisicao`
+    preparar: Optional[Callable[[Contexto], Any]] = None
+    # Limite de repetições para rotas caras por natureza (bcrypt, importação, recálculo)
+    max_repeticoes: Optional[int] = None
+
+def _csv_produtos(contexto: Contexto, linhas: int = 200) -> str:
+    lote = contexto.unico()
+    return "descricao,preco,categoria\n" + "".join(f"Importado {lote}-{i},{10 + i % 50}.50,importados\n" for i in range(linhas))
+
+def _csv_clientes(contexto: Contexto, linhas: int = 200) -> str:
+    lote = contexto.unico()
+    return "nome,email,telefone\n" + "".join(f"Importado {i},importado.{lote}.{i}@exemplo.com,11 90000-0000\n" for i in range(linhas))
+
+_PERIODO = {"inicio": "2024-07-01", "fim": "2024-12-31"}
+
+# Cenários por nome de função da rota (o mesmo nas versões síncrona e assíncrona)
+CENARIOS: Dict[str, Cenario] = {
+    # Produtos
+    "listar_produtos": Cenario(lambda c, _: {"url": "/produtos/"}),
+    "buscar_produtos_por_descricao": Cenario(lambda c, _: {"url": "/produtos/busca", "params": {"q": c.escolher(["frango", "queijo", "café", "molho"])}}),
+    "importar_produtos": Cenario(
+        lambda c, _: {"url": "/produtos/importar", "content": _csv_produtos(c), "headers": {"Content-Type": "text/csv"}},
+        max_repeticoes=10
+    ),
+    "exportar_produtos": Cenario(lambda c, _: {"url": "/produtos/exportar", "params": {"formato": "csv"}}, max_repeticoes=10),
+    "criar_produto": Cenario(lambda c, _: {"url": "/produtos/", "json": {"descricao": f"Novo produto {c.unico()}", "preco": 19.9, "categoria": "bar"}}),
+    "atualizar_produto": Cenario(lambda c, _: {"url": f"/produtos/{c.escolher(c.produtos)}", "json": {"preco": round(c.aleatorio.uniform(5, 120), 2)}}),
+    "excluir_produto": Cenario(lambda c, produto: {"url": f"/produtos/{produto}"}, preparar=Contexto.novo_produto),
+    # Clientes
+    "listar_clientes": Cenario(lambda c, _: {"url": "/clientes/"}),
+    "buscar_clientes_por_termo": Cenario(lambda c, _: {"url": "/clientes/busca", "params": {"q": c.escolher(["Silva", "Ana", "Costa", "Marcos"])}}),
+    "importar_clientes": Cenario(
+        lambda c, _: {"url": "/clientes/importar", "content": _csv_clientes(c), "headers": {"Content-Type": "text/csv"}},
+        max_repeticoes=10
+    ),
+    "exportar_clientes": Cenario(lambda c, _: {"url": "/clientes/exportar", "params": {"formato": "csv"}}, max_repeticoes=10),
+    "criar_cliente": Cenario(lambda c, _: {"url": "/clientes/", "json": {"nome": f"Cliente {c.unico()}", "telefone": "11 90000-0000"}}),
+    "atualizar_cliente": Cenario(lambda c, _: {"url": f"/clientes/{c.escolher(c.clientes)}", "json": {"telefone": f"11 9{c.aleatorio.randint(1000, 9999)}-0000"}}),
+    "excluir_cliente": Cenario(lambda c, cliente: {"url": f"/clientes/{cliente}"}, preparar=Contexto.novo_cliente),
+    "desativar_cliente": Cenario(lambda c, _: {"url": f"/clientes/{c.escolher(c.clientes)}"}),
+    # Pagamentos
+    "listar_pagamentos": Cenario(lambda c, _: {"url": "/pagamentos/"}),
+    "checkout": Cenario(
+        lambda c, pedido: {
+            "url": "/pagamentos/checkout",
+            "json": {"pedido_id": pedido["idpedido"], "pagamentos": [{"tipo_pagamento_id": 1}]},
+            "headers": {"Idempotency-Key": f"benchmark-{c.unico()}"},
+        },
+        preparar=Contexto.novo_pedido
+    ),
+    # Usuários e login
+    "create_user": Cenario(lambda c, _: {"url": "/users/", "json": {"username": f"usuario{c.unico()}", "password": "senha"}}, max_repeticoes=10),
+    "get_all_users": Cenario(lambda c, _: {"url": "/users/", "headers": c.autorizacao}),
+    "get_user": Cenario(lambda c, _: {"url": "/users/1", "headers": c.autorizacao}),
+    "update_user": Cenario(lambda c, usuario: {"url": f"/users/{usuario}", "json": {"is_active": True}, "headers": c.autorizacao}, preparar=Contexto.novo_usuario),
+    "delete_user": Cenario(lambda c, usuario: {"url": f"/users/{usuario}", "headers": c.autorizacao}, preparar=Contexto.novo_usuario),
+    "login_for_access_token": Cenario(lambda c, _: {"url": "/token/login", "data": {"username": "benchmark", "password": "benchmark"}}, max_repeticoes=10),
+    # Cadastros auxiliares e diagnóstico
+    "listar_situacoes_mesa": Cenario(lambda c, _: {"url": "/situacoes_mesas/"}),
+    "estatisticas_pool": Cenario(lambda c, _: {"url": "/diagnostico/pool"}),
+    "estatisticas_catalogo": Cenario(lambda c, _: {"url": "/diagnostico/catalogo"}),
+    "estatisticas_cache_tokens": Cenario(lambda c, _: {"url": "/diagnostico/tokens"}),
+    "estatisticas_de_login": Cenario(lambda c, _: {"url": "/diagnostico/login"}),
+    "exposicao_metricas": Cenario(lambda c, _: {"url": "/metrics"}),
+    "vivacidade": Cenario(lambda c, _: {"url": "/health/live"}),
+    "prontidao": Cenario(lambda c, _: {"url": "/health/ready"}),
+    "divergencias_de_totais": Cenario(lambda c, _: {"url": "/diagnostico/totais"}, max_repeticoes=10),
+    "reparar_totais_divergentes": Cenario(lambda c, _: {"url": "/diagnostico/totais/reparar"}, max_repeticoes=10),
+    # Relatórios
+    "relatorio_vendas": Cenario(lambda c, _: {"url": "/relatorios/vendas", "params": {**_PERIODO, "agrupar": c.escolher([["data"], ["categoria"], ["produto_id"], ["data", "hora"]])}}),
+    "atualizar_vendas": Cenario(lambda c, _: {"url": "/relatorios/vendas/atualizar"}),
+    "recalcular_vendas": Cenario(lambda c, _: {"url": "/relatorios/vendas/recalcular", "params": {"inicio": "2024-12-01", "fim": "2024-12-31"}}, max_repeticoes=10),
+    # Mesas
+    "listar_mesas": Cenario(lambda c, _: {"url": "/mesas/"}),
+    "obter_mesa": Cenario(lambda c, _: {"url": f"/mesas/{c.escolher(c.mesas)}"}),
+    "criar_mesa": Cenario(lambda c, _: {"url": "/mesas/", "json": {"numero": 200000 + c.unico(), "id_situacao_fk": 1}}),
+    "atualizar_mesa": Cenario(lambda c, mesa: {"url": f"/mesas/{mesa}", "json": {"id_situacao_fk": 3}}, preparar=Contexto.nova_mesa),
+    "deletar_mesa": Cenario(lambda c, mesa: {"url": f"/mesas/{mesa}"}, preparar=Contexto.nova_mesa),
+    # Pedidos
+    "buscar_pedido_por_mesa": Cenario(lambda c, _: {"url": f"/pedidos/mesa/{c.escolher(list(c.pedidos_abertos))}"}),
+    "buscar_pedido_por_id": Cenario(lambda c, _: {"url": f"/pedidos/{c.escolher(c.pedidos)}"}),
+    "criar_pedido_para_mesa": Cenario(
+        lambda c, mesa: {"url": f"/pedidos/mesa/{mesa}", "params": {"cliente_id": c.escolher(c.clientes)}},
+        preparar=Contexto.nova_mesa
+    ),
+    "criar_pedido_com_itens": Cenario(
+        lambda c, mesa: {"url": "/pedidos/", "json": {
+            "cliente_id": c.escolher(c.clientes),
+            "mesa_id": mesa,
+            "itens": [
+                {"pedido_id": 0, "produto_id": c.escolher(c.produtos), "quantidade": c.aleatorio.randint(1, 3), "preco_unitario": 0}
+                for _ in range(6)
+            ],
+        }},
+        preparar=Contexto.nova_mesa
+    ),
+    "atualizar_pedido": Cenario(
+        lambda c, pedido: {"url": f"/pedidos/{pedido['idpedido']}", "json": {
+            "itens": [{"idpedido_produto": pedido["itens"][0], "quantidade": 2}, {"produto_id": c.escolher(c.produtos), "quantidade": 1}],
+        }},
+        preparar=Contexto.novo_pedido
+    ),
+    "deletar_pedido": Cenario(lambda c, pedido: {"url": f"/pedidos/{pedido['idpedido']}"}, preparar=Contexto.novo_pedido),
+    "deletar_item_do_pedido": Cenario(
+        lambda c, pedido: {"url": f"/pedidos/{pedido['idpedido']}/itens/{pedido['itens'][0]}"},
+        preparar=Contexto.novo_pedido
+    ),
+    # Itens de pedido
+    "criar_pedido_produto": Cenario(lambda c, _: {"url": "/pedido_produtos/", "json": {
+        "pedido_id": c.pedidos_abertos[c.escolher(list(c.pedidos_abertos))],
+        "produto_id": c.escolher(c.produtos),
+        "quantidade": 1,
+        "preco_unitario": 0,
+    }}),
+    "listar_pedido_produtos": Cenario(lambda c, _: {"url": "/pedido_produtos/"}),
+    "remover_pedido_produto": Cenario(lambda c, pedido: {"url": f"/pedido_produtos/{pedido['itens'][0]}"}, preparar=Contexto.novo_pedido),
+    "atualizar_quantidade_pedido_produto": Cenario(
+        lambda c, _: {"url": f"/pedido_produtos/{c.escolher(c.itens_abertos)}", "json": {"quantidade": c.aleatorio.randint(1, 5)}}
+    ),
+}
+
+# --- Medição ---
+
+class ContadorStatements:
+    """Conta todos os statements dos engines do app (as requisições do benchmark são sequenciais)."""
+    def __init__(self):
+        self.statements = 0
+
+    def __call__(self, *args):
+        self.statements += 1
+
+def _percentis(valores: List[float]) -> Dict[str, float]:
+    if len(valores) < 2:
+        return {"p50": valores[0], "p95": valores[0], "p99": valores[0]}
+    cortes = statistics.quantiles(valores, n=100, method="inclusive")
+    return {"p50": cortes[49], "p95": cortes[94], "p99": cortes[98]}
+
+def _medir_rota(cliente, metodo: str, cenario: Cenario, contexto: Contexto, contador: ContadorStatements, aquecimento: int, repeticoes: int) -> dict:
+    if cenario.max_repeticoes:
+        repeticoes = min(repeticoes, cenario.max_repeticoes)
+        aquecimento = min(aquecimento, 1)
+    tempos, statements, codigos = [], [], Counter()
+    for rodada in range(aquecimento + repeticoes):
+        preparado = cenario.preparar(contexto) if cenario.preparar else None
+        argumentos = cenario.requisicao(contexto, preparado)
+        url = argumentos.pop("url")
+        antes = contador.statements
+        inicio = time.perf_counter()
+        resposta = cliente.request(metodo, url, **argumentos)
+        duracao = time.perf_counter() - inicio
+        if rodada < aquecimento:
+            continue
+        tempos.append(duracao * 1000)
+        statements.append(contador.statements - antes)
+        codigos[resposta.status_code] += 1
+    percentis = _percentis(tempos)
+    return {
+        "amostras": len(tempos),
+        "p50_ms": round(percentis["p50"], 3),
+        "p95_ms": round(percentis["p95"], 3),
+        "p99_ms": round(percentis["p99"], 3),
+        "media_ms": round(statistics.fmean(tempos), 3),
+        "statements_p50": statistics.median_low(statements),
+        "statements_max": max(statements),
+        "status": {str(codigo): quantidade for codigo, quantidade in sorted(codigos.items())},
+        "falhas": sum(quantidade for codigo, quantidade in codigos.items() if codigo >= 400),
+    }
+
+def _preparar_banco(recriar: bool):
+    from app import database, models
+    from benchmarks import dados
+
+    # O app não cria tabelas na inicialização (schema vem do Alembic): o banco do benchmark é criado aqui
+    models.Base.metadata.create_all(bind=database.engine)
+    with database.SessionLocal() as db:
+        vazio = dados.banco_vazio(db)
+    if not vazio:
+        if not recriar:
+            sys.exit("O banco informado já tem dados. Use um banco vazio ou --recriar para apagar as tabelas.")
+        models.Base.metadata.drop_all(bind=database.engine)
+        models.Base.metadata.create_all(bind=database.engine)
+
+def _comparar(anterior: dict, atual: dict):
+    base = {(rota["metodo"], rota["rota"]): rota for rota in anterior["rotas"]}
+    print(f"\nComparação com {anterior['meta'].get('commit') or '?'} ({anterior['meta']['data']}):")
+    diferencas = [
+        f"{campo}: {anterior['meta'].get(campo)} → {atual['meta'].get(campo)}"
+        for campo in ("dialeto", "db_async", "escala", "semente")
+        if anterior["meta"].get(campo) != atual["meta"].get(campo)
+    ]
+    if diferencas:
+        print("Atenção, execuções com configurações diferentes (" + "; ".join(diferencas) + ")")
+    print(f"{'rota':<48} {'p50 (ms)':>22} {'p95 (ms)':>22} {'statements':>12}")
+    for rota in atual["rotas"]:
+        antes = base.get((rota["metodo"], rota["rota"]))
+        if antes is None:
+            continue
+        def variacao(campo):
+            novo, velho = rota[campo], antes[campo]
+            percentual = (novo - velho) / velho * 100 if velho else 0.0
+            return f"{velho:8.2f} → {novo:8.2f} {percentual:+5.0f}%"
+        statements = f"{antes['statements_p50']} → {rota['statements_p50']}"
+        # Mais de 20% mais lenta no p50 ou com mais statements: provável regressão
+        alerta = " !" if rota["statements_p50"] > antes["statements_p50"] or rota["p50_ms"] > antes["p50_ms"] * 1.2 else ""
+        print(f"{rota['metodo'] + ' ' + rota['rota']:<48} {variacao('p50_ms'):>22} {variacao('p95_ms'):>22} {statements:>12}{alerta}")
+
+def main(argv) -> int:
+    args = _argumentos(argv)
+    _configurar_ambiente(args)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from fastapi.routing import APIRoute
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from app import database
+    from app.config import settings
+    from app.main import app
+    from app.utils.rollup import atualizar_rollup
+    from benchmarks import dados
+
+    _preparar_banco(args.recriar)
+    inicio = time.perf_counter()
+    with database.SessionLocal() as db:
+        massa = dados.gerar(db, dados.volumes(args.escala), args.semente)
+        # Relatórios leem do rollup: soma o histórico gerado antes de medir
+        atualizar_rollup(db)
+    massa["segundos_geracao"] = round(time.perf_counter() - inicio, 2)
+    print(f"Massa de dados gerada em {massa['segundos_geracao']}s: {massa['linhas']}")
+
+    contador = ContadorStatements()
+    engines = [database.engine] + ([database.async_engine.sync_engine] if database.async_engine is not None else [])
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", contador)
+
+    # Erros 500 entram no resultado como falhas da rota, em vez de interromper o benchmark
+    cliente = TestClient(app, raise_server_exceptions=False)
+    token = cliente.post("/token/login", data={"username": dados.USUARIO, "password": dados.SENHA}).json()["access_token"]
+    contexto = Contexto(args.semente, token)
+
+    rotas = [rota for rota in app.routes if isinstance(rota, APIRoute) and rota.endpoint.__module__.startswith("app.routers")]
+    if args.rotas:
+        rotas = [rota for rota in rotas if any(termo in rota.name or termo in rota.path for termo in args.rotas)]
+    # Leituras primeiro: as escritas alteram a massa de dados
+    rotas.sort(key=lambda rota: "GET" not in rota.methods)
+
+    resultados, sem_cenario, ignoradas = [], [], []
+    print(f"{'rota':<48} {'p50':>9} {'p95':>9} {'p99':>9} {'stmts':>6}")
+    for rota in rotas:
+        metodo = sorted(rota.methods)[0]
+        if rota.name in IGNORADAS:
+            ignoradas.append({"metodo": metodo, "rota": rota.path, "nome": rota.name, "motivo": IGNORADAS[rota.name]})
+            continue
+        cenario = CENARIOS.get(rota.name)
+        if cenario is None:
+            sem_cenario.append({"metodo": metodo, "rota": rota.path, "nome": rota.name})
+            continue
+        medicao = _medir_rota(cliente, metodo, cenario, contexto, contador, args.aquecimento, args.repeticoes)
+        resultados.append({"metodo": metodo, "rota": rota.path, "nome": rota.name, "modulo": rota.endpoint.__module__, **medicao})
+        falhas = f"  ({medicao['falhas']} falha(s): {medicao['status']})" if medicao["falhas"] else ""
+        print(
+            f"{metodo + ' ' + rota.path:<48} {medicao['p50_ms']:>9.2f} {medicao['p95_ms']:>9.2f} "
+            f"{medicao['p99_ms']:>9.2f} {medicao['statements_p50']:>6}{falhas}"
+        )
+
+    for rota in sem_cenario:
+        print(f"Sem cenário de benchmark: {rota['metodo']} {rota['rota']} ({rota['nome']})")
+
+    resultado = {
+        "meta": {
+            "commit": _commit_atual(),
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "dialeto": database.engine.dialect.name,
+            "db_async": settings.db_async,
+            "escala": args.escala,
+            "semente": args.semente,
+            "repeticoes": args.repeticoes,
+            "aquecimento": args.aquecimento,
+            "massa": massa,
+        },
+        "rotas": resultados,
+        "sem_cenario": sem_cenario,
+        "ignoradas": ignoradas,
+    }
+    saida = args.saida
+    if not saida:
+        os.makedirs(DIRETORIO_RESULTADOS, exist_ok=True)
+        saida = os.path.join(DIRETORIO_RESULTADOS, f"{datetime.now():%Y%m%d-%H%M%S}-{resultado['meta']['commit'] or 'sem-git'}.json")
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    print(f"\nResultado salvo em {saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            _comparar(json.load(arquivo), resultado)
+    return 1 if any(rota["falhas"] for rota in resultados) or sem_cenario else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,91 @@
+# benchmarks/inicializacao.py
+# Mede o cold start de um worker: cada amostra é um processo Python novo que importa app.main,
+# executa o lifespan e atende a primeira requisição (GET /health/live, sem banco).
+#
+# Uso (a partir de backend/):
+#   python -m benchmarks.inicializacao
+#   python -m benchmarks.inicializacao --amostras 10 --modulos 20   # + módulos mais lentos de importar
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+DIRETORIO_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executado em cada processo filho; imprime os tempos (segundos) em JSON na última linha
+_AMOSTRA = """
+import json, time
+inicio = time.perf_counter()
+from app.main import app, tempo_importacao
+importado = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as cliente:
+    pronto = time.perf_counter()
+    cliente.get("/health/live").raise_for_status()
+    primeira = time.perf_counter()
+print(json.dumps({
+    "import": importado - inicio,
+    "import_main": tempo_importacao,
+    "lifespan": pronto - importado,
+    "primeira_requisicao": primeira - pronto,
+    "total": primeira - inicio,
+}))
+"""
+
+def _ambiente(database_url: str) -> dict:
+    ambiente = dict(os.environ)
+    ambiente["DATABASE_URL"] = database_url
+    ambiente.setdefault("SECRET_KEY", "benchmark")
+    ambiente.setdefault("ALGORITHM", "HS256")
+    ambiente.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+    return ambiente
+
+def _amostra(ambiente: dict) -> dict:
+    processo = subprocess.run(
+        [sys.executable, "-c", _AMOSTRA], cwd=DIRETORIO_BACKEND, env=ambiente, capture_output=True, text=True
+    )
+    if processo.returncode != 0:
+        raise RuntimeError(processo.stderr.strip()[-2000:])
+    return json.loads(processo.stdout.strip().splitlines()[-1])
+
+def _modulos_mais_lentos(ambiente: dict, quantidade: int):
+    # -X importtime: tempo cumulativo (µs) de cada módulo importado, em stderr
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=DIRETORIO_BACKEND, env=ambiente, capture_output=True, text=True
+    )
+    tempos = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "|" not in linha:
+            continue
+        _, cumulativo, modulo = (parte.strip() for parte in linha[len("import time:"):].split("|"))
+        if cumulativo.isdigit():
+            tempos.append((int(cumulativo), modulo))
+    print(f"\n{'módulo':<50} {'cumulativo (ms)':>16}")
+    for cumulativo, modulo in sorted(tempos, reverse=True)[:quantidade]:
+        print(f"{modulo:<50} {cumulativo / 1000:>16.1f}")
+
+def main(argv) -> int:
+    parser = argparse.ArgumentParser(description="Tempo de import e cold start do app")
+    parser.add_argument("--amostras", type=int, default=5, help="Processos iniciados (cada um é um cold start)")
+    parser.add_argument("--database-url", help="Banco usado pelo app (padrão: SQLite temporário; não precisa estar acessível)")
+    parser.add_argument("--modulos", type=int, default=0, help="Lista os N módulos mais lentos de importar (-X importtime)")
+    args = parser.parse_args(argv)
+
+    url = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="benchmark-"), "inicializacao.db")
+    ambiente = _ambiente(url)
+    amostras = [_amostra(ambiente) for _ in range(args.amostras)]
+
+    print(f"{'fase':<22} {'p50 (ms)':>10} {'máx (ms)':>10}")
+    for fase in ("import", "import_main", "lifespan", "primeira_requisicao", "total"):
+        valores = [amostra[fase] * 1000 for amostra in amostras]
+        print(f"{fase:<22} {statistics.median(valores):>10.1f} {max(valores):>10.1f}")
+    if args.modulos:
+        _modulos_mais_lentos(ambiente, args.modulos)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,102 @@
+# benchmarks/serializacao_pedido.py
+# Compara a serialização de um Pedido grande pelo caminho padrão do FastAPI (validação do
+# response_model + json.dumps) com o caminho rápido de app/utils/serializacao.py.
+#
+# Uso (a partir de backend/):
+#   python -m benchmarks.serializacao_pedido [--itens 10,100,1000] [--repeticoes 200]
+# Usa um banco SQLite temporário; sai com código 1 se os dois caminhos gerarem JSON diferente.
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+_arquivo_banco = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_arquivo_banco}")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy.orm import joinedload
+from app import database, models, schemas
+from app.utils.serializacao import resposta_rapida
+
+def _criar_cadastros(db):
+    cliente = models.Cliente(nome="Benchmark")
+    situacao = models.SituacaoMesa(situacao_descricao="Ocupada")
+    produtos = [models.Produto(descricao=f"Produto {i}", preco=10 + i, categoria="bench") for i in range(50)]
+    db.add_all([cliente, situacao, *produtos])
+    db.flush()
+    return cliente, situacao, produtos
+
+def _criar_pedido(db, cadastros, quantidade_itens: int) -> int:
+    cliente, situacao, produtos = cadastros
+    mesa = models.Mesa(numero=quantidade_itens, id_situacao_fk=situacao.id_situacao, id_cliente_fk=cliente.idcliente)
+    db.add(mesa)
+    db.flush()
+    pedido = models.Pedido(cliente_id=cliente.idcliente, mesa_id=mesa.idmesa, status="aberto")
+    db.add(pedido)
+    db.flush()
+    db.add_all([
+        models.PedidoProduto(
+            pedido_id=pedido.idpedido,
+            produto_id=produtos[i % len(produtos)].idproduto,
+            quantidade=1 + i % 3,
+            preco_unitario=produtos[i % len(produtos)].preco
+        )
+        for i in range(quantidade_itens)
+    ])
+    db.commit()
+    return pedido.idpedido
+
+def _carregar(db, pedido_id: int):
+    return db.query(models.Pedido).options(
+        joinedload(models.Pedido.itens).joinedload(models.PedidoProduto.produto)
+    ).filter(models.Pedido.idpedido == pedido_id).first()
+
+# O response_model do FastAPI também é validado por um TypeAdapter criado uma vez por rota
+_ADAPTADOR_PEDIDO = TypeAdapter(schemas.Pedido)
+
+def _caminho_padrao(pedido) -> bytes:
+    # O que o FastAPI faz com um objeto ORM e response_model=schemas.Pedido
+    validado = _ADAPTADOR_PEDIDO.validate_python(pedido, from_attributes=True)
+    conteudo = jsonable_encoder(_ADAPTADOR_PEDIDO.dump_python(validado, mode="json"))
+    return json.dumps(conteudo, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def _caminho_rapido(pedido) -> bytes:
+    return resposta_rapida(schemas.Pedido, pedido).body
+
+def _medir(funcao, repeticoes: int) -> float:
+    funcao()
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+def main(argv) -> int:
+    parser = argparse.ArgumentParser(description="Serialização de Pedido: caminho padrão x caminho rápido")
+    parser.add_argument("--itens", default="10,100,1000", help="Tamanhos de pedido (itens), separados por vírgula")
+    parser.add_argument("--repeticoes", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    models.Base.metadata.create_all(bind=database.engine)
+    divergencias = 0
+    print(f"{'itens':>6} {'padrão (ms)':>12} {'rápido (ms)':>12} {'ganho':>7}")
+    with database.SessionLocal() as db:
+        cadastros = _criar_cadastros(db)
+        for quantidade in (int(valor) for valor in args.itens.split(",")):
+            pedido = _carregar(db, _criar_pedido(db, cadastros, quantidade))
+            if json.loads(_caminho_padrao(pedido)) != json.loads(_caminho_rapido(pedido)):
+                print(f"{quantidade:>6} JSON divergente entre os dois caminhos")
+                divergencias += 1
+                continue
+            padrao = _medir(lambda: _caminho_padrao(pedido), args.repeticoes)
+            rapido = _medir(lambda: _caminho_rapido(pedido), args.repeticoes)
+            print(f"{quantidade:>6} {padrao:>12.3f} {rapido:>12.3f} {padrao / rapido:>6.1f}x")
+    return 1 if divergencias else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))